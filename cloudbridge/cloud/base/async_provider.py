@@ -0,0 +1,275 @@
+"""
+An asyncio front-end for CloudBridge providers.
+
+CloudBridge services are synchronous. The wrappers in this module run each
+blocking call on a bounded thread pool and return an awaitable, so that a
+single event loop can drive many concurrent cloud operations while the
+number of in-flight provider calls stays under control. Requires Python 3.7.
+"""
+import asyncio
+import copy
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudbridge.cloud.interfaces.resources import CloudResource
+from cloudbridge.cloud.interfaces.resources import PageableObjectMixin
+from cloudbridge.cloud.interfaces.services import CloudService
+
+log = logging.getLogger(__name__)
+
+DEFAULT_ASYNC_MAX_WORKERS = 10
+
+
+class AsyncCall(object):
+    """
+    An awaitable for a blocking call on an :class:`AsyncCloudProvider`'s
+    executor. The call is scheduled when awaited, on the running loop.
+    """
+
+    def __init__(self, async_provider, func, args, kwargs):
+        self._async_provider = async_provider
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+
+    def __await__(self):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            # pylint:disable=protected-access
+            self._async_provider._executor,
+            lambda: self._async_provider.wrap(
+                self._func(*self._args, **self._kwargs))).__await__()
+
+    def __repr__(self):
+        return "<AsyncCall: {0!r}>".format(self._func)
+
+
+class AsyncAttribute(object):
+    """
+    A chain of attributes of a provider, service or resource, which is
+    resolved on the :class:`AsyncCloudProvider`'s executor, as reading a
+    property may make requests to the cloud. Awaiting it returns the
+    (wrapped) value, calling it runs the method on the executor and returns
+    an awaitable, and reading an attribute extends the chain.
+
+    Example:
+
+    .. code-block:: python
+
+        state = await vol.state
+        vols = await provider.storage.volumes.list()
+    """
+
+    def __init__(self, async_provider, owner, names):
+        self._async_provider = async_provider
+        self._owner = owner
+        self._names = names
+
+    def _resolve(self):
+        value = self._owner
+        for name in self._names:
+            value = getattr(value, name)
+        return value
+
+    def __getattr__(self, name):
+        return AsyncAttribute(self._async_provider, self._owner,
+                              self._names + (name,))
+
+    def __call__(self, *args, **kwargs):
+        return self._async_provider.run(
+            lambda *a, **kw: self._resolve()(*a, **kw), *args, **kwargs)
+
+    def __await__(self):
+        return self._async_provider.run(self._resolve).__await__()
+
+    def __aiter__(self):
+        return self.iter()
+
+    def iter(self, **kwargs):
+        """
+        Asynchronously iterate over all results of a pageable object, e.g.
+        ``async for inst in provider.compute.instances.iter(limit=10)``.
+        The object and each page are fetched on the executor.
+        """
+        return AsyncIterator(self._async_provider,
+                             lambda: self._resolve().iter(**kwargs))
+
+    def __repr__(self):
+        return "<Async: {0!r}.{1}>".format(self._owner,
+                                           ".".join(self._names))
+
+
+class AsyncProxy(object):
+    """
+    Wraps a CloudBridge service or resource. Attributes are read, and
+    methods called, on the owning :class:`AsyncCloudProvider`'s executor,
+    through an awaitable :class:`AsyncAttribute`. Services, resources and
+    containers returned are wrapped in turn.
+
+    Example:
+
+    .. code-block:: python
+
+        inst = await provider.compute.instances.create(...)
+        await inst.wait_till_ready()
+        print(await inst.state)
+        async for vol in provider.storage.volumes:
+            print(await vol.id)
+    """
+
+    def __init__(self, async_provider, delegate):
+        self._async_provider = async_provider
+        self._delegate = delegate
+
+    @property
+    def delegate(self):
+        """
+        The wrapped synchronous object.
+        """
+        return self._delegate
+
+    def __getattr__(self, name):
+        return AsyncAttribute(self._async_provider, self._delegate, (name,))
+
+    def __aiter__(self):
+        return self.iter()
+
+    def iter(self, **kwargs):
+        """
+        Asynchronously iterate over all results of a pageable object, e.g.
+        ``async for inst in provider.compute.instances.iter(limit=10)``.
+        Each page is fetched on the executor.
+        """
+        return AsyncIterator(self._async_provider,
+                             lambda: self._delegate.iter(**kwargs))
+
+    def __eq__(self, other):
+        if isinstance(other, AsyncProxy):
+            other = other.delegate
+        return self._delegate == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._delegate)
+
+    def __repr__(self):
+        return "<Async: {0!r}>".format(self._delegate)
+
+
+class AsyncIterator(object):
+    """
+    Adapts a blocking iterator to the asynchronous iterator protocol. The
+    iterator is created by ``factory``, on the executor, on first use.
+    """
+
+    def __init__(self, async_provider, factory):
+        self._async_provider = async_provider
+        self._factory = factory
+        self._iterator = None
+
+    def __aiter__(self):
+        return self
+
+    def _next(self):
+        if self._iterator is None:
+            self._iterator = iter(self._factory())
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            # StopIteration cannot be propagated through a future
+            raise StopAsyncIteration  # noqa: F821 (Python 3 only)
+
+    def __anext__(self):
+        return self._async_provider.run(self._next)
+
+
+class AsyncCloudProvider(object):
+    """
+    Wraps a :class:`.CloudProvider` so that all of its service calls can be
+    awaited. Calls are executed on a thread pool with at most
+    ``max_workers`` threads, which bounds the number of concurrent requests
+    made to the cloud. As calls are made from several threads, the provider
+    should be created with the ``thread_safe`` config value set, as
+    :meth:`.CloudProviderFactory.create_provider` does with ``async_=True``.
+
+    Example:
+
+    .. code-block:: python
+
+        provider = CloudProviderFactory().create_provider(
+            ProviderList.AWS, config, async_=True)
+        instances = await provider.compute.instances.list()
+
+    :type provider: :class:`.CloudProvider`
+    :param provider: The synchronous provider to wrap.
+
+    :type max_workers: ``int``
+    :param max_workers: Maximum number of concurrent provider calls. Defaults
+                        to the ``async_max_workers`` provider config value.
+    """
+
+    def __init__(self, provider, max_workers=None):
+        self._provider = provider
+        if max_workers is None:
+            max_workers = provider._get_config_value(
+                'async_max_workers', DEFAULT_ASYNC_MAX_WORKERS)
+        self._executor = ThreadPoolExecutor(max_workers=int(max_workers))
+
+    @property
+    def provider(self):
+        """
+        The wrapped synchronous provider.
+        """
+        return self._provider
+
+    def __getattr__(self, name):
+        return AsyncAttribute(self, self._provider, (name,))
+
+    def wrap(self, value):
+        """
+        Wraps services, resources and pageable containers, including those
+        contained in a list, in an :class:`AsyncProxy`. Other values are
+        returned unchanged.
+        """
+        if isinstance(value, (CloudService, CloudResource,
+                              PageableObjectMixin)):
+            return AsyncProxy(self, value)
+        if isinstance(value, list):
+            # Copy to preserve the attributes of result lists
+            wrapped = copy.copy(value)
+            wrapped[:] = [self.wrap(item) for item in value]
+            return wrapped
+        return value
+
+    @staticmethod
+    def unwrap(value):
+        """
+        Returns the synchronous objects behind any :class:`AsyncProxy`
+        instances in ``value``, so that they can be passed to the provider.
+        """
+        if isinstance(value, AsyncProxy):
+            return value.delegate
+        if type(value) in (list, tuple):
+            return type(value)(AsyncCloudProvider.unwrap(v) for v in value)
+        return value
+
+    def run(self, func, *args, **kwargs):
+        """
+        Runs a blocking callable on this provider's executor, once the
+        returned awaitable is awaited in a running event loop.
+
+        :rtype: :class:`AsyncCall`
+        :return: An awaitable for the (wrapped) return value of ``func``.
+        """
+        log.debug("Scheduling %s on the async executor", func)
+        args = self.unwrap(args)
+        kwargs = {k: self.unwrap(v) for k, v in kwargs.items()}
+        return AsyncCall(self, func, args, kwargs)
+
+    def close(self):
+        """
+        Shuts down the executor, waiting for pending calls to complete.
+        """
+        self._executor.shutdown(wait=True)
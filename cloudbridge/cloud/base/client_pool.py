@@ -0,0 +1,119 @@
+"""
+A pool of SDK clients shared between provider instances.
+
+Creating a client is comparatively expensive (service models are loaded and,
+more importantly, every new client opens its own HTTP connections, paying for
+a TLS handshake each time). Clients are therefore kept in a pool, keyed by
+the service, region and a digest of the credentials and options they were
+built with, so that providers created with identical credentials reuse the
+same clients and their open connections.
+"""
+import hashlib
+import json
+import logging
+import threading
+
+import cachetools
+
+log = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAX_CLIENTS = 100
+
+
+def credentials_digest(*parts):
+    """
+    Returns a digest identifying the given credentials and options, for use
+    in client pool keys, so that secrets are not held in the keys
+    themselves.
+    """
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class ClientPool(object):
+    """
+    A thread-safe, size bounded pool of SDK clients.
+
+    Clients which can be shared between threads (such as boto3 clients) are
+    held once per pool. Clients which are not thread-safe (such as those
+    using httplib2) are requested with ``per_thread=True`` and held once per
+    thread instead. The least recently used clients are discarded once
+    ``max_clients`` are held.
+
+    :type max_clients: ``int``
+    :param max_clients: The maximum number of clients held by the pool (or,
+                        for per-thread clients, by each thread).
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_clients=DEFAULT_POOL_MAX_CLIENTS):
+        self.max_clients = max_clients
+        self._clients = cachetools.LRUCache(max_clients)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the pool shared by all providers in this process.
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def _thread_clients(self):
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = cachetools.LRUCache(self.max_clients)
+            self._local.clients = clients
+        return clients
+
+    def get(self, key, factory, per_thread=False):
+        """
+        Returns the client held for ``key``, calling ``factory`` to create
+        it if there is none.
+
+        :type key: ``tuple``
+        :param key: A hashable key identifying the client.
+
+        :type factory: ``callable``
+        :param factory: A function without arguments returning a new client.
+
+        :type per_thread: ``bool``
+        :param per_thread: If True, each thread gets its own client.
+
+        :return: The pooled client.
+        """
+        if per_thread:
+            clients = self._thread_clients()
+            client = clients.get(key)
+            if client is None:
+                log.debug("Creating per-thread client %s", key[:2])
+                client = clients[key] = factory()
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+        if client is None:
+            # Clients are created outside of the lock, as this may involve
+            # network requests. Should two threads race to create the same
+            # client, the first one stored wins.
+            log.debug("Creating shared client %s", key[:2])
+            client = factory()
+            with self._lock:
+                client = self._clients.setdefault(key, client)
+        return client
+
+    def clear(self):
+        """
+        Discards all clients held by the pool.
+        """
+        with self._lock:
+            self._clients.clear()
+        self._local = threading.local()
+
+    def __len__(self):
+        return len(self._clients)
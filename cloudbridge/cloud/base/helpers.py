@@ -1,11 +1,17 @@
+import collections
 import fnmatch
 import functools
 import os
+import random
 import re
 import sys
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
+import cachetools
+
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization as crypt_serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
@@ -13,8 +19,10 @@ from cryptography.hazmat.primitives.asymmetric import rsa
 from deprecation import deprecated
 
 import six
+from six.moves import queue
 
 import cloudbridge
+from cloudbridge.cloud.interfaces.resources import BulkResult
 
 
 def generate_key_pair():
@@ -37,6 +45,113 @@ def generate_key_pair():
     return public_key, private_key
 
 
+# fnmatch characters which make a pattern more than a plain literal
+_WILDCARD_CHARS = frozenset('*?[')
+
+
+@cachetools.cached(cachetools.LRUCache(maxsize=256), lock=threading.Lock())
+def _compile_pattern(pattern):
+    """
+    Returns a compiled regular expression for an fnmatch pattern. Compiled
+    patterns are cached, since the same find() queries tend to be repeated.
+    """
+    return re.compile(fnmatch.translate(pattern))
+
+
+class Query(object):
+    """
+    A set of find() criteria compiled into a single predicate, which can be
+    evaluated against many objects without re-parsing the criteria.
+
+    String criteria are fnmatch patterns, matched against the end of the
+    attribute value in the same way as ``re.search``. Patterns without
+    wildcards are compared directly, without a regular expression. Other
+    values must be equal to the attribute value. Empty criteria are ignored.
+
+    Example:
+
+    .. code-block:: python
+
+        query = Query({'label': 'cb-*', 'zone': 'us-east-1a'})
+        matches = query.filter(provider.storage.volumes)
+
+    :type criteria: ``dict``
+    :param criteria: Maps attribute names to the values they must match.
+
+    :type supported: ``list`` of ``str``
+    :param supported: If given, the attribute names which may be queried.
+                      A ``TypeError`` is raised for any other criteria.
+    """
+
+    def __init__(self, criteria, supported=None):
+        if supported is not None:
+            unknown = {k: v for k, v in criteria.items()
+                       if k not in supported}
+            if unknown:
+                raise TypeError(
+                    "Unrecognised parameters for search: %s. Supported "
+                    "attributes: %s" % (unknown, supported))
+        self._criteria = {k: v for k, v in criteria.items() if v}
+        # Sort for a deterministic evaluation order
+        self._tests = [(name, self._compile(value))
+                       for name, value in sorted(self._criteria.items())]
+
+    @staticmethod
+    def _compile(value):
+        if not isinstance(value, six.string_types):
+            return lambda attr: attr == value
+        if _WILDCARD_CHARS.isdisjoint(value):
+            # Equivalent to searching for the translated pattern, which is
+            # anchored at the end only
+            return lambda attr: (isinstance(attr, six.string_types) and
+                                 attr.endswith(value))
+        regex = _compile_pattern(value)
+        return lambda attr: bool(attr) and bool(regex.search(attr))
+
+    @property
+    def criteria(self):
+        """
+        The non-empty criteria of this query.
+        """
+        return dict(self._criteria)
+
+    def literal(self, name):
+        """
+        Returns the criterion for ``name`` if it is a string without
+        wildcards, which a provider can pass on to a server-side filter,
+        or ``None`` otherwise.
+        """
+        value = self._criteria.get(name)
+        if (isinstance(value, six.string_types) and
+                _WILDCARD_CHARS.isdisjoint(value)):
+            return value
+        return None
+
+    def matches(self, obj):
+        """
+        Returns whether an object satisfies all criteria. Each queried
+        attribute is fetched from the object at most once.
+        """
+        for name, test in self._tests:
+            if not test(getattr(obj, name)):
+                return False
+        return True
+
+    __call__ = matches
+
+    def filter(self, objs):
+        """
+        Returns the objects which satisfy all criteria in a single pass. If
+        there are no criteria, ``objs`` is returned as is.
+        """
+        if not self._tests:
+            return objs
+        return [o for o in objs if self.matches(o)]
+
+    def __repr__(self):
+        return "<Query: {0}>".format(self._criteria)
+
+
 def filter_by(prop_name, kwargs, objs):
     """
     Utility method for filtering a list of objects by a property.
@@ -45,35 +160,19 @@ def filter_by(prop_name, kwargs, objs):
     list of objs is returned as is.
     """
     prop_val = kwargs.pop(prop_name, None)
-    if prop_val:
-        if isinstance(prop_val, six.string_types):
-            regex = fnmatch.translate(prop_val)
-            results = [o for o in objs
-                       if getattr(o, prop_name)
-                       and re.search(regex, getattr(o, prop_name))]
-        else:
-            results = [o for o in objs
-                       if getattr(o, prop_name) == prop_val]
-        return results
-    else:
-        return objs
+    return Query({prop_name: prop_val}).filter(objs)
 
 
 def generic_find(filter_names, kwargs, objs):
     """
     Utility method for filtering a list of objects by a list of filters.
+    All filters are compiled into a single :class:`Query`, which is applied
+    in one pass over objs.
     """
-    matches = objs
-    for name in filter_names:
-        matches = filter_by(name, kwargs, matches)
-
-    # All kwargs should have been popped at this time.
-    if len(kwargs) > 0:
-        raise TypeError(
-            "Unrecognised parameters for search: %s. Supported attributes: %s"
-            % (kwargs, filter_names))
-
-    return matches
+    query = Query(kwargs, supported=filter_names)
+    # Consume the criteria, as callers may inspect the remaining kwargs
+    kwargs.clear()
+    return query.filter(objs)
 
 
 @contextmanager
@@ -163,3 +262,280 @@ def rename_kwargs(func_name, kwargs, aliases):
                        details='{} is deprecated, use {} instead'.format(
                            alias, new))(lambda: None)()
             kwargs[new] = kwargs.pop(alias)
+
+
+def invalidates_cache(method=None, service_name=None):
+    """
+    Decorates a resource method which changes the resource, such as
+    ``delete`` or a ``label`` setter, so that the provider's cached lookups
+    which may return the resource are discarded once the method has run.
+
+    A method which creates a resource of another service, such as
+    ``Instance.create_image``, names that service instead:
+
+    .. code-block:: python
+
+        @invalidates_cache(service_name='images')
+        def create_image(self, label):
+            ...
+    """
+    def deco(f):
+        @functools.wraps(f)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return f(self, *args, **kwargs)
+            finally:
+                # pylint:disable=protected-access
+                self._invalidate_cache(service_name)
+        return wrapper
+    return deco(method) if method else deco
+
+
+def prefetch(iterable, depth):
+    """
+    Iterates over ``iterable`` while a background thread retrieves up to
+    ``depth`` items ahead of the consumer. This overlaps slow item retrieval
+    (such as fetching the next page of results) with processing of the
+    current item, while holding at most ``depth`` items in memory.
+    Exceptions raised by ``iterable`` are re-raised to the consumer.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+    end = object()
+
+    def put(entry):
+        # Give up if the consumer stops iterating while the buffer is full
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((end, None))
+        except Exception:
+            put((end, sys.exc_info()))
+
+    producer = threading.Thread(target=produce)
+    producer.daemon = True
+    producer.start()
+    try:
+        while True:
+            item, exc_info = buffer.get()
+            if exc_info:
+                six.reraise(*exc_info)
+            if item is end:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def bulk_apply(func, items, max_workers):
+    """
+    Calls ``func`` on each of ``items`` using up to ``max_workers``
+    concurrent threads, and returns a :class:`.BulkResult` per item, in the
+    order of ``items``. The value returned by ``func`` becomes the result's
+    ``resource``, and an exception raised by it the result's ``error``.
+    Each item is used as its result's id, unless it is ``None``.
+    """
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(items)))) as executor:
+        return list(executor.map(
+            functools.partial(bulk_call, func), items))
+
+
+def bulk_call(func, item):
+    """
+    Calls ``func`` on ``item`` and returns the outcome as a
+    :class:`.BulkResult`, as :func:`bulk_apply` does for each item.
+    """
+    try:
+        return BulkResult(item, resource=func(item))
+    except Exception as e:
+        cloudbridge.log.debug("Bulk operation on %s failed: %s", item, e)
+        return BulkResult(item, error=e)
+
+
+def bounded_map(func, items, max_workers):
+    """
+    Lazily maps ``func`` over ``items`` using up to ``max_workers``
+    concurrent threads, yielding the results in the order of ``items``.
+
+    Unlike ``Executor.map``, items are consumed only as results are
+    yielded, with at most twice ``max_workers`` calls in flight, so that
+    arbitrarily long iterators (such as a bucket listing) can be processed
+    in bounded memory. An exception raised by ``func`` is raised when its
+    result is reached.
+    """
+    max_workers = max(1, max_workers)
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def chunked(iterable, size):
+    """
+    Lazily splits ``iterable`` into lists of at most ``size`` items.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ChunkedStream(object):
+    """
+    A read-only, file-like view of an iterator of ``bytes`` chunks, such as
+    the ranged reads of a remote object. Chunks are fetched only as they are
+    consumed, so memory use is bounded by the chunk size rather than the
+    size of the whole object. Iterating yields the chunks as they are
+    received.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def __iter__(self):
+        if self._buffer:
+            data, self._buffer = self._buffer, b''
+            yield data
+        for chunk in self._chunks:
+            if chunk:
+                yield chunk
+
+    def read(self, length=-1):
+        """
+        Reads up to ``length`` bytes, or until the end of the stream if
+        ``length`` is negative. Returns an empty string at the end of the
+        stream.
+        """
+        parts = [self._buffer]
+        size = len(self._buffer)
+        while length < 0 or size < length:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            size += len(chunk)
+        data = b''.join(parts)
+        if length < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[length:]
+        return data[:length]
+
+    def close(self):
+        close = getattr(self._chunks, 'close', None)
+        if close:
+            close()
+
+
+class PollingPolicy(object):
+    """
+    Determines how long to sleep between successive polls of an object's
+    state.
+
+    Delays start at ``interval`` and are multiplied by ``multiplier`` after
+    each poll, up to a maximum of ``max_interval``. If ``jitter`` is set,
+    each delay is drawn uniformly between zero and the computed delay
+    ("full jitter"), which spreads out the requests made by many concurrent
+    waiters. ``timeout`` is the default overall deadline for a wait.
+
+    The policy also keeps a moving average of how long each kind of
+    transition has taken so far. Once an average is known, the first poll
+    for that kind of transition is delayed until the transition is expected
+    to have completed, after which the regular backoff schedule applies.
+    This does not apply to waits given an explicit interval.
+
+    A custom policy can be supplied through the ``polling_policy`` provider
+    config key.
+    """
+
+    # Weight given to the latest observation in the moving average
+    SMOOTHING = 0.3
+
+    def __init__(self, interval, multiplier=1.0, max_interval=None,
+                 jitter=False, timeout=None):
+        self.interval = interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self._observed = {}
+        self._lock = threading.Lock()
+
+    def expected_duration(self, key):
+        """
+        Returns the average observed duration (in seconds) of waits recorded
+        under ``key``, or ``None`` if no waits have been recorded.
+        """
+        with self._lock:
+            return self._observed.get(key)
+
+    def record(self, key, elapsed):
+        """
+        Records that a wait under ``key`` took ``elapsed`` seconds.
+        """
+        if key is None:
+            return
+        with self._lock:
+            previous = self._observed.get(key)
+            if previous is None:
+                self._observed[key] = elapsed
+            else:
+                self._observed[key] = (self.SMOOTHING * elapsed +
+                                       (1 - self.SMOOTHING) * previous)
+
+    def delays(self, key=None, interval=None):
+        """
+        Returns an iterator over the delays (in seconds) to sleep before each
+        successive poll.
+
+        :type key: ``hashable``
+        :param key: Identifies the kind of transition being waited on, so
+                    that its observed duration can be used. If ``None``, no
+                    learned duration is used.
+
+        :type interval: ``float``
+        :param interval: Overrides the policy's initial interval. The first
+                         delay is then ``interval``, even if a duration has
+                         been observed for ``key``.
+        """
+        expected = None
+        if interval is None:
+            interval = self.interval
+            expected = self.expected_duration(key)
+        max_interval = self.max_interval
+        if max_interval is None:
+            max_interval = float('inf')
+        max_interval = max(max_interval, interval)
+        if expected is not None:
+            yield min(expected, max_interval)
+        delay = interval
+        while True:
+            yield random.uniform(0, delay) if self.jitter else delay
+            delay = min(delay * self.multiplier, max_interval)
@@ -0,0 +1,178 @@
+"""
+Concurrent queries across the regions of a cloud.
+
+A provider is bound to a single region. To query several regions, a
+provider is created for each of them (sharing the SDK clients of the
+connection pool) and the same call is made concurrently in all of them,
+with the results merged into a single list.
+"""
+import functools
+import logging
+import types
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
+
+log = logging.getLogger(__name__)
+
+
+class MultiRegionResultList(list):
+    """
+    The results of a call made in several regions, merged into a single
+    list. A region whose call returned a list (or another sequence)
+    contributes all of its items, and any other region its return value.
+
+    Regions in which the call failed, or did not complete in time, do not
+    contribute any results. Their exceptions are held in ``errors`` instead,
+    so that a failing region does not prevent the others from being
+    queried.
+    """
+
+    def __init__(self):
+        super(MultiRegionResultList, self).__init__()
+        # The value returned in each region, by region name
+        self.results = OrderedDict()
+        # The exception raised in each failed region, by region name
+        self.errors = OrderedDict()
+        self._regions = []
+
+    def _add(self, region, result):
+        self.results[region] = result
+        if isinstance(result, (list, tuple, types.GeneratorType)):
+            items = list(result)
+        else:
+            items = [result]
+        self.extend(items)
+        self._regions.extend([region] * len(items))
+
+    def tagged(self):
+        """
+        Returns the results as ``(region_name, item)`` tuples.
+
+        :rtype: ``list`` of ``tuple``
+        :return: Each result, with the name of the region it came from.
+        """
+        return list(zip(self._regions, self))
+
+    def __repr__(self):
+        return "MultiRegionResultList(%s, errors=%r)" % (
+            list.__repr__(self), dict(self.errors))
+
+
+class _RegionCall(object):
+    """
+    An attribute path (such as ``compute.instances.list``) to be resolved
+    and called on the provider of each region of a view.
+    """
+
+    def __init__(self, view, path):
+        self._view = view
+        self._path = path
+
+    def __getattr__(self, name):
+        return _RegionCall(self._view, self._path + (name,))
+
+    def __call__(self, *args, **kwargs):
+        path = self._path
+
+        def call(provider):
+            value = functools.reduce(getattr, path, provider)
+            if not callable(value) and not args and not kwargs:
+                # A property, such as compute.regions.current
+                return value
+            return value(*args, **kwargs)
+
+        return self._view.map(call)
+
+
+class MultiRegionView(object):
+    """
+    A view of a provider across several regions, returned by
+    :meth:`.CloudProvider.across_regions`.
+
+    Attributes resolve as they would on a provider, and calling the
+    resolved method makes the call concurrently in every region. Properties
+    are fetched the same way, by calling them without arguments (e.g.
+    ``view.compute.regions.current()``). Arbitrary functions of a region's
+    provider can be run with :meth:`map`.
+
+    :type provider: :class:`.CloudProvider`
+    :param provider: The provider from which region providers are derived.
+
+    :type regions: ``list`` of ``str``
+    :param regions: The names of the regions to query.
+
+    :type max_workers: ``int``
+    :param max_workers: The maximum number of regions queried at once.
+                        Defaults to the number of regions.
+
+    :type timeout: ``float``
+    :param timeout: The number of seconds to wait for all regions to
+                    respond. Regions which have not responded by then are
+                    reported in the result's ``errors``.
+    """
+
+    def __init__(self, provider, regions, max_workers=None, timeout=None):
+        self._provider = provider
+        self.regions = list(regions)
+        self.max_workers = max_workers or len(self.regions)
+        self.timeout = timeout
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return _RegionCall(self, (name,))
+
+    def map(self, func):
+        """
+        Calls ``func`` with the provider of each region, concurrently.
+
+        Example:
+
+        .. code-block:: python
+
+            view = provider.across_regions()
+            zones = view.map(lambda p: p.compute.regions.current.zones)
+
+        :type func: ``callable``
+        :param func: A function taking a provider.
+
+        :rtype: :class:`.MultiRegionResultList`
+        :return: The merged return values of ``func``, and the errors it
+                 raised in each failed region.
+        """
+        results = MultiRegionResultList()
+        if not self.regions:
+            return results
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(self.regions))))
+        futures = OrderedDict(
+            (region, executor.submit(self._call, func, region))
+            for region in self.regions)
+        done, _ = wait(list(futures.values()), timeout=self.timeout)
+        for region, future in futures.items():
+            if future in done:
+                try:
+                    results._add(region, future.result())
+                except Exception as e:
+                    log.warning("Query failed in region %s: %s", region, e)
+                    results.errors[region] = e
+            else:
+                future.cancel()
+                log.warning("Query timed out in region %s", region)
+                results.errors[region] = WaitStateException(
+                    "Region {0} did not respond within {1} seconds".format(
+                        region, self.timeout))
+        # Calls which timed out are left to complete in the background
+        executor.shutdown(wait=False)
+        return results
+
+    def _call(self, func, region):
+        # The region's provider is created in the worker thread, so that
+        # failing to connect to a region is reported like any other error
+        return func(self._provider.for_region(region))
+
+    def __repr__(self):
+        return "MultiRegionView(%s, %r)" % (self._provider.name, self.regions)
@@ -2,6 +2,9 @@
 import functools
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from os.path import expanduser
 try:
     from configparser import ConfigParser
@@ -10,8 +13,15 @@ except ImportError:  # Python 2
 
 import six
 
+from cloudbridge.cloud.base.client_pool import ClientPool
+from cloudbridge.cloud.base.helpers import PollingPolicy
+from cloudbridge.cloud.base.multi_region import MultiRegionView
+from cloudbridge.cloud.base.services import DEFAULT_CACHE_MAX_SIZE
+from cloudbridge.cloud.base.services import DEFAULT_CACHE_TTLS
+from cloudbridge.cloud.base.services import ServiceCache
 from cloudbridge.cloud.interfaces import CloudProvider
 from cloudbridge.cloud.interfaces.exceptions import ProviderConnectionException
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
 from cloudbridge.cloud.interfaces.resources import Configuration
 
 log = logging.getLogger(__name__)
@@ -19,6 +29,10 @@ log = logging.getLogger(__name__)
 DEFAULT_RESULT_LIMIT = 50
 DEFAULT_WAIT_TIMEOUT = 600
 DEFAULT_WAIT_INTERVAL = 5
+DEFAULT_WAIT_MULTIPLIER = 1.5
+DEFAULT_WAIT_MAX_INTERVAL = 30
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_BULK_MAX_WORKERS = 10
 
 # By default, use two locations for CloudBridge configuration
 CloudBridgeConfigPath = '/etc/cloudbridge.ini'
@@ -63,6 +77,127 @@ class BaseConfiguration(Configuration):
                   DEFAULT_WAIT_INTERVAL)
         return self.get('default_wait_interval', DEFAULT_WAIT_INTERVAL)
 
+    @property
+    def default_wait_multiplier(self):
+        """
+        Gets the factor by which the wait interval for LifeCycleObjects grows
+        after each poll. A value of 1 polls at a constant interval.
+        """
+        return self.get('default_wait_multiplier', DEFAULT_WAIT_MULTIPLIER)
+
+    @property
+    def default_wait_max_interval(self):
+        """
+        Gets the maximum wait interval for LifeCycleObjects.
+        """
+        return self.get('default_wait_max_interval',
+                        DEFAULT_WAIT_MAX_INTERVAL)
+
+    @property
+    def default_wait_jitter(self):
+        """
+        Gets whether wait intervals for LifeCycleObjects are randomized
+        between zero and the computed interval.
+        """
+        return self.get('default_wait_jitter', False)
+
+    @property
+    def cache_enabled(self):
+        """
+        A flag indicating whether service lookups are cached. Caching is
+        disabled by default.
+
+        :rtype: ``bool``
+        :return: Whether the service cache is enabled.
+        """
+        return self.get('cache_enabled', False)
+
+    @property
+    def cache_ttls(self):
+        """
+        Gets the time (in seconds) for which each service's cached results
+        remain valid, keyed by service name (e.g. ``regions``). Values
+        supplied through the config are merged with the defaults; services
+        without a TTL are not cached.
+
+        :rtype: ``dict``
+        :return: A mapping of service names to TTLs.
+        """
+        ttls = dict(DEFAULT_CACHE_TTLS)
+        ttls.update(self.get('cache_ttls') or {})
+        return ttls
+
+    @property
+    def cache_max_size(self):
+        """
+        Gets the maximum number of entries held by the service cache.
+        """
+        return self.get('cache_max_size', DEFAULT_CACHE_MAX_SIZE)
+
+    @property
+    def connection_pool_shared(self):
+        """
+        A flag indicating whether SDK clients, and hence their open HTTP
+        connections, are shared with other providers in this process which
+        use identical credentials. Sharing is enabled by default. When
+        disabled, each provider keeps its own pool of clients.
+
+        :rtype: ``bool``
+        :return: Whether clients are shared between providers.
+        """
+        return self.get('connection_pool_shared', True)
+
+    @property
+    def connection_pool_max_size(self):
+        """
+        Gets the maximum number of HTTP connections each client keeps open
+        to a single host. Applies to AWS and OpenStack. The GCE (httplib2)
+        and Azure SDK clients manage their own connections.
+
+        :rtype: ``int``
+        :return: The maximum number of pooled connections per host.
+        """
+        return self.get('connection_pool_max_size', DEFAULT_POOL_CONNECTIONS)
+
+    @property
+    def connection_pool_keepalive(self):
+        """
+        A flag indicating whether TCP keep-alive probes are sent on pooled
+        connections, which stops idle connections from being dropped by
+        firewalls and load balancers. Applies to AWS only, with
+        botocore >= 1.27. Disabled by default.
+
+        :rtype: ``bool``
+        :return: Whether TCP keep-alive is enabled.
+        """
+        return self.get('connection_pool_keepalive', False)
+
+    @property
+    def bulk_max_workers(self):
+        """
+        Gets the maximum number of concurrent requests made by bulk
+        operations, such as ``delete_many``, which the provider cannot
+        perform with a single request.
+
+        :rtype: ``int``
+        :return: The maximum number of concurrent requests.
+        """
+        return int(self.get('bulk_max_workers', DEFAULT_BULK_MAX_WORKERS))
+
+    @property
+    def thread_safe(self):
+        """
+        A flag indicating whether the provider may be shared between
+        threads. In thread-safe mode, SDK clients and sessions which are not
+        themselves thread-safe are created once per thread that uses them,
+        instead of once per provider. Lazily created connections are always
+        initialised under a lock. Disabled by default.
+
+        :rtype: ``bool``
+        :return: Whether thread-safe mode is on.
+        """
+        return self.get('thread_safe', False)
+
     @property
     def debug_mode(self):
         """
@@ -81,15 +216,69 @@ class BaseConfiguration(Configuration):
 
 class BaseCloudProvider(CloudProvider):
 
+    # The config key holding the name of the provider's region
+    REGION_CONFIG_KEY = None
+
     def __init__(self, config):
         self._config = BaseConfiguration(config)
         self._config_parser = ConfigParser()
         self._config_parser.read(CloudBridgeConfigLocations)
+        self._polling_policy = None
+        self._client_pool = None
+        self._service_cache = None
+        # Lazily created connections, shared and per thread
+        self._connections = {}
+        self._thread_connections = threading.local()
+        self._connections_lock = threading.RLock()
+        if self._config.cache_enabled:
+            self._service_cache = ServiceCache(self._config.cache_ttls,
+                                               self._config.cache_max_size)
 
     @property
     def config(self):
         return self._config
 
+    @property
+    def service_cache(self):
+        """
+        The :class:`.ServiceCache` used by this provider's services, or
+        ``None`` if caching is not enabled through the ``cache_enabled``
+        config value.
+        """
+        return self._service_cache
+
+    @property
+    def client_pool(self):
+        """
+        The :class:`.ClientPool` from which this provider draws its SDK
+        clients. Unless ``connection_pool_shared`` is disabled, this is the
+        pool shared by all providers in the process.
+        """
+        if self._client_pool is None:
+            if self.config.connection_pool_shared:
+                self._client_pool = ClientPool.shared()
+            else:
+                self._client_pool = ClientPool()
+        return self._client_pool
+
+    @property
+    def polling_policy(self):
+        """
+        The :class:`.PollingPolicy` used when waiting for objects or
+        operations to complete. A custom policy may be supplied through the
+        ``polling_policy`` config key; otherwise one is built from the
+        ``default_wait_*`` config values.
+        """
+        if not self._polling_policy:
+            self._polling_policy = self.config.get('polling_policy') or \
+                PollingPolicy(
+                    interval=self.config.default_wait_interval,
+                    multiplier=self.config.default_wait_multiplier,
+                    max_interval=self.config.default_wait_max_interval,
+                    jitter=self.config.default_wait_jitter,
+                    timeout=self.config.default_wait_timeout)
+        return self._polling_policy
+
     @property
     def name(self):
         return str(self.__class__.__name__)
@@ -137,6 +326,110 @@ class BaseCloudProvider(CloudProvider):
                  service_type)
         return False
 
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        policy = self.polling_policy
+        if timeout is None:
+            timeout = policy.timeout
+
+        assert timeout >= 0
+        assert interval is None or interval >= 0
+        assert timeout >= (policy.interval if interval is None else interval)
+
+        end_time = time.time() + timeout
+        delays = policy.delays(interval=interval)
+        pending = list(resources)
+
+        while True:
+            failed = [r for r in pending
+                      if r.state in (terminal_states or [])]
+            if failed:
+                raise WaitStateException(
+                    "Objects: {0} are in terminal states: {1} and cannot be"
+                    " waited on.".format(failed, [r.state for r in failed]))
+            pending = [r for r in pending if r.state not in target_states]
+            if not pending:
+                break
+            log.debug("%s objects have not reached target state(s): %s."
+                      " Waiting another %s seconds...", len(pending),
+                      target_states, int(end_time - time.time()))
+            time.sleep(min(next(delays), max(end_time - time.time(), 0)))
+            if time.time() > end_time:
+                raise WaitStateException(
+                    "Waited too long for objects: {0} to become ready. They"
+                    " are still in states: {1}".format(
+                        pending, [r.state for r in pending]))
+            self._refresh_all(pending)
+        log.debug("All objects successfully reached target state(s): %s",
+                  target_states)
+        return True
+
+    def for_region(self, region_name):
+        if region_name == getattr(self, 'region_name', None):
+            return self
+        return self._get_connection(
+            'region:' + region_name,
+            lambda: self.__class__(self._region_config(region_name)))
+
+    def _region_config(self, region_name):
+        """
+        Returns the configuration of a provider for the given region.
+        """
+        config = dict(self.config)
+        config[self.REGION_CONFIG_KEY] = region_name
+        return config
+
+    def across_regions(self, regions=None, max_workers=None, timeout=None):
+        if regions is None:
+            regions = self.compute.regions
+        return MultiRegionView(
+            self, [getattr(region, 'name', region) for region in regions],
+            max_workers=max_workers, timeout=timeout)
+
+    def _refresh_all(self, resources):
+        """
+        Refresh a list of objects, grouping them by type so that each group
+        can be refreshed with as few provider requests as possible.
+        """
+        groups = OrderedDict()
+        for resource in resources:
+            groups.setdefault(type(resource), []).append(resource)
+        for resource_cls, group in groups.items():
+            resource_cls._refresh_all(group)
+
+    def _get_connection(self, name, factory, per_thread=False):
+        """
+        Returns the lazily created connection (or any other SDK object)
+        ``name``, calling ``factory`` to create it on first use. Creation
+        happens under a lock, so that concurrent callers receive the same
+        object.
+
+        :type name: ``str``
+        :param name: The name under which the object is held.
+
+        :type factory: ``callable``
+        :param factory: A function without arguments creating the object.
+
+        :type per_thread: ``bool``
+        :param per_thread: Whether the object is not thread-safe. In
+                           thread-safe mode, such objects are created once
+                           per thread.
+        """
+        if per_thread and self.config.thread_safe:
+            connections = getattr(self._thread_connections, 'values', None)
+            if connections is None:
+                connections = self._thread_connections.values = {}
+            if name not in connections:
+                connections[name] = factory()
+            return connections[name]
+        connection = self._connections.get(name)
+        if connection is None:
+            with self._connections_lock:
+                connection = self._connections.get(name)
+                if connection is None:
+                    connection = self._connections[name] = factory()
+        return connection
+
     def _get_config_value(self, key, default_value):
         """
         A convenience method to extract a configuration value.
@@ -17,11 +17,13 @@ from cloudbridge.cloud.interfaces.exceptions \
     import InvalidConfigurationException
 from cloudbridge.cloud.interfaces.exceptions import InvalidLabelException
 from cloudbridge.cloud.interfaces.exceptions import InvalidNameException
+from cloudbridge.cloud.interfaces.exceptions import ProviderInternalException
 from cloudbridge.cloud.interfaces.exceptions import WaitStateException
 from cloudbridge.cloud.interfaces.resources import AttachmentInfo
 from cloudbridge.cloud.interfaces.resources import Bucket
 from cloudbridge.cloud.interfaces.resources import BucketContainer
 from cloudbridge.cloud.interfaces.resources import BucketObject
+from cloudbridge.cloud.interfaces.resources import BulkResult
 from cloudbridge.cloud.interfaces.resources import CloudResource
 from cloudbridge.cloud.interfaces.resources import FloatingIP
 from cloudbridge.cloud.interfaces.resources import FloatingIPContainer
@@ -71,6 +73,20 @@ class BaseCloudResource(CloudResource):
     def __init__(self, provider):
         self.__provider = provider
 
+    def _invalidate_cache(self, service_name=None):
+        """
+        Discards the provider's cached lookups which may return this
+        resource, after it was changed or deleted, or those of the given
+        service.
+        """
+        cache = getattr(self._provider, 'service_cache', None)
+        if cache is None:
+            return
+        if service_name:
+            cache.invalidate(service_name)
+        else:
+            cache.invalidate_resource(self)
+
     @staticmethod
     def is_valid_resource_name(name):
         if not name:
@@ -137,18 +153,21 @@ class BaseObjectLifeCycleMixin(ObjectLifeCycleMixin):
     """
 
     def wait_for(self, target_states, terminal_states=None, timeout=None,
-
                  interval=None):
+        policy = self._provider.polling_policy
         if timeout is None:
-            timeout = self._provider.config.default_wait_timeout
-        if interval is None:
-            interval = self._provider.config.default_wait_interval
+            timeout = policy.timeout
 
         assert timeout >= 0
-        assert interval >= 0
-        assert timeout >= interval
+        assert interval is None or interval >= 0
+        assert timeout >= (policy.interval if interval is None else interval)
 
-        end_time = time.time() + timeout
+        start_time = time.time()
+        end_time = start_time + timeout
+        # Transition times are learned per resource type and target state
+        key = (type(self).__name__, tuple(target_states))
+        delays = policy.delays(key=key, interval=interval)
+        waited = False
 
         while self.state not in target_states:
             if self.state in (terminal_states or []):
@@ -163,16 +182,34 @@ class BaseObjectLifeCycleMixin(ObjectLifeCycleMixin):
                     self.state,
                     int(end_time - time.time()),
                     target_states)
-                time.sleep(interval)
+                time.sleep(min(next(delays),
+                               max(end_time - time.time(), 0)))
+                waited = True
                 if time.time() > end_time:
                     raise WaitStateException(
                         "Waited too long for object: {0} to become ready. It's"
                         " still in state: {1}".format(self, self.state))
             self.refresh()
+        if waited:
+            policy.record(key, time.time() - start_time)
         log.debug("Object: %s successfully reached target state: %s",
                   self, self.state)
         return True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        """
+        Refresh a list of objects of this type. The default implementation
+        simply refreshes each object in turn. Providers which can describe
+        several objects in a single request should override this method.
+
+        :type resources: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :param resources: The objects to refresh. All objects are instances
+                          of this class.
+        """
+        for resource in resources:
+            resource.refresh()
+
 
 class BaseResultList(ResultList):
 
@@ -268,18 +305,33 @@ class BasePageableObjectMixin(PageableObjectMixin):
         for result in self.iter():
             yield result
 
-    def iter(self, **kwargs):
+    def iter(self, prefetch=0, **kwargs):
+        """
+        Iterate through all objects, fetching pages with ``list()`` as
+        iteration progresses.
+
+        :type prefetch: ``int``
+        :param prefetch: The number of pages to fetch ahead on a background
+                         thread while the current page is being consumed.
+                         If 0, each page is fetched only once the previous
+                         one has been consumed.
+        """
+        pages = self._iter_pages(**kwargs)
+        if prefetch:
+            pages = cb_helpers.prefetch(pages, prefetch)
+        for page in pages:
+            for result in page:
+                yield result
+
+    def _iter_pages(self, **kwargs):
         result_list = self.list(**kwargs)
         if result_list.supports_server_paging:
-            for result in result_list:
-                yield result
+            yield result_list
             while result_list.is_truncated:
                 result_list = self.list(marker=result_list.marker, **kwargs)
-                for result in result_list:
-                    yield result
+                yield result_list
         else:
-            for result in result_list.data:
-                yield result
+            yield result_list.data
 
 
 class BaseVMType(BaseCloudResource, VMType):
@@ -709,6 +761,9 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
     # s/537772/what-is-the-most-correct-regular-expression-for-a-unix-file-path
     CB_NAME_PATTERN = re.compile(r"[^\0]+")
 
+    # Default size of the chunks requested by iter_content()
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+
     def __init__(self, provider):
         super(BaseBucketObject, self).__init__(provider)
 
@@ -730,6 +785,10 @@ class BaseBucketObject(BaseCloudResource, BucketObject):
     def save_content(self, target_stream):
         shutil.copyfileobj(self.iter_content(), target_stream)
 
+    def download_to_file(self, path, transfer_config=None):
+        with open(path, 'wb') as f:
+            self.save_content(f)
+
     def __eq__(self, other):
         return (isinstance(other, BucketObject) and
                 # pylint:disable=protected-access
@@ -755,6 +814,10 @@ class BaseBucket(BaseCloudResource, Bucket):
 
 class BaseBucketContainer(BasePageableObjectMixin, BucketContainer):
 
+    # Maximum number of objects deleted by each call to _delete_batch().
+    # Providers which can delete several objects per request raise this.
+    DELETE_BATCH_SIZE = 1
+
     def __init__(self, provider, bucket):
         self.__provider = provider
         self.bucket = bucket
@@ -763,6 +826,71 @@ class BaseBucketContainer(BasePageableObjectMixin, BucketContainer):
     def _provider(self):
         return self.__provider
 
+    def delete_many(self, keys, progress=None):
+        return list(self._iter_delete(keys, progress))
+
+    def _iter_delete(self, keys, progress=None):
+        """
+        Deletes the objects named by ``keys`` in batches of
+        ``DELETE_BATCH_SIZE``, with up to ``bulk_max_workers`` batches in
+        flight, and yields a :class:`.BulkResult` per key. ``keys`` is
+        consumed only as batches are sent, so it may be a listing of any
+        length.
+        """
+        def delete_batch(batch):
+            try:
+                return self._delete_batch(batch)
+            except Exception as e:
+                log.debug("Deleting objects from bucket %s failed: %s",
+                          self.bucket.name, e)
+                return [BulkResult(key, error=e) for key in batch]
+
+        deleted = 0
+        batches = cb_helpers.chunked(keys, self.DELETE_BATCH_SIZE)
+        for results in cb_helpers.bounded_map(
+                delete_batch, batches,
+                self._provider.config.bulk_max_workers):
+            for result in results:
+                if result.success:
+                    deleted += 1
+                yield result
+            if progress:
+                progress(deleted)
+
+    def _delete_batch(self, keys):
+        """
+        Deletes a batch of objects, returning a :class:`.BulkResult` per
+        key. Deletes objects one at a time by default.
+        """
+        return [cb_helpers.bulk_call(self._delete_object, key)
+                for key in keys]
+
+    def _delete_object(self, key):
+        obj = self.get(key)
+        if obj:
+            obj.delete()
+
+    def _iter_keys(self):
+        """
+        Returns an iterator over the names of all objects in this bucket.
+        """
+        return (obj.name for obj in self.iter())
+
+    def _purge(self, progress=None):
+        """
+        Deletes all objects in this bucket, as they are listed.
+        """
+        failed = 0
+        error = None
+        for result in self._iter_delete(self._iter_keys(), progress):
+            if not result.success:
+                failed += 1
+                error = error or result.error
+        if failed:
+            raise ProviderInternalException(
+                "Could not delete {0} objects from bucket {1}: {2}".format(
+                    failed, self.bucket.name, error))
+
 
 class BaseGatewayContainer(GatewayContainer, BasePageableObjectMixin):
 
@@ -1,7 +1,16 @@
 """
 Base implementation for services available through a provider
 """
+import bisect
+import copy
+import functools
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections import namedtuple
+
+import six
 
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseNetwork
@@ -32,16 +41,376 @@ from .resources import ClientPagedResultList
 
 log = logging.getLogger(__name__)
 
+# Adapts a family name to the attribute interface expected by Query
+_Family = namedtuple('_Family', 'family')
+
+# Services which are cached by default when the cache is enabled, and the
+# time (in seconds) for which their results remain valid. These services
+# return resources which change rarely, if ever.
+DEFAULT_CACHE_TTLS = {
+    'regions': 3600,
+    'vm_types': 3600,
+    'images': 300
+}
+DEFAULT_CACHE_MAX_SIZE = 1000
+
+
+class ServiceCache(object):
+    """
+    A read-through cache for the ``get``, ``list`` and ``find`` methods of a
+    provider's services.
+
+    Entries are keyed by service name, method and arguments, expire after
+    the service's TTL and are evicted in least recently used order once
+    ``max_size`` entries are held. All entries of a service are invalidated
+    whenever that service creates or deletes a resource, or one of its
+    resources is deleted or relabelled. Services without a TTL are not
+    cached.
+
+    :type ttls: ``dict``
+    :param ttls: A mapping of service names (e.g. ``regions``) to TTLs in
+                 seconds.
+
+    :type max_size: ``int``
+    :param max_size: The maximum number of cached entries.
+    """
+
+    def __init__(self, ttls, max_size=DEFAULT_CACHE_MAX_SIZE):
+        self._ttls = dict(ttls)
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        # Invalidation counters, used to discard results loaded concurrently
+        # with an invalidation
+        self._generations = {}
+        # Maps resource classes to the service which returned them
+        self._kinds = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, service_name):
+        return self._ttls.get(service_name)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_load(self, service_name, key, loader):
+        """
+        Returns the cached result for ``key`` or calls ``loader`` to
+        retrieve and cache it. Lists are returned as copies, so that callers
+        modifying a result do not modify the cached entry.
+        """
+        ttl = self._ttls.get(service_name)
+        if not ttl:
+            return loader()
+        try:
+            hash(key)
+        except TypeError:
+            # Arguments which cannot be used as keys are not cached
+            return loader()
+        key = (service_name,) + key
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry and entry[0] > time.time():
+                # Re-insert to mark as most recently used
+                self._entries[key] = entry
+                return self._copy(entry[1])
+            generation = self._generations.get(service_name, 0)
+        value = loader()
+        with self._lock:
+            if generation == self._generations.get(service_name, 0):
+                self._entries[key] = (time.time() + ttl, value)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)
+                for item in (value if isinstance(value, list) else [value]):
+                    if item is not None:
+                        self._kinds[type(item)] = service_name
+        return self._copy(value)
+
+    @staticmethod
+    def _copy(value):
+        # A shallow copy preserves the attributes of result lists
+        return copy.copy(value) if isinstance(value, list) else value
+
+    def invalidate(self, service_name=None):
+        """
+        Discards all cached entries for the given service, or the whole cache
+        if no service is given.
+        """
+        with self._lock:
+            if service_name:
+                self._generations[service_name] = \
+                    self._generations.get(service_name, 0) + 1
+                for key in [k for k in self._entries if k[0] == service_name]:
+                    del self._entries[key]
+            else:
+                for name in set(self._ttls) | set(self._generations):
+                    self._generations[name] = \
+                        self._generations.get(name, 0) + 1
+                self._entries.clear()
+
+    def invalidate_resource(self, resource):
+        """
+        Discards all cached entries for the service which returned resources
+        of the same type as ``resource``. If no such resource was cached, the
+        service is unknown and the whole cache is discarded.
+        """
+        service_name = self._kinds.get(type(resource))
+        log.debug("Invalidating cached %s after change to %s",
+                  service_name or 'services', resource)
+        self.invalidate(service_name)
+
+
+class VMTypeCatalog(object):
+    """
+    An immutable, indexed collection of VM types, which answers ``get`` and
+    ``find`` queries without scanning every type.
+
+    Types are indexed by id, by family and by name (as reversed, sorted
+    names, since a literal name pattern matches the end of a type's name).
+    The ``vcpus``, ``ram`` and ``size_ephemeral_disks`` attributes are held
+    in sorted arrays, so that exact and range queries are binary searches.
+
+    Example:
+
+    .. code-block:: python
+
+        catalog = provider.compute.vm_types.catalog
+        catalog.find(vcpus__gte=4, ram__lt=16)
+        catalog.find_cheapest(min_vcpus=8, min_ram=32)
+
+    :type vm_types: ``list`` of :class:`.VMType`
+    :param vm_types: The VM types to index.
+
+    :type cost: ``callable``
+    :param cost: Returns the cost of a VM type, or ``None`` if unknown.
+                 Types are ordered by cost in ``find_cheapest``, and types
+                 without a cost by size.
+    """
+
+    # Attributes which can be queried by value or range
+    RANGE_ATTRS = ('vcpus', 'ram', 'size_ephemeral_disks')
+    RANGE_OPS = {
+        'gte': lambda keys, v: (bisect.bisect_left(keys, v), len(keys)),
+        'gt': lambda keys, v: (bisect.bisect_right(keys, v), len(keys)),
+        'lte': lambda keys, v: (0, bisect.bisect_right(keys, v)),
+        'lt': lambda keys, v: (0, bisect.bisect_left(keys, v)),
+        'eq': lambda keys, v: (bisect.bisect_left(keys, v),
+                               bisect.bisect_right(keys, v)),
+    }
+
+    def __init__(self, vm_types, cost=None):
+        self._types = list(vm_types)
+        self._by_id = {}
+        self._by_family = {}
+        for pos, vm_type in enumerate(self._types):
+            self._by_id.setdefault(vm_type.id, vm_type)
+            self._by_family.setdefault(vm_type.family, []).append(pos)
+        names = sorted((vm_type.name[::-1], pos)
+                       for pos, vm_type in enumerate(self._types)
+                       if vm_type.name)
+        self._rev_names = [name for name, _ in names]
+        self._rev_name_pos = [pos for _, pos in names]
+        # attribute -> (sorted values, positions of the matching types)
+        self._ranges = {}
+        for attr in self.RANGE_ATTRS:
+            values = sorted((getattr(vm_type, attr), pos)
+                            for pos, vm_type in enumerate(self._types)
+                            if getattr(vm_type, attr) is not None)
+            self._ranges[attr] = ([value for value, _ in values],
+                                  [pos for _, pos in values])
+        costs = [cost(vm_type) if cost else None for vm_type in self._types]
+        self._cost_order = {
+            pos: rank for rank, pos in enumerate(sorted(
+                range(len(self._types)),
+                key=lambda pos: (costs[pos] is None, costs[pos] or 0,
+                                 self._types[pos].vcpus or 0,
+                                 self._types[pos].ram or 0,
+                                 self._types[pos].size_total_disk or 0)))}
+
+    def __len__(self):
+        return len(self._types)
+
+    def __iter__(self):
+        return iter(self._types)
+
+    @property
+    def families(self):
+        """
+        The families of the VM types in this catalog.
+        """
+        return [family for family in self._by_family if family]
+
+    def get(self, vm_type_id):
+        """
+        Returns the VM type with the given id, or ``None``.
+        """
+        return self._by_id.get(vm_type_id)
+
+    def _match_names(self, pattern):
+        if (isinstance(pattern, six.string_types) and
+                not set('*?[') & set(pattern)):
+            # A literal matches names ending with it, which are the reversed
+            # names starting with the reversed literal
+            prefix = pattern[::-1]
+            start = end = bisect.bisect_left(self._rev_names, prefix)
+            while (end < len(self._rev_names) and
+                   self._rev_names[end].startswith(prefix)):
+                end += 1
+            return set(self._rev_name_pos[start:end])
+        query = cb_helpers.Query({'name': pattern})
+        return {pos for pos, vm_type in enumerate(self._types)
+                if query.matches(vm_type)}
+
+    def _match_families(self, pattern):
+        # There are few families, so match each of them rather than each type
+        query = cb_helpers.Query({'family': pattern})
+        positions = set()
+        for family, family_pos in self._by_family.items():
+            if query.matches(_Family(family)):
+                positions.update(family_pos)
+        return positions
+
+    def _match_range(self, attr, op, value):
+        keys, positions = self._ranges[attr]
+        start, end = self.RANGE_OPS[op](keys, value)
+        return set(positions[start:end])
+
+    def _positions(self, kwargs):
+        candidates = []
+        unknown = {}
+        for key, value in kwargs.items():
+            if value is None:
+                continue
+            attr, _, op = key.partition('__')
+            if key in ('name', 'family'):
+                # Empty patterns are ignored, as in other find() methods
+                if value and key == 'name':
+                    candidates.append(self._match_names(value))
+                elif value:
+                    candidates.append(self._match_families(value))
+            elif attr in self.RANGE_ATTRS and op in self.RANGE_OPS:
+                candidates.append(self._match_range(attr, op, value))
+            elif attr in self.RANGE_ATTRS and not op:
+                candidates.append(self._match_range(attr, 'eq', value))
+            else:
+                unknown[key] = value
+        if unknown:
+            raise TypeError(
+                "Unrecognised parameters for search: %s. Supported "
+                "attributes: name, family and %s, with an optional __gte,"
+                " __gt, __lte or __lt suffix" % (
+                    unknown, ", ".join(self.RANGE_ATTRS)))
+        if not candidates:
+            return set(range(len(self._types)))
+        # Intersect the smallest candidate sets first
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+    def find(self, **kwargs):
+        """
+        Returns the VM types which match all of the given criteria, in
+        catalog order.
+
+        ``name`` and ``family`` are matched as in other ``find()`` methods.
+        ``vcpus``, ``ram`` and ``size_ephemeral_disks`` match exact values,
+        or ranges when suffixed with ``__gte``, ``__gt``, ``__lte`` or
+        ``__lt``, e.g. ``find(vcpus__gte=4, ram__lte=16)``.
+
+        :rtype: ``list`` of :class:`.VMType`
+        :return: The matching VM types.
+        """
+        return [self._types[pos] for pos in sorted(self._positions(kwargs))]
+
+    def find_cheapest(self, min_vcpus=None, min_ram=None,
+                      min_ephemeral_disk=None, **kwargs):
+        """
+        Returns the cheapest VM type with at least the given resources, or
+        ``None`` if no type qualifies. Additional criteria are interpreted as
+        in :meth:`find`.
+
+        :type min_vcpus: ``int``
+        :param min_vcpus: Minimum number of virtual CPUs.
+
+        :type min_ram: ``float``
+        :param min_ram: Minimum amount of RAM, in GB.
+
+        :type min_ephemeral_disk: ``int``
+        :param min_ephemeral_disk: Minimum total size of ephemeral disks,
+                                   in GB.
+
+        :rtype: :class:`.VMType`
+        :return: The cheapest matching VM type.
+        """
+        kwargs.update(vcpus__gte=min_vcpus, ram__gte=min_ram,
+                      size_ephemeral_disks__gte=min_ephemeral_disk)
+        positions = self._positions(kwargs)
+        if not positions:
+            return None
+        return self._types[min(positions, key=self._cost_order.get)]
+
 
 class BaseCloudService(CloudService):
 
+    # Name under which this service's results are cached. Services without
+    # a name are never cached.
+    _cache_name = None
+    CACHED_METHODS = ('get', 'list', 'find')
+    INVALIDATING_METHODS = ('create', 'delete', 'create_many',
+                            'delete_many')
+
     def __init__(self, provider):
         self._provider = provider
+        cache = getattr(provider, 'service_cache', None)
+        if (cache is not None and self._cache_name and
+                cache.ttl(self._cache_name)):
+            self._enable_cache(cache)
 
     @property
     def provider(self):
         return self._provider
 
+    def _bulk_delete(self, resource_ids, delete=None):
+        """
+        Deletes the given resources concurrently. Each resource is fetched
+        and deleted, unless a ``delete`` function taking an id is given.
+        """
+        def delete_resource(resource_id):
+            resource = self.get(resource_id)
+            if resource:
+                resource.delete()
+
+        return cb_helpers.bulk_apply(delete or delete_resource, resource_ids,
+                                     self.provider.config.bulk_max_workers)
+
+    def _enable_cache(self, cache):
+        """
+        Route this service's lookups through the given cache, and invalidate
+        the cache whenever this service is used to create or delete
+        resources.
+        """
+        def cached(method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                key = (method.__name__, args, tuple(sorted(kwargs.items())))
+                return cache.get_or_load(
+                    self._cache_name, key, lambda: method(*args, **kwargs))
+            return wrapper
+
+        def invalidating(method):
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    cache.invalidate(self._cache_name)
+            return wrapper
+
+        for name in self.CACHED_METHODS:
+            if hasattr(self, name):
+                setattr(self, name, cached(getattr(self, name)))
+        for name in self.INVALIDATING_METHODS:
+            if hasattr(self, name):
+                setattr(self, name, invalidating(getattr(self, name)))
+
 
 class BaseSecurityService(SecurityService, BaseCloudService):
 
@@ -52,6 +421,8 @@ class BaseSecurityService(SecurityService, BaseCloudService):
 class BaseKeyPairService(
         BasePageableObjectMixin, KeyPairService, BaseCloudService):
 
+    _cache_name = 'key_pairs'
+
     def __init__(self, provider):
         super(BaseKeyPairService, self).__init__(provider)
 
@@ -73,10 +444,15 @@ class BaseKeyPairService(
             kp.delete()
         return True
 
+    def delete_many(self, key_pair_ids):
+        return self._bulk_delete(key_pair_ids)
+
 
 class BaseVMFirewallService(
         BasePageableObjectMixin, VMFirewallService, BaseCloudService):
 
+    _cache_name = 'vm_firewalls'
+
     def __init__(self, provider):
         super(BaseVMFirewallService, self).__init__(provider)
 
@@ -104,23 +480,38 @@ class BaseStorageService(StorageService, BaseCloudService):
 class BaseVolumeService(
         BasePageableObjectMixin, VolumeService, BaseCloudService):
 
+    _cache_name = 'volumes'
+
     def __init__(self, provider):
         super(BaseVolumeService, self).__init__(provider)
 
+    def delete_many(self, volume_ids):
+        return self._bulk_delete(volume_ids)
+
 
 class BaseSnapshotService(
         BasePageableObjectMixin, SnapshotService, BaseCloudService):
 
+    _cache_name = 'snapshots'
+
     def __init__(self, provider):
         super(BaseSnapshotService, self).__init__(provider)
 
+    def delete_many(self, snapshot_ids):
+        return self._bulk_delete(snapshot_ids)
+
 
 class BaseBucketService(
         BasePageableObjectMixin, BucketService, BaseCloudService):
 
+    _cache_name = 'buckets'
+
     def __init__(self, provider):
         super(BaseBucketService, self).__init__(provider)
 
+    def delete_many(self, bucket_ids):
+        return self._bulk_delete(bucket_ids)
+
 
 class BaseComputeService(ComputeService, BaseCloudService):
 
@@ -131,6 +522,8 @@ class BaseComputeService(ComputeService, BaseCloudService):
 class BaseImageService(
         BasePageableObjectMixin, ImageService, BaseCloudService):
 
+    _cache_name = 'images'
+
     def __init__(self, provider):
         super(BaseImageService, self).__init__(provider)
 
@@ -138,30 +531,79 @@ class BaseImageService(
 class BaseInstanceService(
         BasePageableObjectMixin, InstanceService, BaseCloudService):
 
+    _cache_name = 'instances'
+
     def __init__(self, provider):
         super(BaseInstanceService, self).__init__(provider)
 
+    def create_many(self, count, label, image, vm_type, subnet, zone=None,
+                    key_pair=None, vm_firewalls=None, user_data=None,
+                    launch_config=None, tags=None, **kwargs):
+        return cb_helpers.bulk_apply(
+            lambda _: self.create(
+                label, image, vm_type, subnet, zone=zone, key_pair=key_pair,
+                vm_firewalls=vm_firewalls, user_data=user_data,
+                launch_config=launch_config, tags=tags, **kwargs),
+            [None] * count, self.provider.config.bulk_max_workers)
+
+    def delete_many(self, instance_ids):
+        return self._bulk_delete(instance_ids)
+
 
 class BaseVMTypeService(
         BasePageableObjectMixin, VMTypeService, BaseCloudService):
 
+    _cache_name = 'vm_types'
+
     def __init__(self, provider):
         super(BaseVMTypeService, self).__init__(provider)
+        self._catalog = None
+        self._catalog_time = 0
+        self._catalog_lock = threading.Lock()
+
+    @property
+    def catalog(self):
+        """
+        An indexed :class:`VMTypeCatalog` of all VM types. The catalog is
+        built on first use and rebuilt once it is older than the
+        ``vm_types`` TTL of the ``cache_ttls`` config value, or on each use
+        if there is no such TTL.
+        """
+        ttl = self.provider.config.cache_ttls.get('vm_types')
+        with self._catalog_lock:
+            if (self._catalog is None or not ttl or
+                    time.time() - self._catalog_time > ttl):
+                log.debug("Building the VM type catalog for %s",
+                          self.provider)
+                self._catalog = VMTypeCatalog(self, cost=self._vm_type_cost)
+                self._catalog_time = time.time()
+            return self._catalog
+
+    def _vm_type_cost(self, vm_type):
+        """
+        Returns the hourly cost of a VM type, if known by the provider.
+        """
+        return None
 
     def get(self, vm_type_id):
-        vm_type = (t for t in self if t.id == vm_type_id)
-        return next(vm_type, None)
+        return self.catalog.get(vm_type_id)
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['name']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        return ClientPagedResultList(self._provider,
+                                     self.catalog.find(**kwargs))
+
+    def find_cheapest(self, min_vcpus=None, min_ram=None,
+                      min_ephemeral_disk=None, **kwargs):
+        return self.catalog.find_cheapest(
+            min_vcpus=min_vcpus, min_ram=min_ram,
+            min_ephemeral_disk=min_ephemeral_disk, **kwargs)
 
 
 class BaseRegionService(
         BasePageableObjectMixin, RegionService, BaseCloudService):
 
+    _cache_name = 'regions'
+
     def __init__(self, provider):
         super(BaseRegionService, self).__init__(provider)
 
@@ -181,6 +623,8 @@ class BaseNetworkingService(NetworkingService, BaseCloudService):
 class BaseNetworkService(
         BasePageableObjectMixin, NetworkService, BaseCloudService):
 
+    _cache_name = 'networks'
+
     def __init__(self, provider):
         super(BaseNetworkService, self).__init__(provider)
 
@@ -211,6 +655,8 @@ class BaseNetworkService(
 class BaseSubnetService(
         BasePageableObjectMixin, SubnetService, BaseCloudService):
 
+    _cache_name = 'subnets'
+
     def __init__(self, provider):
         super(BaseSubnetService, self).__init__(provider)
 
@@ -236,6 +682,8 @@ class BaseSubnetService(
 class BaseRouterService(
         BasePageableObjectMixin, RouterService, BaseCloudService):
 
+    _cache_name = 'routers'
+
     def __init__(self, provider):
         super(BaseRouterService, self).__init__(provider)
 
@@ -2,6 +2,7 @@ import importlib
 import inspect
 import logging
 import pkgutil
+import time
 from collections import defaultdict
 
 from cloudbridge.cloud import providers
@@ -19,6 +20,26 @@ class ProviderList(object):
     OPENSTACK = 'openstack'
 
 
+# The provider implementations shipped with CloudBridge, as the import paths
+# of their classes, by provider id. Provider ids are also the names of the
+# provider modules. Providers are only imported once requested, so that
+# creating a provider does not import the SDKs of all the others.
+PROVIDER_MANIFEST = {
+    ProviderList.AWS: {
+        'class': 'cloudbridge.cloud.providers.aws.provider.AWSCloudProvider',
+        'mock_class':
+            'cloudbridge.cloud.providers.aws.provider.MockAWSCloudProvider'},
+    ProviderList.AZURE: {
+        'class':
+            'cloudbridge.cloud.providers.azure.provider.AzureCloudProvider'},
+    ProviderList.GCE: {
+        'class': 'cloudbridge.cloud.providers.gce.provider.GCECloudProvider'},
+    ProviderList.OPENSTACK: {
+        'class': 'cloudbridge.cloud.providers.openstack.provider.'
+                 'OpenStackCloudProvider'},
+}
+
+
 class CloudProviderFactory(object):
 
     """
@@ -27,6 +48,10 @@ class CloudProviderFactory(object):
 
     def __init__(self):
         self.provider_list = defaultdict(dict)
+        # The ids of the manifest providers which have been imported
+        self._imported = set()
+        # The time (in seconds) taken to import each provider, by id
+        self.import_times = {}
         log.debug("Providers List: %s", self.provider_list)
 
     def register_provider_class(self, cls):
@@ -71,12 +96,17 @@ class CloudProviderFactory(object):
     def discover_providers(self):
         """
         Discover all available providers within the
-        ``cloudbridge.cloud.providers`` package.
+        ``cloudbridge.cloud.providers`` package. This imports all providers;
+        use :meth:`list_provider_ids` to list providers without importing
+        them.
         Note that this methods does not guard against a failed import.
         """
         for _, modname, _ in pkgutil.iter_modules(providers.__path__):
-            log.debug("Importing provider: %s", modname)
-            self._import_provider(modname)
+            if modname in PROVIDER_MANIFEST:
+                self._load_provider(modname)
+            else:
+                log.debug("Importing provider: %s", modname)
+                self._import_provider(modname)
 
     def _import_provider(self, module_name):
         """
@@ -92,12 +122,46 @@ class CloudProviderFactory(object):
             log.debug("Registering the provider: %s", cls)
             self.register_provider_class(cls)
 
+    def _load_provider(self, provider_id):
+        """
+        Imports the classes of the given manifest provider, unless they have
+        already been imported. Classes registered explicitly with
+        :meth:`register_provider_class` take precedence over the manifest.
+        Raises an ImportError if the import does not succeed.
+        """
+        if provider_id in self._imported:
+            return
+        start = time.time()
+        classes = {}
+        for kind, path in PROVIDER_MANIFEST[provider_id].items():
+            module_name, class_name = path.rsplit('.', 1)
+            classes[kind] = getattr(importlib.import_module(module_name),
+                                    class_name)
+        impl = self.provider_list[provider_id]
+        for kind, cls in classes.items():
+            impl.setdefault(kind, cls)
+        self._imported.add(provider_id)
+        self.import_times[provider_id] = time.time() - start
+        log.info("Imported '%s' provider in %.3f seconds", provider_id,
+                 self.import_times[provider_id])
+
+    def list_provider_ids(self):
+        """
+        Get the ids of the available providers, without importing them.
+
+        :rtype: ``list`` of ``str``
+        :return: The sorted ids of the providers shipped with CloudBridge,
+                 and of any registered providers.
+        """
+        return sorted(set(PROVIDER_MANIFEST) | set(self.provider_list))
+
     def list_providers(self):
         """
         Get a list of available providers.
 
         It uses a simple automatic discovery system by iterating through all
-        submodules in cloudbridge.cloud.providers.
+        submodules in cloudbridge.cloud.providers, which imports all
+        providers.
 
         :rtype: dict
         :return: A dict of available providers and their implementations in the
@@ -108,12 +172,12 @@ class CloudProviderFactory(object):
                                          der}
                  }
         """
-        if not self.provider_list:
+        if not self._imported.issuperset(PROVIDER_MANIFEST):
             self.discover_providers()
         log.debug("List of available providers: %s", self.provider_list)
         return self.provider_list
 
-    def create_provider(self, name, config):
+    def create_provider(self, name, config, async_=False):
         """
         Searches all available providers for a CloudProvider interface with the
         given name, and instantiates it based on the given config dictionary,
@@ -129,6 +193,11 @@ class CloudProviderFactory(object):
                        or other iterables of length two). See specific provider
                        implementation for the required fields.
 
+        :type async_: ``bool``
+        :param async_: If True, wrap the provider in an
+                       :class:`.AsyncCloudProvider`, whose service calls
+                       return awaitables. Requires Python 3.7.
+
         :return:  a concrete provider instance
         :rtype: ``object`` of :class:`.CloudProvider`
         """
@@ -140,8 +209,17 @@ class CloudProviderFactory(object):
             raise NotImplementedError(
                 'A provider with name {0} could not be'
                 ' found'.format(name))
+        if async_:
+            # Calls to an async provider are made from the executor's threads
+            config = dict(config, thread_safe=True)
         log.debug("Created '%s' provider", name)
-        return provider_class(config)
+        provider = provider_class(config)
+        if async_:
+            # Imported here since asyncio is not available on Python 2
+            from cloudbridge.cloud.base.async_provider import \
+                AsyncCloudProvider
+            return AsyncCloudProvider(provider)
+        return provider
 
     def get_provider_class(self, name, get_mock=False):
         """
@@ -156,7 +234,13 @@ class CloudProviderFactory(object):
                  if the provider was not found.
         """
         log.debug("Returning a class for the %s provider", name)
-        impl = self.list_providers().get(name)
+        if name in PROVIDER_MANIFEST:
+            # Only the requested provider is imported
+            self._load_provider(name)
+        elif name not in self.provider_list:
+            # Providers outside the manifest are found by discovery
+            self.discover_providers()
+        impl = self.provider_list.get(name)
         if impl:
             if get_mock and impl.get("mock_class"):
                 log.debug("param get_mock set to True, returning "
@@ -3,6 +3,7 @@ Public interface exports
 """
 from .provider import CloudProvider  # noqa
 from .provider import TestMockHelperMixin  # noqa
+from .resources import BulkResult  # noqa
 from .resources import CloudServiceType  # noqa
 from .resources import InstanceState  # noqa
 from .resources import LaunchConfig  # noqa
@@ -10,5 +11,6 @@ from .resources import MachineImageState  # noqa
 from .resources import NetworkState  # noqa
 from .resources import Region  # noqa
 from .resources import SnapshotState  # noqa
+from .resources import TransferConfig  # noqa
 from .resources import VolumeState  # noqa
 from .exceptions import InvalidConfigurationException  # noqa
@@ -102,6 +102,112 @@ class CloudProvider(object):
         """
         pass
 
+    @abstractmethod
+    def wait_for_all(self, resources, target_states, terminal_states=None,
+                     timeout=None, interval=None):
+        """
+        Wait for a group of objects to reach one of the target states. This
+        behaves like calling :meth:`.ObjectLifeCycleMixin.wait_for` on each
+        object, but objects are refreshed together on each polling interval,
+        which allows providers to batch the state queries for objects of the
+        same type into a single request.
+
+        Example:
+
+        .. code-block:: python
+
+            vols = [provider.storage.volumes.create('vol-%s' % i, 1, zone)
+                    for i in range(5)]
+            provider.wait_for_all(vols, [VolumeState.AVAILABLE],
+                                  terminal_states=[VolumeState.ERROR])
+
+        :type resources: ``list`` of :class:`.ObjectLifeCycleMixin`
+        :param resources: The objects to wait on.
+
+        :type target_states: ``list`` of states
+        :param target_states: The list of target states to wait for.
+
+        :type terminal_states: ``list`` of states
+        :param terminal_states: A list of terminal states after which the
+                                objects will not transition into a target
+                                state. A WaitStateException will be raised if
+                                any object enters a terminal state.
+
+        :type timeout: ``int``
+        :param timeout: The maximum length of time (in seconds) to wait for
+                        all objects to reach a target state. If not
+                        specified, defaults to the config's
+                        ``default_wait_timeout``.
+
+        :type interval: ``int``
+        :param interval: How frequently to poll the objects' states (in
+                         seconds). If not specified, defaults to the config's
+                         ``default_wait_interval``.
+
+        :rtype: ``True``
+        :return: Returns ``True`` if successful. A
+                 :class:`.WaitStateException` exception may be thrown by the
+                 underlying service if any object cannot reach a target state
+                 within the specified timeout or enters a terminal state.
+        """
+        pass
+
+    @abstractmethod
+    def for_region(self, region_name):
+        """
+        Returns a provider with the same configuration as this one, but
+        connected to another region. Region providers are created once and
+        reused, and share their SDK clients through the connection pool.
+
+        :type region_name: ``str``
+        :param region_name: The name of the region.
+
+        :rtype: :class:`.CloudProvider`
+        :return: A provider for the given region.
+        """
+        pass
+
+    @abstractmethod
+    def across_regions(self, regions=None, max_workers=None, timeout=None):
+        """
+        Returns a view of this provider across several regions, in which
+        service calls are made concurrently in each region and their results
+        merged into a single list. An error in one region does not prevent
+        the others from returning their results. Note that paged calls,
+        such as ``list()``, return a page of results from each region; to
+        fetch all results, iterate in each region with
+        :meth:`.MultiRegionView.map` (e.g.
+        ``view.map(lambda p: list(p.compute.instances))``).
+
+        Example:
+
+        .. code-block:: python
+
+            view = provider.across_regions(timeout=60)
+            instances = view.compute.instances.list()
+            for region, instance in instances.tagged():
+                print(region, instance.name)
+            for region, error in instances.errors.items():
+                print("Could not list instances in", region, error)
+
+        :type regions: ``list`` of ``str`` or :class:`.Region`
+        :param regions: The regions to query. Defaults to all regions.
+
+        :type max_workers: ``int``
+        :param max_workers: The maximum number of regions queried at once.
+                            Defaults to the number of regions.
+
+        :type timeout: ``float``
+        :param timeout: The number of seconds to wait for each call to
+                        complete in all regions. Regions which have not
+                        responded by then are reported as errors.
+
+        :rtype: :class:`.MultiRegionView`
+        :return: A view whose calls return a
+                 :class:`.MultiRegionResultList`.
+        """
+        pass
+
 #     @abstractproperty
 #     def account(self):
 #         """
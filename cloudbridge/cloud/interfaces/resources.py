@@ -181,6 +181,43 @@ class Configuration(dict):
         """
         pass
 
+    @abstractproperty
+    def default_wait_multiplier(self):
+        """
+        Get the factor by which the wait interval grows after each poll.
+
+        Waits start polling at ``default_wait_interval`` and back off by this
+        factor, up to ``default_wait_max_interval``. A value of 1 polls at a
+        constant interval.
+
+        :rtype: ``float``
+        :return: The wait interval multiplier.
+        """
+        pass
+
+    @abstractproperty
+    def default_wait_max_interval(self):
+        """
+        Get the maximum interval between polls of an object's state.
+
+        :rtype: ``int``
+        :return: The maximum wait interval (in seconds).
+        """
+        pass
+
+    @abstractproperty
+    def default_wait_jitter(self):
+        """
+        Get whether wait intervals are randomized.
+
+        If enabled, each interval is drawn uniformly between zero and the
+        computed interval, which avoids many waiters polling in lockstep.
+
+        :rtype: ``bool``
+        :return: ``True`` if wait intervals are randomized.
+        """
+        pass
+
     @abstractproperty
     def debug_mode(self):
         """
@@ -281,7 +318,11 @@ class ObjectLifeCycleMixin(object):
 
         :type interval: ``int``
         :param interval: How frequently to poll the object's state (in
-                         seconds). If no interval is specified, the global
+                         seconds). The interval backs off by the provider's
+                         default_wait_multiplier after each poll, and the
+                         first poll may be timed using the previously
+                         observed duration of the same kind of transition.
+                         If no interval is specified, the global
                          default_wait_interval defined in the provider config
                          will apply.
 
@@ -2244,6 +2285,100 @@ class VMFirewallRule(CloudResource):
         pass
 
 
+class BulkResult(object):
+    """
+    The outcome of a bulk operation, such as ``create_many`` or
+    ``delete_many``, for a single item. A failure of one item does not
+    affect the others.
+
+    :type id: ``str``
+    :param id: The id of the item. Defaults to the id of ``resource``.
+
+    :type resource: :class:`.CloudResource`
+    :param resource: The created resource, if any.
+
+    :type error: ``Exception``
+    :param error: The error raised while processing the item, if any.
+    """
+
+    def __init__(self, id=None, resource=None, error=None):
+        # pylint:disable=redefined-builtin
+        self._id = id
+        self.resource = resource
+        self.error = error
+
+    @property
+    def id(self):
+        if self._id is None and self.resource is not None:
+            return self.resource.id
+        return self._id
+
+    @property
+    def success(self):
+        """
+        Whether the item was processed successfully.
+
+        :rtype: ``bool``
+        """
+        return self.error is None
+
+    def __repr__(self):
+        return "<BulkResult: id={0}, success={1}, error={2!r}>".format(
+            self.id, self.success, self.error)
+
+
+class TransferConfig(object):
+    """
+    Options for transferring large objects to and from a bucket. Providers
+    which support it split a transfer into parts of ``part_size`` bytes and
+    transfer up to ``concurrency`` parts in parallel. Options which are not
+    supported by a provider are ignored.
+
+    Example:
+
+    .. code-block:: python
+
+        config = TransferConfig(part_size=64 * 1024 * 1024, concurrency=16)
+        obj.upload_from_file('/data/reference.fa', transfer_config=config)
+        obj.download_to_file('/tmp/reference.fa', transfer_config=config)
+
+    :type part_size: ``int``
+    :param part_size: Size of each part in bytes. Objects no larger than
+                      this are transferred in a single request.
+
+    :type concurrency: ``int``
+    :param concurrency: Maximum number of parts transferred in parallel.
+
+    :type max_in_flight: ``int``
+    :param max_in_flight: Maximum number of bytes buffered in memory for
+                          parts which are waiting to be transferred.
+                          Defaults to ``part_size * concurrency``.
+    """
+    DEFAULT_PART_SIZE = 8 * 1024 * 1024
+    DEFAULT_CONCURRENCY = 10
+
+    def __init__(self, part_size=None, concurrency=None, max_in_flight=None):
+        self.part_size = part_size or self.DEFAULT_PART_SIZE
+        self.concurrency = concurrency or self.DEFAULT_CONCURRENCY
+        self.max_in_flight = (max_in_flight or
+                              self.part_size * self.concurrency)
+
+    @property
+    def max_parts_in_flight(self):
+        """
+        The number of parts which fit within ``max_in_flight``.
+
+        :rtype: ``int``
+        :return: The maximum number of buffered parts, at least 1.
+        """
+        return max(1, self.max_in_flight // self.part_size)
+
+    def __repr__(self):
+        return ("<TransferConfig: part_size={0}, concurrency={1}, "
+                "max_in_flight={2}>".format(self.part_size, self.concurrency,
+                                            self.max_in_flight))
+
+
 class BucketObject(CloudResource):
     """
     Represents an object stored within a bucket.
@@ -2286,12 +2421,19 @@ class BucketObject(CloudResource):
         pass
 
     @abstractmethod
-    def iter_content(self):
+    def iter_content(self, chunk_size=None):
         """
-        Returns this object's content as an iterable.
+        Returns this object's content as an iterable. The content is streamed
+        from the provider in chunks as it is consumed, so objects of any size
+        can be read without holding them in memory.
+
+        :type chunk_size: ``int``
+        :param chunk_size: Maximum size in bytes of each chunk requested from
+                           the provider. Defaults to 1 MiB.
 
         :rtype: Iterable
-        :return: An iterable of the file contents
+        :return: An iterable of the file contents, which also supports
+                 ``read()``
 
         """
         pass
@@ -2304,22 +2446,47 @@ class BucketObject(CloudResource):
         pass
 
     @abstractmethod
-    def upload(self, source_stream):
+    def download_to_file(self, path, transfer_config=None):
+        """
+        Save the contents of this object to the file pointed by the "path"
+        variable. Providers which support ranged reads may download parts of
+        the object in parallel.
+
+        :type path: ``str``
+        :param path: Path of the file to write. It is overwritten if it
+                     exists.
+
+        :type transfer_config: :class:`.TransferConfig`
+        :param transfer_config: Part size and concurrency of the download.
+                                Provider defaults are used if not specified.
+        """
+        pass
+
+    @abstractmethod
+    def upload(self, source_stream, transfer_config=None):
         """
         Set the contents of the object to the data read from the source stream.
 
+        :type transfer_config: :class:`.TransferConfig`
+        :param transfer_config: Part size and concurrency of the upload.
+                                Provider defaults are used if not specified.
+
         :rtype: ``bool``
         :return: ``True`` if successful.
         """
         pass
 
     @abstractmethod
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, transfer_config=None):
         """
         Store the contents of the file pointed by the "path" variable.
 
         :type path: ``str``
         :param path: Absolute path to the file to be uploaded to S3.
+
+        :type transfer_config: :class:`.TransferConfig`
+        :param transfer_config: Part size and concurrency of the upload.
+                                Provider defaults are used if not specified.
         """
         pass
 
@@ -2405,13 +2572,22 @@ class Bucket(CloudResource):
         pass
 
     @abstractmethod
-    def delete(self, delete_contents=False):
+    def delete(self, delete_contents=False, progress=None):
         """
         Delete this bucket.
 
         :type delete_contents: ``bool``
         :param delete_contents: If ``True``, all objects within the bucket
-                                will be deleted.
+                                will be deleted first. Objects are deleted
+                                as they are listed, in batches where the
+                                provider supports it, and concurrently.
+
+        :type progress: ``callable``
+        :param progress: Called with the number of objects deleted so far,
+                         after each batch of objects has been deleted.
+                         Providers which delete a bucket's objects along
+                         with the bucket, server side, such as Azure, do
+                         not call it.
 
         :rtype: ``bool``
         :return: ``True`` if successful.
@@ -2485,3 +2661,36 @@ class BucketContainer(PageableObjectMixin):
         :return: The newly created bucket object
         """
         pass
+
+    @abstractmethod
+    def delete_many(self, keys, progress=None):
+        """
+        Delete the objects with the given names from this bucket.
+
+        Objects are deleted in batches where the provider supports it (e.g.
+        up to 1000 objects per request on AWS), with batches or individual
+        deletes sent concurrently. ``keys`` may be any iterable, which is
+        consumed as deletion progresses.
+
+        Example:
+
+        .. code-block:: python
+
+            results = bucket.objects.delete_many(['logs/1', 'logs/2'])
+            failed = [r.id for r in results if not r.success]
+
+        :type keys: ``iterable`` of ``str``
+        :param keys: The names of the objects to delete.
+
+        :type progress: ``callable``
+        :param progress: Called with the number of objects deleted so far,
+                         after each batch of objects has been deleted.
+                         Providers which delete a bucket's objects along
+                         with the bucket, server side, such as Azure, do
+                         not call it.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: A result per name, in the order of ``keys``. Deleting an
+                 object which does not exist is considered successful.
+        """
+        pass
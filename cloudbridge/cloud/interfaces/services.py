@@ -215,7 +215,7 @@ class InstanceService(PageableObjectMixin, CloudService):
     @abstractmethod
     def create(self, label, image, vm_type, subnet, zone=None,
                key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None,
+               launch_config=None, tags=None,
                **kwargs):
         """
         Creates a new virtual machine instance.
@@ -277,11 +277,50 @@ class InstanceService(PageableObjectMixin, CloudService):
                construct a launch configuration object, call
                provider.compute.instances.create_launch_config()
 
+        :type  tags: ``dict``
+        :param tags: Additional key/value pairs attached to the instance as it
+                     is created, as the provider's native tags (AWS, Azure),
+                     labels (GCE) or metadata (OpenStack).
+
         :rtype: ``object`` of :class:`.Instance`
         :return:  an instance of Instance class
         """
         pass
 
+    @abstractmethod
+    def create_many(self, count, label, image, vm_type, subnet, zone=None,
+                    key_pair=None, vm_firewalls=None, user_data=None,
+                    launch_config=None, tags=None, **kwargs):
+        """
+        Creates ``count`` identical virtual machine instances, with a single
+        request where the provider supports it, or concurrent requests
+        otherwise. The remaining arguments are the same as for
+        :meth:`create`.
+
+        :type  count: ``int``
+        :param count: The number of instances to create.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: The result of each launch. The ``resource`` of a
+                 successful result is the new :class:`.Instance`.
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, instance_ids):
+        """
+        Deletes several instances, with a single request where the provider
+        supports it, or concurrent requests otherwise. Instances which do not
+        exist are reported as deleted.
+
+        :type instance_ids: ``list`` of ``str``
+        :param instance_ids: The ids of the instances to delete.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: The result of each deletion, in the order of the ids.
+        """
+        pass
+
     def create_launch_config(self):
         """
         Creates a ``LaunchConfig`` object which can be used
@@ -333,7 +372,8 @@ class VolumeService(PageableObjectMixin, CloudService):
         pass
 
     @abstractmethod
-    def create(self, label, size, zone, snapshot=None, description=None):
+    def create(self, label, size, zone, snapshot=None, description=None,
+               tags=None):
         """
         Creates a new volume.
 
@@ -355,11 +395,31 @@ class VolumeService(PageableObjectMixin, CloudService):
                             some providers. Providers that do not support this
                             property will return ``None``.
 
+        :type  tags: ``dict``
+        :param tags: Additional key/value pairs attached to the volume as it
+                     is created, as the provider's native tags (AWS, Azure),
+                     labels (GCE) or metadata (OpenStack).
+
         :rtype: ``object`` of :class:`.Volume`
         :return: a newly created Volume object.
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, volume_ids):
+        """
+        Deletes several volumes, with a single request where the provider
+        supports it, or concurrent requests otherwise. Volumes which do not
+        exist are reported as deleted.
+
+        :type volume_ids: ``list`` of ``str``
+        :param volume_ids: The ids of the volumes to delete.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: The result of each deletion, in the order of the ids.
+        """
+        pass
+
 
 class SnapshotService(PageableObjectMixin, CloudService):
     """
@@ -400,7 +460,7 @@ class SnapshotService(PageableObjectMixin, CloudService):
         pass
 
     @abstractmethod
-    def create(self, label, volume, description=None):
+    def create(self, label, volume, description=None, tags=None):
         """
         Creates a new snapshot off a volume.
 
@@ -415,11 +475,31 @@ class SnapshotService(PageableObjectMixin, CloudService):
                             some providers. Providers that do not support this
                             property will return None.
 
+        :type  tags: ``dict``
+        :param tags: Additional key/value pairs attached to the snapshot as it
+                     is created, as the provider's native tags (AWS, Azure),
+                     labels (GCE) or metadata (OpenStack).
+
         :rtype: ``object`` of :class:`.Snapshot`
         :return: a newly created Snapshot object.
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, snapshot_ids):
+        """
+        Deletes several snapshots, with a single request where the provider
+        supports it, or concurrent requests otherwise. Snapshots which do not
+        exist are reported as deleted.
+
+        :type snapshot_ids: ``list`` of ``str``
+        :param snapshot_ids: The ids of the snapshots to delete.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: The result of each deletion, in the order of the ids.
+        """
+        pass
+
 
 class StorageService(CloudService):
 
@@ -944,6 +1024,21 @@ class BucketService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, bucket_ids):
+        """
+        Deletes several buckets, with a single request where the provider
+        supports it, or concurrent requests otherwise. Buckets which do not
+        exist are reported as deleted.
+
+        :type bucket_ids: ``list`` of ``str``
+        :param bucket_ids: The ids of the buckets to delete.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: The result of each deletion, in the order of the ids.
+        """
+        pass
+
 
 class SecurityService(CloudService):
 
@@ -1082,6 +1177,21 @@ class KeyPairService(PageableObjectMixin, CloudService):
         """
         pass
 
+    @abstractmethod
+    def delete_many(self, key_pair_ids):
+        """
+        Deletes several key pairs, with a single request where the provider
+        supports it, or concurrent requests otherwise. Key pairs which do not
+        exist are reported as deleted.
+
+        :type key_pair_ids: ``list`` of ``str``
+        :param key_pair_ids: The ids of the key pairs to delete.
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        :return: The result of each deletion, in the order of the ids.
+        """
+        pass
+
 
 class VMFirewallService(PageableObjectMixin, CloudService):
 
@@ -1198,12 +1308,54 @@ class VMTypeService(PageableObjectMixin, CloudService):
     @abstractmethod
     def find(self, **kwargs):
         """
-        Searches for instances by a given list of attributes.
+        Searches for VM types by a given list of attributes.
 
-        Supported attributes: name
+        Supported attributes: name, family, vcpus, ram and
+        size_ephemeral_disks. The numeric attributes can be compared by range
+        by adding a ``__gte``, ``__gt``, ``__lte`` or ``__lt`` suffix.
+
+        Example:
+
+        .. code-block:: python
+
+            vm_types = provider.compute.vm_types.find(vcpus__gte=4,
+                                                      ram__lte=16)
 
-        :rtype: ``object`` of :class:`.VMType`
-        :return: an Instance object
+        :rtype: ``list`` of :class:`.VMType`
+        :return: a list of VMType objects
+        """
+        pass
+
+    @abstractmethod
+    def find_cheapest(self, min_vcpus=None, min_ram=None,
+                      min_ephemeral_disk=None, **kwargs):
+        """
+        Returns the cheapest VM type which provides at least the requested
+        resources. Types are compared by price where the provider publishes
+        one, and by size otherwise.
+
+        Example:
+
+        .. code-block:: python
+
+            vm_type = provider.compute.vm_types.find_cheapest(min_vcpus=8,
+                                                              min_ram=32)
+
+        :type min_vcpus: ``int``
+        :param min_vcpus: Minimum number of virtual CPUs.
+
+        :type min_ram: ``float``
+        :param min_ram: Minimum amount of RAM, in GB.
+
+        :type min_ephemeral_disk: ``int``
+        :param min_ephemeral_disk: Minimum total size of ephemeral disks,
+                                   in GB.
+
+        :type kwargs: ``dict``
+        :param kwargs: Additional criteria, as supported by ``find()``.
+
+        :rtype: :class:`.VMType`
+        :return: The cheapest matching VMType, or ``None`` if none match.
         """
         pass
 
@@ -7,6 +7,9 @@ from botocore import xform_name
 from botocore.exceptions import ClientError
 from botocore.utils import merge_dicts
 
+import six
+
+import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.resources import ServerPagedResultList
 
@@ -50,6 +53,123 @@ def find_tag_value(tags, key):
     return None
 
 
+def tag_specifications(resource_type, tags, label=None, description=None):
+    """
+    Builds the ``TagSpecifications`` parameter of an EC2 create request, so
+    that the resource is tagged as it is created rather than with a
+    follow-up ``CreateTags`` request.
+
+    :type resource_type: ``str``
+    :param resource_type: The EC2 type of the resource, e.g. ``volume``.
+
+    :type tags: ``dict``
+    :param tags: Additional tags to set.
+
+    :type label: ``str``
+    :param label: The CloudBridge label, stored in the ``Name`` tag.
+
+    :type description: ``str``
+    :param description: The description, stored in the ``Description`` tag.
+
+    :rtype: ``list`` of ``dict``
+    :return: The tag specifications, or ``None`` if there are no tags.
+    """
+    tags = dict(tags or {})
+    if label:
+        tags['Name'] = label
+    if description:
+        tags['Description'] = description
+    if not tags:
+        return None
+    return [{'ResourceType': resource_type,
+             'Tags': [{'Key': key, 'Value': value}
+                      for key, value in sorted(tags.items())]}]
+
+
+def to_boto_filters(filter_map, kwargs):
+    """
+    Translates CloudBridge ``find()`` arguments into EC2 ``Filters``, so
+    that matching is done by the server. Arguments which are translated are
+    popped from ``kwargs``. The remaining arguments cannot be expressed as
+    EC2 filters and must be matched on the client.
+    e.g. Given
+        {'label': 'cb-*'}, {'label': 'tag:Name'}
+    returns:
+        [{'Name': 'tag:Name', 'Values': ['cb-*']}]
+
+    :type filter_map: ``dict``
+    :param filter_map: Maps CloudBridge attribute names to EC2 filter names
+
+    :type kwargs: ``dict``
+    :param kwargs: The arguments passed to ``find()``
+    """
+    filters = []
+    for attr, filter_name in filter_map.items():
+        value = kwargs.get(attr)
+        # EC2 filters support the * and ? wildcards, but not fnmatch's
+        # [seq] character sets
+        if isinstance(value, six.string_types) and '[' not in value:
+            filters.append({'Name': filter_name,
+                            'Values': [kwargs.pop(attr)]})
+    return filters
+
+
+def refresh_boto_resources(cb_resources, boto_attr, batch_size=200):
+    """
+    Reloads the Boto3 resources wrapped by a list of CloudBridge objects of
+    the same type, using a single describe call per batch of objects instead
+    of one call per object. The describe operation, id filter and result
+    path are inferred from the Boto3 resource model.
+    Objects which are not returned by the batched call (e.g. because they
+    no longer exist) are refreshed individually.
+
+    :type cb_resources: ``list`` of :class:`CloudResource`
+    :param cb_resources: CloudBridge objects of the same type to refresh
+
+    :type boto_attr: ``str``
+    :param boto_attr: Name of the attribute holding the wrapped Boto3
+                      resource (e.g. ``_ec2_instance``)
+
+    :type batch_size: ``int``
+    :param batch_size: Maximum number of ids to describe per request
+    """
+    sample = getattr(cb_resources[0], boto_attr)
+    model = sample.meta.resource_model
+    client = sample.meta.client
+    op_name = xform_name(model.load.request.operation)
+    if not client.can_paginate(op_name):
+        for cb_resource in cb_resources:
+            cb_resource.refresh()
+        return
+    # e.g. instance_id -> instance-id filter and InstanceId response key.
+    # A filter is used rather than the Ids parameter, since the latter
+    # fails the whole request if any one of the ids no longer exists.
+    member_name = model.identifiers[0].member_name
+    id_filter = member_name.replace('_', '-')
+    id_key = ''.join(part.capitalize() for part in member_name.split('_'))
+    # e.g. Reservations[0].Instances[0] -> Reservations[].Instances[]
+    result_path = model.load.path.replace('[0]', '[]')
+
+    pending = {getattr(r, boto_attr).id: r for r in cb_resources}
+    ids = list(pending)
+    for i in range(0, len(ids), batch_size):
+        batch = ids[i:i + batch_size]
+        try:
+            pages = client.get_paginator(op_name).paginate(
+                Filters=[{'Name': id_filter, 'Values': batch}])
+            for item in pages.search(result_path):
+                cb_resource = pending.pop(item.get(id_key), None)
+                if cb_resource:
+                    getattr(cb_resource, boto_attr).meta.data = item
+                    if hasattr(cb_resource, '_unknown_state'):
+                        cb_resource._unknown_state = False
+        except ClientError as e:
+            log.debug("Batched %s failed, falling back to individual"
+                      " refreshes: %s", op_name, e)
+    for cb_resource in pending.values():
+        cb_resource.refresh()
+
+
 class BotoGenericService(object):
     """
     Generic implementation of a Boto3 AWS service. Uses Boto3
@@ -74,15 +194,26 @@ class BotoGenericService(object):
         """
         self.provider = provider
         self.cb_resource = cb_resource
-        self.boto_conn = boto_conn
+        self._boto_conn = boto_conn
         self.boto_collection_model = self._infer_collection_model(
             boto_conn, boto_collection_name)
-        # Perform an empty filter to convert to a ResourceCollection
-        self.boto_collection = (getattr(self.boto_conn, boto_collection_name)
-                                .filter())
-        self.boto_resource = self._infer_boto_resource(
+        self._boto_resource_name = self._infer_boto_resource(
             boto_conn, self.boto_collection_model)
 
+    @property
+    def boto_conn(self):
+        return self._boto_conn
+
+    @property
+    def boto_collection(self):
+        # Perform an empty filter to convert to a ResourceCollection
+        return getattr(self.boto_conn,
+                       self.boto_collection_model.name).filter()
+
+    @property
+    def boto_resource(self):
+        return getattr(self.boto_conn, self._boto_resource_name)
+
     def _infer_collection_model(self, conn, collection_name):
         log.debug("Retrieving boto model for collection: %s", collection_name)
         return next(col for col in conn.meta.resource_model.collections
@@ -94,7 +225,7 @@ class BotoGenericService(object):
         resource_model = next(
             sr for sr in conn.meta.resource_model.subresources
             if sr.resource.model.name == collection_model.resource.model.name)
-        return getattr(self.boto_conn, resource_model.name)
+        return resource_model.name
 
     def get(self, resource_id):
         """
@@ -244,6 +375,46 @@ class BotoGenericService(object):
             collection = collection.filter(**kwargs)
         return self.list(limit=limit, marker=marker, collection=collection)
 
+    def find_by(self, filter_map, kwargs, limit=None, marker=None,
+                **boto_kwargs):
+        """
+        Return a list of resources matching the arguments to a CloudBridge
+        ``find()`` method. Arguments which map to a server-side filter are
+        pushed down to the list request, and only the remainder is matched
+        on the client.
+
+        :type filter_map: ``dict``
+        :param filter_map: Maps supported CloudBridge attribute names to
+                           EC2 filter names, e.g. ``{'label': 'tag:Name'}``
+
+        :type kwargs: ``dict``
+        :param kwargs: The arguments passed to ``find()``
+
+        :type boto_kwargs: ``dict``
+        :param boto_kwargs: Additional arguments passed as-is to the list
+                            request
+        """
+        # All kwargs should be supported filters
+        if set(kwargs) - set(filter_map):
+            raise TypeError("Unrecognised parameters for search: %s."
+                            " Supported attributes: %s"
+                            % (kwargs, ", ".join(filter_map)))
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        filters = to_boto_filters(filter_map, kwargs)
+        collection = self.boto_collection
+        if filters:
+            collection = collection.filter(Filters=filters)
+        if boto_kwargs:
+            collection = collection.filter(**boto_kwargs)
+        if not kwargs:
+            return self.list(limit=limit, marker=marker,
+                             collection=collection)
+        log.debug("Filtering %s on the client", kwargs)
+        objs = [self.cb_resource(self.provider, obj) for obj in collection]
+        matches = cb_helpers.generic_find(list(kwargs), kwargs, objs)
+        return ClientPagedResultList(self.provider, matches,
+                                     limit=limit, marker=marker)
+
     def create(self, boto_method, **kwargs):
         """
         Creates a resource
@@ -264,6 +435,39 @@ class BotoGenericService(object):
         else:
             return self.cb_resource(self.provider, result) if result else None
 
+    def delete_many(self, resource_ids, boto_method, id_param,
+                    not_found_codes=()):
+        """
+        Deletes resources concurrently, by invoking ``boto_method`` on the
+        client with each id, without fetching the resources first.
+
+        :type resource_ids: ``list`` of ``str``
+        :param resource_ids: IDs of the resources to delete
+
+        :type boto_method: ``str``
+        :param boto_method: Client method deleting a single resource
+
+        :type id_param: ``str``
+        :param id_param: Name of the method's resource id parameter
+
+        :type not_found_codes: ``tuple`` of ``str``
+        :param not_found_codes: Error codes returned for missing resources,
+                                which are reported as deleted
+
+        :rtype: ``list`` of :class:`.BulkResult`
+        """
+        delete = getattr(self.boto_conn.meta.client, boto_method)
+
+        def delete_resource(resource_id):
+            try:
+                delete(**{id_param: resource_id})
+            except ClientError as e:
+                if e.response['Error']['Code'] not in not_found_codes:
+                    raise
+
+        return cb_helpers.bulk_apply(delete_resource, resource_ids,
+                                     self.provider.config.bulk_max_workers)
+
     def delete(self, resource_id):
         """
         Deletes a resource by id
@@ -298,6 +502,11 @@ class BotoEC2Service(BotoGenericService):
             provider, cb_resource, provider.ec2_conn,
             boto_collection_name)
 
+    @property
+    def boto_conn(self):
+        # The provider's connection may be held per thread
+        return self.provider.ec2_conn
+
 
 class BotoS3Service(BotoGenericService):
     """
@@ -319,3 +528,8 @@ class BotoS3Service(BotoGenericService):
         super(BotoS3Service, self).__init__(
             provider, cb_resource, provider.s3_conn,
             boto_collection_name)
+
+    @property
+    def boto_conn(self):
+        # The provider's connection may be held per thread
+        return self.provider.s3_conn
@@ -3,6 +3,8 @@ import logging as log
 
 import boto3
 
+from botocore.config import Config
+
 try:
     # These are installed only for the case of a dev instance
     from moto import mock_ec2
@@ -13,6 +15,7 @@ except ImportError:
     log.debug("Development library moto is not installed.")
 
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.client_pool import credentials_digest
 from cloudbridge.cloud.base.helpers import get_env
 from cloudbridge.cloud.interfaces import TestMockHelperMixin
 
@@ -25,7 +28,11 @@ from .services import AWSStorageService
 class AWSCloudProvider(BaseCloudProvider):
     '''AWS cloud provider interface'''
     PROVIDER_ID = 'aws'
+    REGION_CONFIG_KEY = 'aws_region_name'
     AWS_INSTANCE_DATA_DEFAULT_URL = "http://cloudve.org/cb-aws-vmtypes.json"
+    # Resource classes are generated from the service models on first use
+    # and are shared by all providers, keyed by service name
+    _resource_classes = {}
 
     def __init__(self, config):
         super(AWSCloudProvider, self).__init__(config)
@@ -53,12 +60,6 @@ class AWSCloudProvider(BaseCloudProvider):
             'endpoint_url': self._get_config_value('s3_endpoint_url', None)
         }
 
-        # service connections, lazily initialized
-        self._session = None
-        self._ec2_conn = None
-        self._vpc_conn = None
-        self._s3_conn = None
-
         # Initialize provider services
         self._compute = AWSComputeService(self)
         self._networking = AWSNetworkingService(self)
@@ -68,24 +69,20 @@ class AWSCloudProvider(BaseCloudProvider):
     @property
     def session(self):
         '''Get a low-level session object or create one if needed'''
-        if not self._session:
-            if self.config.debug_mode:
-                boto3.set_stream_logger(level=log.DEBUG)
-            self._session = boto3.session.Session(
-                region_name=self.region_name, **self.session_cfg)
-        return self._session
+        # Sessions are not thread-safe
+        return self._get_connection('session', self._connect_session,
+                                    per_thread=True)
 
     @property
     def ec2_conn(self):
-        if not self._ec2_conn:
-            self._ec2_conn = self._connect_ec2()
-        return self._ec2_conn
+        # Resources are not thread-safe, but share a pooled client
+        return self._get_connection('ec2_conn', self._connect_ec2,
+                                    per_thread=True)
 
     @property
     def s3_conn(self):
-        if not self._s3_conn:
-            self._s3_conn = self._connect_s3()
-        return self._s3_conn
+        return self._get_connection('s3_conn', self._connect_s3,
+                                    per_thread=True)
 
     @property
     def compute(self):
@@ -103,6 +100,12 @@ class AWSCloudProvider(BaseCloudProvider):
     def storage(self):
         return self._storage
 
+    def _connect_session(self):
+        if self.config.debug_mode:
+            boto3.set_stream_logger(level=log.DEBUG)
+        return boto3.session.Session(
+            region_name=self.region_name, **self.session_cfg)
+
     def _connect_ec2(self):
         """
         Get a boto ec2 connection object.
@@ -111,13 +114,50 @@ class AWSCloudProvider(BaseCloudProvider):
 
     def _connect_ec2_region(self, region_name=None):
         '''Get an EC2 resource object'''
-        return self.session.resource(
-            'ec2', region_name=region_name, **self.ec2_cfg)
+        return self._get_resource('ec2', region_name or self.region_name,
+                                  self.ec2_cfg)
 
     def _connect_s3(self):
         '''Get an S3 resource object'''
-        return self.session.resource(
-            's3', region_name=self.region_name, **self.s3_cfg)
+        return self._get_resource('s3', self.region_name, self.s3_cfg)
+
+    @property
+    def _botocore_options(self):
+        options = {'max_pool_connections':
+                   self.config.connection_pool_max_size}
+        # tcp_keepalive is only supported by botocore >= 1.27
+        if (self.config.connection_pool_keepalive and
+                'tcp_keepalive' in Config.OPTION_DEFAULTS):
+            options['tcp_keepalive'] = True
+        return options
+
+    def _get_client(self, service, region_name, cfg):
+        """
+        Get a low-level boto client from the provider's client pool, so that
+        clients and their connections are reused across regions and by
+        providers with identical credentials.
+        """
+        options = self._botocore_options
+        key = ('aws', service, region_name,
+               credentials_digest(self.session_cfg, cfg, options))
+        return self.client_pool.get(key, lambda: self.session.client(
+            service, region_name=region_name, config=Config(**options),
+            **cfg))
+
+    def _get_resource(self, service, region_name, cfg):
+        """
+        Get a boto resource object backed by a pooled client. Resources are
+        cheap to create once their class has been generated, but are not
+        thread-safe, so a new one is returned on each call.
+        """
+        client = self._get_client(service, region_name, cfg)
+        resource_class = self._resource_classes.get(service)
+        if not resource_class:
+            resource = self.session.resource(
+                service, region_name=region_name, **cfg)
+            resource_class = type(resource)
+            self._resource_classes[service] = resource_class
+        return resource_class(client=client)
 
 
 class MockAWSCloudProvider(AWSCloudProvider, TestMockHelperMixin):
@@ -125,6 +165,16 @@ class MockAWSCloudProvider(AWSCloudProvider, TestMockHelperMixin):
     def __init__(self, config):
         super(MockAWSCloudProvider, self).__init__(config)
 
+    @property
+    def _botocore_options(self):
+        options = super(MockAWSCloudProvider, self)._botocore_options
+        # botocore >= 1.36 adds checksum trailers to uploads by default,
+        # which moto stores as part of the object's content
+        if 'request_checksum_calculation' in Config.OPTION_DEFAULTS:
+            options['request_checksum_calculation'] = 'when_required'
+            options['response_checksum_validation'] = 'when_required'
+        return options
+
     def setUpMock(self):
         """
         Let Moto take over all socket communications
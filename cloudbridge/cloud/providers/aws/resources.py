@@ -5,6 +5,8 @@ import hashlib
 import inspect
 import logging
 
+from boto3.s3.transfer import TransferConfig as BotoTransferConfig
+
 from botocore.exceptions import ClientError
 
 import cloudbridge.cloud.base.helpers as cb_helpers
@@ -32,7 +34,10 @@ from cloudbridge.cloud.base.resources import BaseVMFirewallRuleContainer
 from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
+from cloudbridge.cloud.base.resources import ServerPagedResultList
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
+from cloudbridge.cloud.interfaces.exceptions import ProviderInternalException
+from cloudbridge.cloud.interfaces.resources import BulkResult
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
 from cloudbridge.cloud.interfaces.resources import MachineImageState
@@ -45,6 +50,7 @@ from cloudbridge.cloud.interfaces.resources import VolumeState
 
 from .helpers import BotoEC2Service
 from .helpers import find_tag_value
+from .helpers import refresh_boto_resources
 from .helpers import trim_empty_params
 
 log = logging.getLogger(__name__)
@@ -90,6 +96,7 @@ class AWSMachineImage(BaseMachineImage):
         return find_tag_value(self._ec2_image.tags, 'Name')
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -113,6 +120,7 @@ class AWSMachineImage(BaseMachineImage):
         else:
             return None
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         snapshot_id = [
             bdm.get('Ebs', {}).get('SnapshotId') for bdm in
@@ -137,6 +145,10 @@ class AWSMachineImage(BaseMachineImage):
     def refresh(self):
         self._ec2_image.reload()
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        refresh_boto_resources(resources, '_ec2_image')
+
 
 class AWSPlacementZone(BasePlacementZone):
 
@@ -253,6 +265,7 @@ class AWSInstance(BaseInstance):
         return find_tag_value(self._ec2_instance.tags, 'Name')
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -275,12 +288,13 @@ class AWSInstance(BaseInstance):
 
     @property
     def vm_type(self):
-        return self._provider.compute.vm_types.find(
-            name=self._ec2_instance.instance_type)[0]
+        return self._provider.compute.vm_types.get(
+            self._ec2_instance.instance_type)
 
     def reboot(self):
         self._ec2_instance.reboot()
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._ec2_instance.terminate()
 
@@ -298,10 +312,16 @@ class AWSInstance(BaseInstance):
 
     @property
     def vm_firewalls(self):
-        return [
-            self._provider.security.vm_firewalls.get(fw_id)
-            for fw_id in self.vm_firewall_ids
-        ]
+        fw_ids = self.vm_firewall_ids
+        if not fw_ids:
+            return []
+        # Describe all groups in a single request. A filter is used rather
+        # than GroupIds, which fails if any one group no longer exists.
+        groups = self._provider.ec2_conn.security_groups.filter(
+            Filters=[{'Name': 'group-id', 'Values': fw_ids}])
+        fws = {group.id: AWSVMFirewall(self._provider, group)
+               for group in groups}
+        return [fws.get(fw_id) for fw_id in fw_ids]
 
     @property
     def vm_firewall_ids(self):
@@ -314,6 +334,7 @@ class AWSInstance(BaseInstance):
     def key_pair_id(self):
         return self._ec2_instance.key_name
 
+    @cb_helpers.invalidates_cache(service_name='images')
     def create_image(self, label):
         self.assert_valid_resource_label(label)
         name = self._generate_name_from_label(label, 'cb-img')
@@ -387,6 +408,10 @@ class AWSInstance(BaseInstance):
             # set the state to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        refresh_boto_resources(resources, '_ec2_instance')
+
     # pylint:disable=unused-argument
     def _wait_till_exists(self, timeout=None, interval=None):
         self._ec2_instance.wait_until_exists()
@@ -428,6 +453,7 @@ class AWSVolume(BaseVolume):
             log.warn("Cannot get label for volume {0}: {1}".format(self.id, e))
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -497,6 +523,7 @@ class AWSVolume(BaseVolume):
         snap.wait_till_ready()
         return snap
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._volume.delete()
 
@@ -520,6 +547,10 @@ class AWSVolume(BaseVolume):
             # set the status to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        refresh_boto_resources(resources, '_volume')
+
 
 class AWSSnapshot(BaseSnapshot):
 
@@ -554,6 +585,7 @@ class AWSSnapshot(BaseSnapshot):
             log.warn("Cannot get label for snap {0}: {1}".format(self.id, e))
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -601,6 +633,11 @@ class AWSSnapshot(BaseSnapshot):
             # set the status to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        refresh_boto_resources(resources, '_snapshot')
+
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._snapshot.delete()
 
@@ -642,6 +679,7 @@ class AWSVMFirewall(BaseVMFirewall):
             return None
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -785,6 +823,7 @@ class AWSVMFirewallRule(BaseVMFirewallRule):
             ] if src_dest_fw_id else None
         }
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         ip_perm_entry = self._construct_ip_perms(
             self.protocol, self.from_port, self.to_port,
@@ -806,14 +845,14 @@ class AWSVMFirewallRule(BaseVMFirewallRule):
 class AWSBucketObject(BaseBucketObject):
 
     class BucketObjIterator():
-        CHUNK_SIZE = 4096
 
-        def __init__(self, body):
+        def __init__(self, body, chunk_size):
             self.body = body
+            self.chunk_size = chunk_size
 
         def __iter__(self):
             while True:
-                data = self.read(self.CHUNK_SIZE)
+                data = self.read(self.chunk_size)
                 if data:
                     yield data
                 else:
@@ -846,17 +885,51 @@ class AWSBucketObject(BaseBucketObject):
 
     @property
     def last_modified(self):
+        # Common prefixes returned by a delimited listing have no timestamp
+        if not self._obj.last_modified:
+            return None
         return self._obj.last_modified.strftime("%Y-%m-%dT%H:%M:%S.%f")
 
-    def iter_content(self):
-        return self.BucketObjIterator(self._obj.get().get('Body'))
+    def iter_content(self, chunk_size=None):
+        return self.BucketObjIterator(self._obj.get().get('Body'),
+                                      chunk_size or self.DEFAULT_CHUNK_SIZE)
 
-    def upload(self, data):
-        self._obj.put(Body=data)
+    @staticmethod
+    def _to_boto_transfer_config(transfer_config):
+        if not transfer_config:
+            return None
+        config = BotoTransferConfig(
+            multipart_threshold=transfer_config.part_size,
+            multipart_chunksize=transfer_config.part_size,
+            max_concurrency=transfer_config.concurrency,
+            use_threads=transfer_config.concurrency > 1)
+        # Bounds the memory used by parts read from a stream, or waiting to
+        # be written out of order
+        config.max_in_memory_upload_chunks = \
+            transfer_config.max_parts_in_flight
+        config.max_in_memory_download_chunks = \
+            transfer_config.max_parts_in_flight
+        return config
+
+    def upload(self, data, transfer_config=None):
+        if transfer_config and hasattr(data, 'read'):
+            # Streams are uploaded in concurrent multipart requests
+            self._obj.upload_fileobj(
+                data, Config=self._to_boto_transfer_config(transfer_config))
+        else:
+            self._obj.put(Body=data)
+
+    def upload_from_file(self, path, transfer_config=None):
+        self._obj.upload_file(
+            path, Config=self._to_boto_transfer_config(transfer_config))
 
-    def upload_from_file(self, path):
-        self._obj.upload_file(path)
+    def download_to_file(self, path, transfer_config=None):
+        # Large objects are fetched with concurrent ranged GETs, each of
+        # which is written at its offset in the file
+        self._obj.download_file(
+            path, Config=self._to_boto_transfer_config(transfer_config))
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._obj.delete()
 
@@ -889,15 +962,41 @@ class AWSBucket(BaseBucket):
     def objects(self):
         return self._object_container
 
-    def delete(self, delete_contents=False):
+    @cb_helpers.invalidates_cache
+    def delete(self, delete_contents=False, progress=None):
+        if delete_contents:
+            # pylint:disable=protected-access
+            self.objects._purge(progress)
         self._bucket.delete()
 
 
 class AWSBucketContainer(BaseBucketContainer):
 
+    # The maximum number of keys accepted by DeleteObjects
+    DELETE_BATCH_SIZE = 1000
+
     def __init__(self, provider, bucket):
         super(AWSBucketContainer, self).__init__(provider, bucket)
 
+    def _delete_batch(self, keys):
+        response = self._provider.s3_conn.meta.client.delete_objects(
+            Bucket=self.bucket.name,
+            Delete={'Objects': [{'Key': key} for key in keys],
+                    'Quiet': True})
+        # In quiet mode, only the keys which could not be deleted are listed
+        errors = {error['Key']: ProviderInternalException(
+                      "{0}: {1}".format(error.get('Code'),
+                                        error.get('Message')))
+                  for error in response.get('Errors', [])}
+        return [BulkResult(key, error=errors.get(key)) for key in keys]
+
+    def _iter_keys(self):
+        paginator = self._provider.s3_conn.meta.client.get_paginator(
+            'list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket.name):
+            for item in page.get('Contents', []):
+                yield item['Key']
+
     def get(self, name):
         try:
             # pylint:disable=protected-access
@@ -908,16 +1007,37 @@ class AWSBucketContainer(BaseBucketContainer):
         except ClientError:
             return None
 
-    def list(self, limit=None, marker=None, prefix=None):
-        if prefix:
-            # pylint:disable=protected-access
-            boto_objs = self.bucket._bucket.objects.filter(Prefix=prefix)
-        else:
-            # pylint:disable=protected-access
-            boto_objs = self.bucket._bucket.objects.all()
-        objects = [AWSBucketObject(self._provider, obj) for obj in boto_objs]
-        return ClientPagedResultList(self._provider, objects,
-                                     limit=limit, marker=marker)
+    def list(self, limit=None, marker=None, prefix=None, delimiter=None):
+        """
+        List objects in this bucket, one page at a time.
+
+        The marker is an S3 continuation token. If a ``delimiter`` is given,
+        keys sharing a common prefix up to the delimiter are rolled up into
+        a single entry named after that prefix (e.g. ``logs/``), which
+        allows browsing a bucket like a directory tree.
+        """
+        s3 = self._provider.s3_conn
+        params = trim_empty_params({
+            'Bucket': self.bucket.name,
+            'MaxKeys': limit or self._provider.config.default_result_limit,
+            'Prefix': prefix,
+            'Delimiter': delimiter,
+            'ContinuationToken': marker
+        })
+        response = s3.meta.client.list_objects_v2(**params)
+        objects = []
+        for item in response.get('Contents', []):
+            summary = s3.ObjectSummary(self.bucket.name, item['Key'])
+            summary.meta.data = item
+            objects.append(AWSBucketObject(self._provider, summary))
+        for item in response.get('CommonPrefixes', []):
+            summary = s3.ObjectSummary(self.bucket.name, item['Prefix'])
+            summary.meta.data = {'Key': item['Prefix'], 'Size': 0}
+            objects.append(AWSBucketObject(self._provider, summary))
+        return ServerPagedResultList(
+            response.get('IsTruncated', False),
+            response.get('NextContinuationToken'),
+            False, data=objects)
 
     def find(self, **kwargs):
         obj_list = self
@@ -948,13 +1068,11 @@ class AWSRegion(BaseRegion):
 
     @property
     def zones(self):
-        if self.id == self._provider.region_name:  # optimisation
-            conn = self._provider.ec2_conn
-        else:
-            # pylint:disable=protected-access
-            conn = self._provider._connect_ec2_region(region_name=self.id)
-
-        zones = (conn.meta.client.describe_availability_zones()
+        # The pooled client for the region is reused across calls
+        # pylint:disable=protected-access
+        client = self._provider._get_client('ec2', self.id,
+                                            self._provider.ec2_cfg)
+        zones = (client.describe_availability_zones()
                  .get('AvailabilityZones', []))
         return [AWSPlacementZone(self._provider, zone.get('ZoneName'),
                                  self.id)
@@ -989,6 +1107,7 @@ class AWSNetwork(BaseNetwork):
         return find_tag_value(self._vpc.tags, 'Name')
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -1017,6 +1136,7 @@ class AWSNetwork(BaseNetwork):
     def cidr_block(self):
         return self._vpc.cidr_block
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._vpc.delete()
 
@@ -1033,6 +1153,10 @@ class AWSNetwork(BaseNetwork):
             # set the status to unknown
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        refresh_boto_resources(resources, '_vpc')
+
     def wait_till_ready(self, timeout=None, interval=None):
         self._provider.ec2_conn.meta.client.get_waiter('vpc_available').wait(
             VpcIds=[self.id])
@@ -1069,6 +1193,7 @@ class AWSSubnet(BaseSubnet):
         return find_tag_value(self._subnet.tags, 'Name')
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -1087,6 +1212,7 @@ class AWSSubnet(BaseSubnet):
         return AWSPlacementZone(self._provider, self._subnet.availability_zone,
                                 self._provider.region_name)
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._subnet.delete()
 
@@ -1109,6 +1235,10 @@ class AWSSubnet(BaseSubnet):
             # subnet no longer exists
             self._unknown_state = True
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        refresh_boto_resources(resources, '_subnet')
+
 
 class AWSFloatingIPContainer(BaseFloatingIPContainer):
 
@@ -1157,6 +1287,7 @@ class AWSFloatingIP(BaseFloatingIP):
     def in_use(self):
         return True if self._ip.association_id else False
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._ip.release()
 
@@ -1183,6 +1314,7 @@ class AWSRouter(BaseRouter):
         return find_tag_value(self._route_table.tags, 'Name')
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -1205,6 +1337,7 @@ class AWSRouter(BaseRouter):
     def network_id(self):
         return self._route_table.vpc_id
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._route_table.delete()
 
@@ -1320,6 +1453,7 @@ class AWSInternetGateway(BaseInternetGateway):
             return self._gateway.attachments[0].get('VpcId')
         return None
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         try:
             if self.network_id:
@@ -9,6 +9,8 @@ import cachetools
 
 import requests
 
+import six
+
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.services import BaseBucketService
@@ -29,6 +31,7 @@ from cloudbridge.cloud.base.services import BaseVMTypeService
 from cloudbridge.cloud.base.services import BaseVolumeService
 from cloudbridge.cloud.interfaces.exceptions \
     import DuplicateResourceException, InvalidConfigurationException
+from cloudbridge.cloud.interfaces.resources import BulkResult
 from cloudbridge.cloud.interfaces.resources import KeyPair
 from cloudbridge.cloud.interfaces.resources import MachineImage
 from cloudbridge.cloud.interfaces.resources import Network
@@ -40,6 +43,7 @@ from cloudbridge.cloud.interfaces.resources import Volume
 
 from .helpers import BotoEC2Service
 from .helpers import BotoS3Service
+from .helpers import tag_specifications
 from .resources import AWSBucket
 from .resources import AWSInstance
 from .resources import AWSKeyPair
@@ -92,15 +96,8 @@ class AWSKeyPairService(BaseKeyPairService):
         return self.svc.list(limit=limit, marker=marker)
 
     def find(self, **kwargs):
-        name = kwargs.pop('name', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'name'))
-
-        log.debug("Searching for Key Pair %s", name)
-        return self.svc.find(filter_name='key-name', filter_value=name)
+        log.debug("Searching for Key Pair %s", kwargs)
+        return self.svc.find_by({'name': 'key-name'}, kwargs)
 
     def create(self, name, public_key_material=None):
         log.debug("Creating Key Pair Service %s", name)
@@ -120,6 +117,10 @@ class AWSKeyPairService(BaseKeyPairService):
             else:
                 raise e
 
+    def delete_many(self, key_pair_ids):
+        return self.svc.delete_many(key_pair_ids, 'delete_key_pair',
+                                    'KeyName')
+
 
 class AWSVMFirewallService(BaseVMFirewallService):
 
@@ -144,22 +145,15 @@ class AWSVMFirewallService(BaseVMFirewallService):
         AWSVMFirewall.assert_valid_resource_label(label)
         name = AWSVMFirewall._generate_name_from_label(label, 'cb-fw')
         network_id = network.id if isinstance(network, Network) else network
-        obj = self.svc.create('create_security_group', GroupName=name,
-                              Description=description or name,
-                              VpcId=network_id)
-        obj.label = label
-        return obj
+        return self.svc.create(
+            'create_security_group', GroupName=name,
+            Description=description or name, VpcId=network_id,
+            TagSpecifications=tag_specifications('security-group', None,
+                                                 label=label))
 
     def find(self, **kwargs):
-        # Filter by name or label
-        label = kwargs.pop('label', None)
-        log.debug("Searching for Firewall Service %s", label)
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'label'))
-        return self.svc.find(filter_name='tag:Name',
-                             filter_value=label)
+        log.debug("Searching for Firewall Service %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs)
 
     def delete(self, firewall_id):
         log.info("Deleting Firewall Service with the id %s", firewall_id)
@@ -205,39 +199,33 @@ class AWSVolumeService(BaseVolumeService):
         return self.svc.get(volume_id)
 
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Volume Service %s", label)
-        return self.svc.find(filter_name='tag:Name', filter_value=label)
+        log.debug("Searching for AWS Volume Service %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs)
 
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
 
-    def create(self, label, size, zone, snapshot=None, description=None):
+    def create(self, label, size, zone, snapshot=None, description=None,
+               tags=None):
         log.debug("Creating AWS Volume Service with the parameters "
                   "[label: %s size: %s zone: %s snapshot: %s "
-                  "description: %s]", label, size, zone, snapshot,
-                  description)
+                  "description: %s tags: %s]", label, size, zone, snapshot,
+                  description, tags)
         AWSVolume.assert_valid_resource_label(label)
 
         zone_id = zone.id if isinstance(zone, PlacementZone) else zone
         snapshot_id = snapshot.id if isinstance(
             snapshot, AWSSnapshot) and snapshot else snapshot
 
-        cb_vol = self.svc.create('create_volume', Size=size,
-                                 AvailabilityZone=zone_id,
-                                 SnapshotId=snapshot_id)
-        # Wait until ready to tag instance
-        cb_vol.wait_till_ready()
-        cb_vol.label = label
-        if description:
-            cb_vol.description = description
-        return cb_vol
+        return self.svc.create(
+            'create_volume', Size=size, AvailabilityZone=zone_id,
+            SnapshotId=snapshot_id,
+            TagSpecifications=tag_specifications(
+                'volume', tags, label=label, description=description))
+
+    def delete_many(self, volume_ids):
+        return self.svc.delete_many(volume_ids, 'delete_volume', 'VolumeId',
+                                    ('InvalidVolume.NotFound',))
 
 
 class AWSSnapshotService(BaseSnapshotService):
@@ -254,42 +242,34 @@ class AWSSnapshotService(BaseSnapshotService):
         return self.svc.get(snapshot_id)
 
     def find(self, **kwargs):
-        # Filter by description or label
-        label = kwargs.get('label', None)
-
-        obj_list = []
-        if label:
-            log.debug("Searching for AWS Snapshot with label %s", label)
-            obj_list.extend(self.svc.find(filter_name='tag:Name',
-                                          filter_value=label,
-                                          OwnerIds=['self']))
-        else:
-            obj_list = list(self)
-        filters = ['label']
-        return cb_helpers.generic_find(filters, kwargs, obj_list)
+        log.debug("Searching for AWS Snapshot %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs,
+                                OwnerIds=['self'])
 
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker,
                              OwnerIds=['self'])
 
-    def create(self, label, volume, description=None):
+    def create(self, label, volume, description=None, tags=None):
         """
         Creates a new snapshot of a given volume.
         """
         log.debug("Creating a new AWS snapshot Service with the "
-                  "parameters [label: %s volume: %s description: %s]",
-                  label, volume, description)
+                  "parameters [label: %s volume: %s description: %s "
+                  "tags: %s]", label, volume, description, tags)
         AWSSnapshot.assert_valid_resource_label(label)
 
         volume_id = volume.id if isinstance(volume, AWSVolume) else volume
 
-        cb_snap = self.svc.create('create_snapshot', VolumeId=volume_id)
-        # Wait until ready to tag instance
-        cb_snap.wait_till_ready()
-        cb_snap.label = label
-        if cb_snap.description:
-            cb_snap.description = description
-        return cb_snap
+        return self.svc.create(
+            'create_snapshot', VolumeId=volume_id, Description=description,
+            TagSpecifications=tag_specifications(
+                'snapshot', tags, label=label, description=description))
+
+    def delete_many(self, snapshot_ids):
+        return self.svc.delete_many(snapshot_ids, 'delete_snapshot',
+                                    'SnapshotId',
+                                    ('InvalidSnapshot.NotFound',))
 
 
 class AWSBucketService(BaseBucketService):
@@ -330,6 +310,22 @@ class AWSBucketService(BaseBucketService):
         return None
 
     def find(self, **kwargs):
+        name = kwargs.get('name')
+        # S3 cannot filter bucket listings, but a bucket with an exact name
+        # can be looked up directly instead of listing all buckets
+        if (set(kwargs) == {'name'} and
+                isinstance(name, six.string_types) and
+                not any(c in name for c in '*?[')):
+            log.debug("Looking up AWS Bucket %s by name", name)
+            try:
+                self.provider.s3_conn.meta.client.head_bucket(Bucket=name)
+                matches = [AWSBucket(self.provider,
+                                     self.provider.s3_conn.Bucket(name))]
+            except ClientError:
+                # Missing, or owned by another account
+                matches = []
+            return ClientPagedResultList(self._provider, matches,
+                                         limit=None, marker=None)
         obj_list = self
         filters = ['name']
         matches = cb_helpers.generic_find(filters, kwargs, obj_list)
@@ -455,14 +451,45 @@ class AWSInstanceService(BaseInstanceService):
                                   cb_resource=AWSInstance,
                                   boto_collection_name='instances')
 
+    # Maximum number of instance ids accepted by TerminateInstances
+    MAX_TERMINATE_IDS = 1000
+
     def create(self, label, image, vm_type, subnet, zone,
                key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None, **kwargs):
+               launch_config=None, tags=None, **kwargs):
         log.debug("Creating AWS Instance Service with the params "
                   "[label: %s image: %s type: %s subnet: %s zone: %s "
                   "key pair: %s firewalls: %s user data: %s config %s "
-                  "others: %s]", label, image, vm_type, subnet, zone,
-                  key_pair, vm_firewalls, user_data, launch_config, kwargs)
+                  "tags: %s others: %s]", label, image, vm_type, subnet,
+                  zone, key_pair, vm_firewalls, user_data, launch_config,
+                  tags, kwargs)
+        inst = self._launch(1, label, image, vm_type, subnet, zone, key_pair,
+                            vm_firewalls, user_data, launch_config, tags)
+        if inst and len(inst) == 1:
+            return inst[0]
+        raise ValueError(
+            'Expected a single object response, got a list: %s' % inst)
+
+    def create_many(self, count, label, image, vm_type, subnet, zone=None,
+                    key_pair=None, vm_firewalls=None, user_data=None,
+                    launch_config=None, tags=None, **kwargs):
+        """
+        Launches all instances with a single RunInstances request. The
+        request either launches all ``count`` instances or fails, in which
+        case every result carries the error.
+        """
+        log.debug("Creating %s AWS instances labelled %s", count, label)
+        try:
+            insts = self._launch(count, label, image, vm_type, subnet, zone,
+                                 key_pair, vm_firewalls, user_data,
+                                 launch_config, tags)
+        except Exception as e:
+            log.debug("Could not launch %s instances: %s", count, e)
+            return [BulkResult(error=e) for _ in range(count)]
+        return [BulkResult(resource=inst) for inst in insts]
+
+    def _launch(self, count, label, image, vm_type, subnet, zone, key_pair,
+                vm_firewalls, user_data, launch_config, tags=None):
         AWSInstance.assert_valid_resource_label(label)
 
         image_id = image.id if isinstance(image, MachineImage) else image
@@ -483,27 +510,52 @@ class AWSInstanceService(BaseInstanceService):
             self._resolve_launch_options(subnet, zone_id, vm_firewalls)
 
         placement = {'AvailabilityZone': zone_id} if zone_id else None
-        inst = self.svc.create('create_instances',
+        # The instances are tagged by the RunInstances request itself, whose
+        # response includes the tags
+        return self.svc.create('create_instances',
                                ImageId=image_id,
-                               MinCount=1,
-                               MaxCount=1,
+                               MinCount=count,
+                               MaxCount=count,
                                KeyName=key_pair_name,
                                SecurityGroupIds=vm_firewall_ids or None,
                                UserData=str(user_data) or None,
                                InstanceType=vm_size,
                                Placement=placement,
                                BlockDeviceMappings=bdm,
-                               SubnetId=subnet_id
+                               SubnetId=subnet_id,
+                               TagSpecifications=tag_specifications(
+                                   'instance', tags, label=label)
                                )
-        if inst and len(inst) == 1:
-            # Wait until the resource exists
-            # pylint:disable=protected-access
-            inst[0]._wait_till_exists()
-            # Tag the instance w/ the name
-            inst[0].label = label
-            return inst[0]
-        raise ValueError(
-            'Expected a single object response, got a list: %s' % inst)
+
+    def delete_many(self, instance_ids):
+        """
+        Terminates the instances with a single TerminateInstances request
+        per 1000 instances. Should a request fail, for instance because one
+        of its instances does not exist, its instances are terminated one
+        by one instead.
+        """
+        client = self.provider.ec2_conn.meta.client
+
+        def terminate(inst_id):
+            try:
+                client.terminate_instances(InstanceIds=[inst_id])
+            except ClientError as e:
+                if (e.response['Error']['Code'] !=
+                        'InvalidInstanceID.NotFound'):
+                    raise
+
+        results = []
+        for start in range(0, len(instance_ids), self.MAX_TERMINATE_IDS):
+            batch = list(instance_ids[start:start + self.MAX_TERMINATE_IDS])
+            try:
+                client.terminate_instances(InstanceIds=batch)
+                results.extend(BulkResult(inst_id) for inst_id in batch)
+            except ClientError as e:
+                log.debug("Could not terminate instances together, "
+                          "terminating them one by one: %s", e)
+                results.extend(cb_helpers.bulk_apply(
+                    terminate, batch, self.provider.config.bulk_max_workers))
+        return results
 
     def _resolve_launch_options(self, subnet=None, zone_id=None,
                                 vm_firewalls=None):
@@ -594,14 +646,8 @@ class AWSInstanceService(BaseInstanceService):
         return self.svc.get(instance_id)
 
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'label'))
-
-        return self.svc.find(filter_name='tag:Name', filter_value=label)
+        log.debug("Searching for AWS Instance Service %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs)
 
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
@@ -635,6 +681,13 @@ class AWSVMTypeService(BaseVMTypeService):
         return [vm_type for vm_type in vm_types_list
                 if vm_type.get('pricing', {}).get(self.provider.region_name)]
 
+    def _vm_type_cost(self, vm_type):
+        try:
+            return float(vm_type.extra_data['pricing'][
+                self.provider.region_name]['linux']['ondemand'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
     def list(self, limit=None, marker=None):
         vm_types = [AWSVMType(self.provider, vm_type)
                     for vm_type in self.instance_data]
@@ -650,11 +703,16 @@ class AWSRegionService(BaseRegionService):
     def get(self, region_id):
         log.debug("Getting AWS Region Service with the id: %s",
                   region_id)
-        region = [r for r in self if r.id == region_id]
-        if region:
-            return region[0]
-        else:
+        try:
+            regions = self.provider.ec2_conn.meta.client.describe_regions(
+                RegionNames=[region_id]).get('Regions', [])
+        except ClientError as e:
+            # An unknown region is rejected as an invalid parameter
+            if e.response['Error']['Code'] != 'InvalidParameterValue':
+                raise
+            log.debug("Region %s was not found: %s", region_id, e)
             return None
+        return AWSRegion(self.provider, regions[0]) if regions else None
 
     def list(self, limit=None, marker=None):
         regions = [
@@ -707,27 +765,17 @@ class AWSNetworkService(BaseNetworkService):
         return self.svc.list(limit=limit, marker=marker)
 
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Network Service %s", label)
-        return self.svc.find(filter_name='tag:Name', filter_value=label)
+        log.debug("Searching for AWS Network Service %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs)
 
     def create(self, label, cidr_block):
         log.debug("Creating AWS Network Service with the params "
                   "[label: %s block: %s]", label, cidr_block)
         AWSNetwork.assert_valid_resource_label(label)
 
-        cb_net = self.svc.create('create_vpc', CidrBlock=cidr_block)
-        # Wait until ready to tag instance
-        cb_net.wait_till_ready()
-        if label:
-            cb_net.label = label
-        return cb_net
+        return self.svc.create(
+            'create_vpc', CidrBlock=cidr_block,
+            TagSpecifications=tag_specifications('vpc', None, label=label))
 
     def get_or_create_default(self):
         # # Look for provided default network
@@ -771,15 +819,8 @@ class AWSSubnetService(BaseSubnetService):
             return self.svc.list(limit=limit, marker=marker)
 
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Subnet Service %s", label)
-        return self.svc.find(filter_name='tag:Name', filter_value=label)
+        log.debug("Searching for AWS Subnet Service %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs)
 
     def create(self, label, network, cidr_block, zone):
         log.debug("Creating AWS Subnet Service with the params "
@@ -792,13 +833,10 @@ class AWSSubnetService(BaseSubnetService):
 
         network_id = network.id if isinstance(network, AWSNetwork) else network
 
-        subnet = self.svc.create('create_subnet',
-                                 VpcId=network_id,
-                                 CidrBlock=cidr_block,
-                                 AvailabilityZone=zone_name)
-        if label:
-            subnet.label = label
-        return subnet
+        return self.svc.create(
+            'create_subnet', VpcId=network_id, CidrBlock=cidr_block,
+            AvailabilityZone=zone_name,
+            TagSpecifications=tag_specifications('subnet', None, label=label))
 
     def get_or_create_default(self, zone):
         zone_name = zone.name if isinstance(zone, AWSPlacementZone) else zone
@@ -922,15 +960,8 @@ class AWSRouterService(BaseRouterService):
         return self.svc.get(router_id)
 
     def find(self, **kwargs):
-        label = kwargs.pop('label', None)
-
-        # All kwargs should have been popped at this time.
-        if len(kwargs) > 0:
-            raise TypeError("Unrecognised parameters for search: %s."
-                            " Supported attributes: %s" % (kwargs, 'label'))
-
-        log.debug("Searching for AWS Router Service %s", label)
-        return self.svc.find(filter_name='tag:Name', filter_value=label)
+        log.debug("Searching for AWS Router Service %s", kwargs)
+        return self.svc.find_by({'label': 'tag:Name'}, kwargs)
 
     def list(self, limit=None, marker=None):
         return self.svc.list(limit=limit, marker=marker)
@@ -942,7 +973,7 @@ class AWSRouterService(BaseRouterService):
 
         network_id = network.id if isinstance(network, AWSNetwork) else network
 
-        cb_router = self.svc.create('create_route_table', VpcId=network_id)
-        if label:
-            cb_router.label = label
-        return cb_router
+        return self.svc.create(
+            'create_route_table', VpcId=network_id,
+            TagSpecifications=tag_specifications('route-table', None,
+                                                 label=label))
@@ -1,5 +1,6 @@
 import datetime
 import logging
+import threading
 from io import BytesIO
 
 from azure.common import AzureConflictHttpError
@@ -8,6 +9,7 @@ from azure.cosmosdb.table.tableservice import TableService
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.devtestlabs.models import GalleryImageReference
 from azure.mgmt.network import NetworkManagementClient
+from azure.mgmt.network.models import SecurityRule
 from azure.mgmt.resource import ResourceManagementClient
 from azure.mgmt.resource.subscriptions import SubscriptionClient
 from azure.mgmt.storage import StorageManagementClient
@@ -24,6 +26,7 @@ from cloudbridge.cloud.interfaces.exceptions import \
     ProviderConnectionException, WaitStateException
 
 from . import helpers as azure_helpers
+from .operations import AzureOperation
 
 log = logging.getLogger(__name__)
 
@@ -176,30 +179,47 @@ class AzureClient(object):
         self._block_blob_service = None
         self._table_service = None
         self._storage_account = None
+        # Guards the lazy initialisation of the clients below
+        self._lock = threading.RLock()
 
         log.debug("azure subscription : %s", self.subscription_id)
 
+    def _lazy(self, attr, factory):
+        """
+        Returns the value of ``attr``, calling ``factory`` under a lock to
+        initialise it on first use.
+        """
+        value = getattr(self, attr)
+        if not value:
+            with self._lock:
+                value = getattr(self, attr)
+                if not value:
+                    value = factory()
+                    setattr(self, attr, value)
+        return value
+
     @property
-    @tenacity.retry(stop=tenacity.stop_after_attempt(5), reraise=True)
     def access_key_result(self):
-        if not self._access_key_result:
-            storage_account = self.storage_account
-
-            if self.get_storage_account(storage_account).\
-                    provisioning_state.value != 'Succeeded':
-                log.debug(
-                    "Storage account %s is not in Succeeded state yet. ",
-                    storage_account)
-                raise WaitStateException(
-                    "Waited too long for storage account: {0} to "
-                    "become ready.".format(
-                        storage_account,
-                        self.get_storage_account(storage_account).
-                        provisioning_state))
-
-            self._access_key_result = self.storage_client.storage_accounts. \
-                list_keys(self.resource_group, storage_account)
-        return self._access_key_result
+        return self._lazy('_access_key_result', self._list_access_keys)
+
+    @tenacity.retry(stop=tenacity.stop_after_attempt(5), reraise=True)
+    def _list_access_keys(self):
+        storage_account = self.storage_account
+
+        if self.get_storage_account(storage_account).\
+                provisioning_state.value != 'Succeeded':
+            log.debug(
+                "Storage account %s is not in Succeeded state yet. ",
+                storage_account)
+            raise WaitStateException(
+                "Waited too long for storage account: {0} to "
+                "become ready.".format(
+                    storage_account,
+                    self.get_storage_account(storage_account).
+                    provisioning_state))
+
+        return self.storage_client.storage_accounts. \
+            list_keys(self.resource_group, storage_account)
 
     @property
     def resource_group(self):
@@ -219,68 +239,64 @@ class AzureClient(object):
 
     @property
     def storage_client(self):
-        if not self._storage_client:
-            self._storage_client = \
-                StorageManagementClient(self._credentials,
-                                        self.subscription_id)
-        return self._storage_client
+        return self._lazy('_storage_client', lambda: StorageManagementClient(
+            self._credentials, self.subscription_id))
 
     @property
     def subscription_client(self):
-        if not self._subscription_client:
-            self._subscription_client = SubscriptionClient(self._credentials)
-        return self._subscription_client
+        return self._lazy('_subscription_client',
+                          lambda: SubscriptionClient(self._credentials))
 
     @property
     def resource_client(self):
-        if not self._resource_client:
-            self._resource_client = \
-                ResourceManagementClient(self._credentials,
-                                         self.subscription_id)
-        return self._resource_client
+        return self._lazy('_resource_client', lambda: ResourceManagementClient(
+            self._credentials, self.subscription_id))
 
     @property
     def compute_client(self):
-        if not self._compute_client:
-            self._compute_client = \
-                ComputeManagementClient(self._credentials,
-                                        self.subscription_id)
-        return self._compute_client
+        return self._lazy('_compute_client', lambda: ComputeManagementClient(
+            self._credentials, self.subscription_id))
 
     @property
     def network_management_client(self):
-        if not self._network_management_client:
-            self._network_management_client = NetworkManagementClient(
-                self._credentials, self.subscription_id)
-        return self._network_management_client
+        return self._lazy(
+            '_network_management_client', lambda: NetworkManagementClient(
+                self._credentials, self.subscription_id))
 
     @property
     def blob_service(self):
-        self._get_or_create_storage_account()
-        if not self._block_blob_service:
-            if self._access_token:
-                token_credential = TokenCredential(self._access_token)
-                self._block_blob_service = BlockBlobService(
-                    account_name=self.storage_account,
-                    token_credential=token_credential)
-            else:
-                self._block_blob_service = BlockBlobService(
-                    account_name=self.storage_account,
-                    account_key=self.access_key_result.keys[0].value)
-        return self._block_blob_service
+        self._lazy('_storage_account', self._get_or_create_storage_account)
+        return self._lazy('_block_blob_service', self._connect_blob_service)
+
+    def _connect_blob_service(self):
+        if self._access_token:
+            token_credential = TokenCredential(self._access_token)
+            return BlockBlobService(account_name=self.storage_account,
+                                    token_credential=token_credential)
+        return BlockBlobService(
+            account_name=self.storage_account,
+            account_key=self.access_key_result.keys[0].value)
 
     @property
     def table_service(self):
-        self._get_or_create_storage_account()
-        if not self._table_service:
-            self._table_service = TableService(
-                self.storage_account,
-                self.access_key_result.keys[0].value)
-        if not self._table_service. \
+        self._lazy('_storage_account', self._get_or_create_storage_account)
+        table_service = self._lazy('_table_service', lambda: TableService(
+            self.storage_account, self.access_key_result.keys[0].value))
+        if not table_service. \
                 exists(table_name=self.public_key_storage_table_name):
-            self._table_service.create_table(
-                self.public_key_storage_table_name)
-        return self._table_service
+            table_service.create_table(self.public_key_storage_table_name)
+        return table_service
+
+    @staticmethod
+    def _complete(poller, wait, resource_id, description):
+        """
+        Waits for a long-running operation and returns its result or, if
+        ``wait`` is False, returns an :class:`.AzureOperation` handle on it
+        without waiting.
+        """
+        if wait:
+            return poller.result()
+        return AzureOperation(poller, resource_id, description)
 
     def get_resource_group(self, name):
         return self.resource_client.resource_groups.get(name)
@@ -369,14 +385,15 @@ class AzureClient(object):
             create_or_update(self.resource_group, name,
                              parameters).result()
 
-    def update_vm_firewall_tags(self, fw_id, tags):
+    def update_vm_firewall_tags(self, fw_id, tags, wait=True):
         url_params = azure_helpers.parse_url(VM_FIREWALL_RESOURCE_ID,
                                              fw_id)
         name = url_params.get(VM_FIREWALL_NAME)
-        return self.network_management_client.network_security_groups. \
+        poller = self.network_management_client.network_security_groups. \
             create_or_update(self.resource_group, name,
                              {'tags': tags,
-                              'location': self.region_name}).result()
+                              'location': self.region_name})
+        return self._complete(poller, wait, fw_id, 'update tags')
 
     def get_vm_firewall(self, fw_id):
         url_params = azure_helpers.parse_url(VM_FIREWALL_RESOURCE_ID,
@@ -385,12 +402,13 @@ class AzureClient(object):
         return self.network_management_client.network_security_groups. \
             get(self.resource_group, fw_name)
 
-    def delete_vm_firewall(self, fw_id):
+    def delete_vm_firewall(self, fw_id, wait=True):
         url_params = azure_helpers.parse_url(VM_FIREWALL_RESOURCE_ID,
                                              fw_id)
         name = url_params.get(VM_FIREWALL_NAME)
-        self.network_management_client \
-            .network_security_groups.delete(self.resource_group, name).wait()
+        poller = self.network_management_client \
+            .network_security_groups.delete(self.resource_group, name)
+        return self._complete(poller, wait, fw_id, 'delete')
 
     def create_vm_firewall_rule(self, fw_id,
                                 rule_name, parameters):
@@ -401,12 +419,53 @@ class AzureClient(object):
             create_or_update(self.resource_group, vm_firewall_name,
                              rule_name, parameters).result()
 
-    def delete_vm_firewall_rule(self, fw_rule_id, vm_firewall):
+    def add_vm_firewall_rules(self, vm_firewall, rules):
+        """
+        Adds several rules to a VM firewall with a single update of its
+        network security group, so that they are provisioned by one
+        long-running operation rather than one operation per rule.
+
+        The update is conditional on the etag of ``vm_firewall``. If the
+        group was modified since ``vm_firewall`` was fetched, the update
+        fails with a ``412`` :class:`CloudError`, rather than overwriting
+        those changes, and ``vm_firewall`` is left unchanged.
+
+        :type vm_firewall: :class:`NetworkSecurityGroup`
+        :param vm_firewall: The network security group to add the rules to,
+                            as recently fetched. It is updated in place.
+
+        :type rules: ``list`` of ``tuple``
+        :param rules: The ``(name, parameters)`` of each rule, where
+                      ``parameters`` are the rule's properties.
+
+        :return: The created rules, in the order they were given.
+        """
+        security_rules = vm_firewall.security_rules
+        vm_firewall.security_rules = (
+            list(security_rules or []) +
+            [SecurityRule(name=name, **parameters)
+             for name, parameters in rules])
+        try:
+            result = self.network_management_client.network_security_groups. \
+                create_or_update(self.resource_group, vm_firewall.name,
+                                 vm_firewall,
+                                 custom_headers={'If-Match': vm_firewall.etag}
+                                 ).result()
+        except Exception:
+            vm_firewall.security_rules = security_rules
+            raise
+        vm_firewall.security_rules = result.security_rules
+        vm_firewall.etag = result.etag
+        created = {rule.name: rule for rule in result.security_rules}
+        return [created[name] for name, _ in rules]
+
+    def delete_vm_firewall_rule(self, fw_rule_id, vm_firewall, wait=True):
         url_params = azure_helpers.parse_url(VM_FIREWALL_RULE_RESOURCE_ID,
                                              fw_rule_id)
         name = url_params.get(VM_FIREWALL_RULE_NAME)
-        return self.network_management_client.security_rules. \
-            delete(self.resource_group, vm_firewall, name).result()
+        poller = self.network_management_client.security_rules. \
+            delete(self.resource_group, vm_firewall, name)
+        return self._complete(poller, wait, fw_rule_id, 'delete')
 
     def list_containers(self, prefix=None, limit=None, marker=None):
         results = self.blob_service.list_containers(prefix=prefix,
@@ -445,9 +504,17 @@ class AzureClient(object):
         self.blob_service.create_blob_from_text(container_name,
                                                 blob_name, text)
 
-    def create_blob_from_file(self, container_name, blob_name, file_path):
-        self.blob_service.create_blob_from_path(container_name,
-                                                blob_name, file_path)
+    def create_blob_from_file(self, container_name, blob_name, file_path,
+                              max_connections=2):
+        self.blob_service.create_blob_from_path(
+            container_name, blob_name, file_path,
+            max_connections=max_connections)
+
+    def get_blob_to_file(self, container_name, blob_name, file_path,
+                         max_connections=2):
+        self.blob_service.get_blob_to_path(
+            container_name, blob_name, file_path,
+            max_connections=max_connections)
 
     def delete_blob(self, container_name, blob_name):
         self.blob_service.delete_blob(container_name, blob_name)
@@ -461,11 +528,12 @@ class AzureClient(object):
         return self.blob_service.make_blob_url(container_name, blob_name,
                                                sas_token=sas)
 
-    def get_blob_content(self, container_name, blob_name):
+    def get_blob_range(self, container_name, blob_name, start, end):
         out_stream = BytesIO()
-        self.blob_service.get_blob_to_stream(container_name,
-                                             blob_name, out_stream)
-        return out_stream
+        self.blob_service.get_blob_to_stream(container_name, blob_name,
+                                             out_stream, start_range=start,
+                                             end_range=end)
+        return out_stream.getvalue()
 
     def create_empty_disk(self, disk_name, params):
         return self.compute_client.disks.create_or_update(
@@ -491,11 +559,13 @@ class AzureClient(object):
         return self.compute_client.disks. \
             list_by_resource_group(self.resource_group)
 
-    def delete_disk(self, disk_id):
+    def delete_disk(self, disk_id, wait=True):
         url_params = azure_helpers.parse_url(VOLUME_RESOURCE_ID,
                                              disk_id)
         disk_name = url_params.get(VOLUME_NAME)
-        self.compute_client.disks.delete(self.resource_group, disk_name).wait()
+        poller = self.compute_client.disks.delete(self.resource_group,
+                                                  disk_name)
+        return self._complete(poller, wait, disk_id, 'delete')
 
     def update_disk_tags(self, disk_id, tags):
         url_params = azure_helpers.parse_url(VOLUME_RESOURCE_ID,
@@ -526,12 +596,13 @@ class AzureClient(object):
             params
         ).result()
 
-    def delete_snapshot(self, snapshot_id):
+    def delete_snapshot(self, snapshot_id, wait=True):
         url_params = azure_helpers.parse_url(SNAPSHOT_RESOURCE_ID,
                                              snapshot_id)
         snapshot_name = url_params.get(SNAPSHOT_NAME)
-        self.compute_client.snapshots.delete(self.resource_group,
-                                             snapshot_name).wait()
+        poller = self.compute_client.snapshots.delete(self.resource_group,
+                                                      snapshot_name)
+        return self._complete(poller, wait, snapshot_id, 'delete')
 
     def update_snapshot_tags(self, snapshot_id, tags):
         url_params = azure_helpers.parse_url(SNAPSHOT_RESOURCE_ID,
@@ -617,18 +688,20 @@ class AzureClient(object):
                              name,
                              parameters=params).result()
 
-    def delete_network(self, network_id):
+    def delete_network(self, network_id, wait=True):
         url_params = azure_helpers.parse_url(NETWORK_RESOURCE_ID, network_id)
         network_name = url_params.get(NETWORK_NAME)
-        return self.network_management_client.virtual_networks. \
-            delete(self.resource_group, network_name).wait()
+        poller = self.network_management_client.virtual_networks. \
+            delete(self.resource_group, network_name)
+        return self._complete(poller, wait, network_id, 'delete')
 
-    def update_network_tags(self, network_id, tags):
+    def update_network_tags(self, network_id, tags, wait=True):
         url_params = azure_helpers.parse_url(NETWORK_RESOURCE_ID, network_id)
         network_name = url_params.get(NETWORK_NAME)
-        return self.network_management_client.virtual_networks. \
+        poller = self.network_management_client.virtual_networks. \
             create_or_update(self.resource_group,
-                             network_name, tags).result()
+                             network_name, tags)
+        return self._complete(poller, wait, network_id, 'update tags')
 
     def get_network_id_for_subnet(self, subnet_id):
         url_params = azure_helpers.parse_url(SUBNET_RESOURCE_ID, subnet_id)
@@ -707,21 +780,23 @@ class AzureClient(object):
         return self.network_management_client. \
             public_ip_addresses.get(self.resource_group, public_ip_name)
 
-    def delete_floating_ip(self, public_ip_id):
+    def delete_floating_ip(self, public_ip_id, wait=True):
         url_params = azure_helpers.parse_url(PUBLIC_IP_RESOURCE_ID,
                                              public_ip_id)
         public_ip_name = url_params.get(PUBLIC_IP_NAME)
-        self.network_management_client. \
+        poller = self.network_management_client. \
             public_ip_addresses.delete(self.resource_group,
-                                       public_ip_name).wait()
+                                       public_ip_name)
+        return self._complete(poller, wait, public_ip_id, 'delete')
 
-    def update_fip_tags(self, fip_id, tags):
+    def update_fip_tags(self, fip_id, tags, wait=True):
         url_params = azure_helpers.parse_url(PUBLIC_IP_RESOURCE_ID,
                                              fip_id)
         fip_name = url_params.get(PUBLIC_IP_NAME)
-        self.network_management_client.public_ip_addresses. \
+        poller = self.network_management_client.public_ip_addresses. \
             create_or_update(self.resource_group,
-                             fip_name, tags).result()
+                             fip_name, tags)
+        return self._complete(poller, wait, fip_id, 'update tags')
 
     def list_floating_ips(self):
         return self.network_management_client.public_ip_addresses.list(
@@ -732,19 +807,21 @@ class AzureClient(object):
             self.resource_group
         )
 
-    def restart_vm(self, vm_id):
+    def restart_vm(self, vm_id, wait=True):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
                                              vm_id)
         vm_name = url_params.get(VM_NAME)
-        return self.compute_client.virtual_machines.restart(
-            self.resource_group, vm_name).wait()
+        poller = self.compute_client.virtual_machines.restart(
+            self.resource_group, vm_name)
+        return self._complete(poller, wait, vm_id, 'restart')
 
-    def delete_vm(self, vm_id):
+    def delete_vm(self, vm_id, wait=True):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
                                              vm_id)
         vm_name = url_params.get(VM_NAME)
-        return self.compute_client.virtual_machines.delete(
-            self.resource_group, vm_name).wait()
+        poller = self.compute_client.virtual_machines.delete(
+            self.resource_group, vm_name)
+        return self._complete(poller, wait, vm_id, 'delete')
 
     def get_vm(self, vm_id):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
@@ -769,13 +846,14 @@ class AzureClient(object):
             create_or_update(self.resource_group,
                              vm_name, params, raw=True)
 
-    def deallocate_vm(self, vm_id):
+    def deallocate_vm(self, vm_id, wait=True):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
                                              vm_id)
         vm_name = url_params.get(VM_NAME)
-        self.compute_client. \
+        poller = self.compute_client. \
             virtual_machines.deallocate(self.resource_group,
-                                        vm_name).wait()
+                                        vm_name)
+        return self._complete(poller, wait, vm_id, 'deallocate')
 
     def generalize_vm(self, vm_id):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
@@ -784,29 +862,32 @@ class AzureClient(object):
         self.compute_client.virtual_machines. \
             generalize(self.resource_group, vm_name)
 
-    def start_vm(self, vm_id):
+    def start_vm(self, vm_id, wait=True):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
                                              vm_id)
         vm_name = url_params.get(VM_NAME)
-        self.compute_client.virtual_machines. \
+        poller = self.compute_client.virtual_machines. \
             start(self.resource_group,
-                  vm_name).wait()
+                  vm_name)
+        return self._complete(poller, wait, vm_id, 'start')
 
-    def update_vm_tags(self, vm_id, tags):
+    def update_vm_tags(self, vm_id, tags, wait=True):
         url_params = azure_helpers.parse_url(VM_RESOURCE_ID,
                                              vm_id)
         vm_name = url_params.get(VM_NAME)
-        self.compute_client.virtual_machines. \
+        poller = self.compute_client.virtual_machines. \
             create_or_update(self.resource_group,
-                             vm_name, tags).result()
+                             vm_name, tags)
+        return self._complete(poller, wait, vm_id, 'update tags')
 
-    def delete_nic(self, nic_id):
+    def delete_nic(self, nic_id, wait=True):
         nic_params = azure_helpers.\
             parse_url(NETWORK_INTERFACE_RESOURCE_ID, nic_id)
         nic_name = nic_params.get(NETWORK_INTERFACE_NAME)
-        self.network_management_client. \
+        poller = self.network_management_client. \
             network_interfaces.delete(self.resource_group,
-                                      nic_name).wait()
+                                      nic_name)
+        return self._complete(poller, wait, nic_id, 'delete')
 
     def get_nic(self, nic_id):
         nic_params = azure_helpers.\
@@ -859,10 +940,10 @@ class AzureClient(object):
                            marker=marker, num_results=limit)
         return (entities.items, entities.next_marker)
 
-    def delete_route_table(self, route_table_name):
-        self.network_management_client. \
-            route_tables.delete(self.resource_group, route_table_name
-                                ).wait()
+    def delete_route_table(self, route_table_name, wait=True):
+        poller = self.network_management_client. \
+            route_tables.delete(self.resource_group, route_table_name)
+        return self._complete(poller, wait, route_table_name, 'delete')
 
     def attach_subnet_to_route_table(self, subnet_id, route_table_id):
         url_params = azure_helpers.parse_url(SUBNET_RESOURCE_ID,
@@ -932,7 +1013,8 @@ class AzureClient(object):
              self.resource_group,
              route_table_name, params).result()
 
-    def update_route_table_tags(self, route_table_name, tags):
-        self.network_management_client.route_tables. \
+    def update_route_table_tags(self, route_table_name, tags, wait=True):
+        poller = self.network_management_client.route_tables. \
             create_or_update(self.resource_group,
-                             route_table_name, tags).result()
+                             route_table_name, tags)
+        return self._complete(poller, wait, route_table_name, 'update tags')
@@ -1,3 +1,11 @@
+import threading
+try:
+    from collections.abc import Mapping
+except ImportError:  # python 2
+    from collections import Mapping
+
+import cachetools
+
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 
 
@@ -20,6 +28,133 @@ from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
 #         return list_items
 
 
+# Number of parsed resource IDs remembered by parse_url()
+PARSED_ID_CACHE_SIZE = 4096
+
+_compiled_templates = {}
+_parsed_ids = cachetools.LRUCache(PARSED_ID_CACHE_SIZE)
+_parsed_ids_lock = threading.Lock()
+
+
+def _split(url):
+    parts = url.split('/')
+    if len(parts) == 1:
+        parts = url.split(':')
+    return parts
+
+
+class ResourceId(Mapping):
+    """
+    The parameters parsed from an Azure resource ID, as an immutable
+    mapping of parameter names to values. Parameters are also available as
+    attributes.
+    """
+
+    __slots__ = ('_id', '_template', '_params')
+
+    def __init__(self, resource_id, template, params):
+        object.__setattr__(self, '_id', resource_id)
+        object.__setattr__(self, '_template', template)
+        object.__setattr__(self, '_params', params)
+
+    @property
+    def id(self):
+        """
+        The parsed resource ID.
+        """
+        return self._id
+
+    @property
+    def template(self):
+        """
+        The template which the resource ID matched.
+        """
+        return self._template
+
+    def __getitem__(self, key):
+        return self._params[key]
+
+    def __iter__(self):
+        return iter(self._params)
+
+    def __len__(self):
+        return len(self._params)
+
+    def __getattr__(self, name):
+        # Only called for names which are not slots or properties
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._params[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ResourceId objects are immutable")
+
+    def __hash__(self):
+        return hash(frozenset(self._params.items()))
+
+    def __repr__(self):
+        return "ResourceId(%r, %r)" % (self._id, self._params)
+
+
+class _CompiledTemplates(object):
+    """
+    A list of resource ID templates, split once and indexed by their number
+    of segments. Each template is stored with the positions and (lower
+    case) values of its literal segments, and the positions and names of its
+    parameters.
+    """
+
+    def __init__(self, template_urls):
+        self.template_urls = template_urls
+        self.by_length = {}
+        for template in template_urls:
+            parts = _split(template)
+            literals = []
+            params = []
+            for index, part in enumerate(parts):
+                if part.startswith('{') and part.endswith('}'):
+                    params.append((index, part[1:-1]))
+                else:
+                    literals.append((index, part.lower()))
+            self.by_length.setdefault(len(parts), []).append(
+                (template, tuple(literals), tuple(params)))
+
+    def parse(self, original_url):
+        parts = _split(original_url)
+        candidates = self.by_length.get(len(parts))
+        if not candidates:
+            raise InvalidValueException(self.template_urls, original_url)
+        # Azure does not always preserve the case of the literal segments
+        # (e.g. resourcegroups), so they are compared case-insensitively. If
+        # none of the templates' literals match, the first template with the
+        # same number of segments is used, as parse_url always has.
+        template, _, params = candidates[0]
+        if len(candidates) > 1:
+            for candidate in candidates:
+                if all(parts[index].lower() == literal
+                       for index, literal in candidate[1]):
+                    template, _, params = candidate
+                    break
+        return ResourceId(original_url, template,
+                          dict((name, parts[index]) for index, name in params))
+
+
+def compile_templates(template_urls):
+    """
+    Returns the given resource ID templates, compiled for parsing. Compiled
+    templates are kept for the lifetime of the process.
+    """
+    key = tuple(template_urls)
+    compiled = _compiled_templates.get(key)
+    if compiled is None:
+        compiled = _compiled_templates.setdefault(
+            key, _CompiledTemplates(key))
+    return compiled
+
+
 def parse_url(template_urls, original_url):
     """
     In Azure all the resource IDs are returned as URIs.
@@ -27,30 +162,26 @@ def parse_url(template_urls, original_url):
        '{resourceGroupName}/providers/Microsoft.Compute/' \
        'virtualMachines/{vmName}'
     This function splits the resource ID based on the template urls passed
-    and returning the dictionary.
+    and returns the parameters as an immutable :class:`ResourceId` mapping.
 
     The only exception to that format are image URN's which are used for
     public gallery references:
     https://docs.microsoft.com/en-us/azure/virtual-machines/linux/cli-ps-findimage
+
+    Templates are split once and looked up by the number of segments of the
+    resource ID, and the most recently parsed IDs are cached.
     """
     if not original_url:
         raise InvalidValueException(template_urls, original_url)
-    original_url_parts = original_url.split('/')
-    if len(original_url_parts) == 1:
-        original_url_parts = original_url.split(':')
-    for each_template in template_urls:
-        template_url_parts = each_template.split('/')
-        if len(template_url_parts) == 1:
-            template_url_parts = each_template.split(':')
-        if len(template_url_parts) == len(original_url_parts):
-            break
-    if len(template_url_parts) != len(original_url_parts):
-        raise InvalidValueException(template_urls, original_url)
-    resource_param = {}
-    for key, value in zip(template_url_parts, original_url_parts):
-        if key.startswith('{') and key.endswith('}'):
-            resource_param.update({key[1:-1]: value})
-    return resource_param
+    compiled = compile_templates(template_urls)
+    key = (compiled.template_urls, original_url)
+    with _parsed_ids_lock:
+        parsed = _parsed_ids.get(key)
+    if parsed is None:
+        parsed = compiled.parse(original_url)
+        with _parsed_ids_lock:
+            _parsed_ids[key] = parsed
+    return parsed
 
 
 def generate_urn(gallery_image):
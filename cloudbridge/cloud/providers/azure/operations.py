@@ -0,0 +1,217 @@
+"""
+Handles on long-running Azure operations.
+
+Deleting or updating most Azure resources starts a long-running operation,
+which the SDK polls in a background thread. The ``AzureClient`` methods
+starting such operations wait for them by default. With ``wait=False``, they
+return an :class:`AzureOperation` instead, so that several operations can
+proceed at once and be waited for together with :func:`wait_all`. So do the
+methods of Azure resources which delete or change them, such as
+``AzureVolume.delete(wait=False)``.
+"""
+import logging
+import threading
+import time
+
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
+from cloudbridge.cloud.interfaces.resources import BulkResult
+
+log = logging.getLogger(__name__)
+
+
+class AzureOperation(object):
+    """
+    A long-running Azure operation, wrapping the poller returned by the SDK.
+
+    :type poller: :class:`msrest.polling.LROPoller`
+    :param poller: The SDK poller of the operation.
+
+    :type resource_id: ``str``
+    :param resource_id: The id of the resource the operation applies to.
+
+    :type description: ``str``
+    :param description: What the operation does, e.g. ``delete``.
+    """
+
+    def __init__(self, poller, resource_id=None, description=None):
+        self._poller = poller
+        self.resource_id = resource_id
+        self.description = description
+
+    def done(self):
+        """
+        Returns whether the operation has completed, successfully or not.
+
+        :rtype: ``bool``
+        """
+        return self._poller.done()
+
+    def wait(self, timeout=None):
+        """
+        Waits for the operation to complete.
+
+        :type timeout: ``float``
+        :param timeout: The maximum number of seconds to wait. Waits
+                        indefinitely if ``None``.
+
+        :rtype: ``bool``
+        :return: Whether the operation has completed.
+
+        :raises CloudError: If the operation failed.
+        """
+        self._poller.wait(timeout)
+        return self.done()
+
+    def result(self, timeout=None):
+        """
+        Waits for the operation to complete and returns its result.
+
+        :type timeout: ``float``
+        :param timeout: The maximum number of seconds to wait. Waits
+                        indefinitely if ``None``.
+
+        :return: The resource returned by the operation, if any.
+
+        :raises WaitStateException: If the operation did not complete
+                                    within ``timeout``.
+        :raises CloudError: If the operation failed.
+        """
+        if not self.wait(timeout):
+            raise WaitStateException(
+                "Operation {0} did not complete within {1} seconds".format(
+                    self, timeout))
+        return self._poller.result()
+
+    def __repr__(self):
+        return "<AzureOperation: {0} {1}>".format(self.description,
+                                                  self.resource_id)
+
+
+class _BackgroundPoller(object):
+    """
+    Runs a function, typically a sequence of long-running operations, on a
+    background thread, with the interface of an SDK poller.
+    """
+
+    def __init__(self, func):
+        self._func = func
+        self._result = None
+        self._error = None
+        self._done = threading.Event()
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def _run(self):
+        try:
+            self._result = self._func()
+        except Exception as e:
+            self._error = e
+        finally:
+            self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        if self._error:
+            raise self._error
+
+    def result(self, timeout=None):
+        self.wait(timeout)
+        return self._result
+
+
+def run_in_background(func, resource_id=None, description=None):
+    """
+    Runs a function which waits for one or more long-running operations
+    on a background thread, and returns an :class:`AzureOperation` handle
+    on it. This is used when operations must follow each other, such as
+    deleting a VM before its network interfaces.
+
+    :type func: ``callable``
+    :param func: A function without arguments.
+
+    :type resource_id: ``str``
+    :param resource_id: The id of the resource the operation applies to.
+
+    :type description: ``str``
+    :param description: What the operation does, e.g. ``delete``.
+
+    :rtype: :class:`AzureOperation`
+    :return: A handle on the running function.
+    """
+    return AzureOperation(_BackgroundPoller(func), resource_id, description)
+
+
+def wait_all(operations, timeout=None):
+    """
+    Waits for several operations, which proceed concurrently, to complete.
+
+    Example:
+
+    .. code-block:: python
+
+        client = provider.azure_client
+        results = wait_all([client.delete_disk(disk_id, wait=False)
+                            for disk_id in disk_ids])
+
+    :type operations: ``list`` of :class:`AzureOperation`
+    :param operations: The operations to wait for.
+
+    :type timeout: ``float``
+    :param timeout: The maximum number of seconds to wait for all of the
+                    operations. Waits indefinitely if ``None``.
+
+    :rtype: ``list`` of :class:`.BulkResult`
+    :return: The outcome of each operation, in the order given, identified
+             by the id of its resource. An operation which failed, or did
+             not complete in time, has an ``error``.
+    """
+    deadline = None if timeout is None else time.time() + timeout
+    results = []
+    for operation in operations:
+        remaining = (None if deadline is None
+                     else max(0, deadline - time.time()))
+        try:
+            results.append(BulkResult(id=operation.resource_id,
+                                      resource=operation.result(remaining)))
+        except Exception as e:
+            log.debug("Operation %s failed: %s", operation, e)
+            results.append(BulkResult(id=operation.resource_id, error=e))
+    return results
+
+
+def run_all(start, resource_ids, timeout=None):
+    """
+    Starts an operation on each resource without waiting, then waits for
+    all of them to complete, so that they proceed concurrently.
+
+    :type start: ``callable``
+    :param start: A function taking a resource id and ``wait=False``, and
+                  returning an :class:`AzureOperation`, such as
+                  ``AzureClient.delete_disk``.
+
+    :type resource_ids: ``list`` of ``str``
+    :param resource_ids: The ids of the resources.
+
+    :type timeout: ``float``
+    :param timeout: The maximum number of seconds to wait for all of the
+                    operations. Waits indefinitely if ``None``.
+
+    :rtype: ``list`` of :class:`.BulkResult`
+    :return: The outcome of the operation on each resource, in the order
+             given.
+    """
+    results = []
+    operations = []
+    for resource_id in resource_ids:
+        try:
+            operations.append(start(resource_id, wait=False))
+            results.append(None)
+        except Exception as e:
+            log.debug("Could not start operation on %s: %s", resource_id, e)
+            results.append(BulkResult(id=resource_id, error=e))
+    completed = iter(wait_all(operations, timeout))
+    return [result or next(completed) for result in results]
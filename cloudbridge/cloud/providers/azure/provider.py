@@ -9,6 +9,7 @@ import tenacity
 
 import cloudbridge
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.client_pool import credentials_digest
 from cloudbridge.cloud.base.helpers import get_env
 from cloudbridge.cloud.interfaces.exceptions import ProviderConnectionException
 from cloudbridge.cloud.providers.azure.azure_client import AzureClient
@@ -21,6 +22,7 @@ log = logging.getLogger(__name__)
 
 class AzureCloudProvider(BaseCloudProvider):
     PROVIDER_ID = 'azure'
+    REGION_CONFIG_KEY = 'azure_region_name'
 
     def __init__(self, config):
         super(AzureCloudProvider, self).__init__(config)
@@ -64,8 +66,8 @@ class AzureCloudProvider(BaseCloudProvider):
         self.public_key_storage_table_name = self._get_config_value(
             'azure_public_key_storage_table_name', get_env(
                 'AZURE_PUBLIC_KEY_STORAGE_TABLE_NAME', 'cbcerts'))
-
-        self._azure_client = None
+        self._client_key = ('azure', 'client',
+                            credentials_digest(self._azure_client_config))
 
         self._security = AzureSecurityService(self)
         self._storage = AzureStorageService(self)
@@ -107,46 +109,57 @@ class AzureCloudProvider(BaseCloudProvider):
 
     @property
     def azure_client(self):
-        if not self._azure_client:
-
-            # create a dict with both optional and mandatory configuration
-            # values to pass to the azureclient class, rather
-            # than passing the provider object and taking a dependency.
-
-            provider_config = {
-                'azure_subscription_id': self.subscription_id,
-                'azure_client_id': self.client_id,
-                'azure_secret': self.secret,
-                'azure_tenant': self.tenant,
-                'azure_region_name': self.region_name,
-                'azure_resource_group': self.resource_group,
-                'azure_storage_account': self.storage_account,
-                'azure_public_key_storage_table_name':
-                    self.public_key_storage_table_name,
-                'azure_access_token': self.access_token
-            }
-
-            self._azure_client = AzureClient(provider_config)
-            self._initialize()
-        return self._azure_client
+        """
+        Get the Azure client from the provider's client pool, so that it
+        is shared with providers using the same credentials and
+        configuration. Its management clients and storage services are
+        thread-safe, so a single client is shared between threads.
+        """
+        return self._get_connection(
+            'azure_client',
+            lambda: self.client_pool.get(self._client_key,
+                                         self._connect_azure))
+
+    @property
+    def _azure_client_config(self):
+        # create a dict with both optional and mandatory configuration
+        # values to pass to the azureclient class, rather
+        # than passing the provider object and taking a dependency.
+        return {
+            'azure_subscription_id': self.subscription_id,
+            'azure_client_id': self.client_id,
+            'azure_secret': self.secret,
+            'azure_tenant': self.tenant,
+            'azure_region_name': self.region_name,
+            'azure_resource_group': self.resource_group,
+            'azure_storage_account': self.storage_account,
+            'azure_public_key_storage_table_name':
+                self.public_key_storage_table_name,
+            'azure_access_token': self.access_token
+        }
+
+    def _connect_azure(self):
+        azure_client = AzureClient(self._azure_client_config)
+        self._initialize(azure_client)
+        return azure_client
 
     @tenacity.retry(stop=tenacity.stop_after_attempt(2),
                     retry=tenacity.retry_if_exception_type(CloudError),
                     reraise=True)
-    def _initialize(self):
+    def _initialize(self, azure_client):
         """
         Verifying that resource group and storage account exists
         if not create one with the name provided in the
         configuration
         """
         try:
-            self._azure_client.get_resource_group(self.resource_group)
+            azure_client.get_resource_group(self.resource_group)
 
         except CloudError as cloud_error:
             if cloud_error.error.error == "ResourceGroupNotFound":
                 resource_group_params = {'location': self.region_name}
                 try:
-                    self._azure_client.\
+                    azure_client.\
                         create_resource_group(self.resource_group,
                                               resource_group_params)
                 except CloudError as cloud_error2:  # pragma: no cover
@@ -6,6 +6,7 @@ import logging
 from uuid import uuid4
 
 from azure.common import AzureException
+from azure.common import AzureMissingResourceHttpError
 from azure.mgmt.devtestlabs.models import GalleryImageReference
 from azure.mgmt.network.models import NetworkSecurityGroup
 
@@ -13,6 +14,8 @@ from msrestazure.azure_exceptions import CloudError
 
 import pysftp
 
+import tenacity
+
 import cloudbridge.cloud.base.helpers as cb_helpers
 from cloudbridge.cloud.base.resources import BaseAttachmentInfo, \
     BaseBucket, BaseBucketContainer, BaseBucketObject, BaseFloatingIP, \
@@ -27,6 +30,8 @@ from cloudbridge.cloud.interfaces.resources import Instance, \
     SnapshotState, SubnetState, TrafficDirection
 
 from . import helpers as azure_helpers
+from .operations import run_in_background
+from .operations import wait_all
 
 log = logging.getLogger(__name__)
 
@@ -59,6 +64,7 @@ class AzureVMFirewall(BaseVMFirewall):
         return self._vm_firewall.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         self.assert_valid_resource_label(value)
         self._vm_firewall.tags.update(Label=value or "")
@@ -80,8 +86,18 @@ class AzureVMFirewall(BaseVMFirewall):
     def rules(self):
         return self._rule_container
 
-    def delete(self):
-        self._provider.azure_client.delete_vm_firewall(self.id)
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
+        """
+        Delete this VM firewall.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
+        """
+        return self._provider.azure_client.delete_vm_firewall(self.id,
+                                                              wait=wait)
 
     def refresh(self):
         """
@@ -124,28 +140,60 @@ class AzureVMFirewallRuleContainer(BaseVMFirewallRuleContainer):
     def create(self, direction, protocol=None, from_port=None, to_port=None,
                cidr=None, src_dest_fw=None):
         if protocol and from_port and to_port:
-            return self._create_rule(direction, protocol, from_port,
-                                     to_port, cidr)
+            return self._create_rules(
+                [(direction, protocol, from_port, to_port, cidr)])[0]
         elif src_dest_fw:
-            result = None
             fw = (self._provider.security.vm_firewalls.get(src_dest_fw)
                   if isinstance(src_dest_fw, str) else src_dest_fw)
-            for rule in fw.rules:
-                result = self._create_rule(
-                    rule.direction, rule.protocol, rule.from_port,
-                    rule.to_port, rule.cidr)
-            return result
+            # The rules of the other firewall are copied with a single
+            # update of this firewall, rather than an operation per rule
+            results = self._create_rules(
+                [(rule.direction, rule.protocol, rule.from_port,
+                  rule.to_port, rule.cidr) for rule in fw.rules])
+            return results[-1] if results else None
         else:
             return None
 
-    def _create_rule(self, direction, protocol, from_port, to_port, cidr):
+    def __if_firewall_modified(e):
+        # return True if the CloudError exception is due to the firewall
+        # having been modified since it was fetched
+        return isinstance(e, CloudError) and e.status_code == 412
 
+    @tenacity.retry(stop=tenacity.stop_after_attempt(3),
+                    retry=tenacity.retry_if_exception(__if_firewall_modified),
+                    reraise=True)
+    def _create_rules(self, rules):
+        """
+        Adds the given ``(direction, protocol, from_port, to_port, cidr)``
+        rules to the firewall and returns them.
+
+        The firewall is fetched again first, so that new rules are numbered
+        after its current ones, and its update is conditional on the
+        fetched etag, so that concurrent changes are not overwritten.
+        """
+        if not rules:
+            return []
+        self.firewall.refresh()
+        # pylint:disable=protected-access
+        vm_firewall = self.firewall._vm_firewall
+        count = len(vm_firewall.security_rules)
+        parameters = []
+        for direction, protocol, from_port, to_port, cidr in rules:
+            count += 1
+            parameters.append(("cb-rule-" + str(count), self._rule_parameters(
+                count, direction, protocol, from_port, to_port, cidr)))
+        results = self._provider.azure_client.add_vm_firewall_rules(
+            vm_firewall, parameters)
+        return [AzureVMFirewallRule(self.firewall, result)
+                for result in results]
+
+    @staticmethod
+    def _rule_parameters(count, direction, protocol, from_port, to_port,
+                         cidr):
         # If cidr is None, default values is set as 0.0.0.0/0
         if not cidr:
             cidr = '0.0.0.0/0'
 
-        count = len(self.firewall._vm_firewall.security_rules) + 1
-        rule_name = "cb-rule-" + str(count)
         priority = 1000 + count
         destination_port_range = str(from_port) + "-" + str(to_port)
         source_port_range = '*'
@@ -153,20 +201,14 @@ class AzureVMFirewallRuleContainer(BaseVMFirewallRuleContainer):
         access = "Allow"
         direction = ("Inbound" if direction == TrafficDirection.INBOUND
                      else "Outbound")
-        parameters = {"priority": priority,
-                      "protocol": protocol,
-                      "source_port_range": source_port_range,
-                      "source_address_prefix": cidr,
-                      "destination_port_range": destination_port_range,
-                      "destination_address_prefix": destination_address_prefix,
-                      "access": access,
-                      "direction": direction}
-        result = self._provider.azure_client. \
-            create_vm_firewall_rule(self.firewall.id,
-                                    rule_name, parameters)
-        # pylint:disable=protected-access
-        self.firewall._vm_firewall.security_rules.append(result)
-        return AzureVMFirewallRule(self.firewall, result)
+        return {"priority": priority,
+                "protocol": protocol,
+                "source_port_range": source_port_range,
+                "source_address_prefix": cidr,
+                "destination_port_range": destination_port_range,
+                "destination_address_prefix": destination_address_prefix,
+                "access": access,
+                "direction": direction}
 
 
 # Tuple for port range
@@ -222,14 +264,24 @@ class AzureVMFirewallRule(BaseVMFirewallRule):
     def src_dest_fw(self):
         return self.firewall
 
-    def delete(self):
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
+        """
+        Delete this VM firewall rule.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
+        """
         vm_firewall = self.firewall.name
-        self._provider.azure_client. \
-            delete_vm_firewall_rule(self.id, vm_firewall)
+        operation = self._provider.azure_client. \
+            delete_vm_firewall_rule(self.id, vm_firewall, wait=wait)
         for i, o in enumerate(self.firewall._vm_firewall.security_rules):
             if o.id == self.id:
                 del self.firewall._vm_firewall.security_rules[i]
                 break
+        return operation
 
 
 class AzureBucketObject(BaseBucketObject):
@@ -262,18 +314,26 @@ class AzureBucketObject(BaseBucketObject):
         return self._key.properties.last_modified. \
             strftime("%Y-%m-%dT%H:%M:%S.%f")
 
-    def iter_content(self):
+    def iter_content(self, chunk_size=None):
         """
         Returns this object's content as an
-        iterable.
+        iterable, which is read in ranges of ``chunk_size`` bytes.
         """
-        content_stream = self._provider.azure_client. \
-            get_blob_content(self._container.id, self._key.name)
-        if content_stream:
-            content_stream.seek(0)
-        return content_stream
+        return cb_helpers.ChunkedStream(
+            self._iter_chunks(chunk_size or self.DEFAULT_CHUNK_SIZE))
+
+    def _iter_chunks(self, chunk_size):
+        # Fetch the current size, since the blob may have been uploaded
+        # after this object was created. A range cannot be requested from
+        # an empty blob.
+        size = self._provider.azure_client.get_blob(
+            self._container.id, self._key.name).properties.content_length
+        for start in range(0, size, chunk_size):
+            yield self._provider.azure_client.get_blob_range(
+                self._container.id, self._key.name, start,
+                min(start + chunk_size, size) - 1)
 
-    def upload(self, data):
+    def upload(self, data, transfer_config=None):
         """
         Set the contents of this object to the data read from the source
         string.
@@ -286,18 +346,35 @@ class AzureBucketObject(BaseBucketObject):
             log.exception(azureEx)
             return False
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, transfer_config=None):
         """
         Store the contents of the file pointed by the "path" variable.
+        Blocks are uploaded over ``transfer_config.concurrency`` connections.
         """
         try:
+            kwargs = {}
+            if transfer_config:
+                kwargs['max_connections'] = transfer_config.concurrency
             self._provider.azure_client.create_blob_from_file(
-                self._container.id, self.id, path)
+                self._container.id, self.id, path, **kwargs)
             return True
         except AzureException as azureEx:
             log.exception(azureEx)
             return False
 
+    def download_to_file(self, path, transfer_config=None):
+        """
+        Save the contents of this object to the file pointed by the "path"
+        variable, using ranged reads over ``transfer_config.concurrency``
+        connections.
+        """
+        kwargs = {}
+        if transfer_config:
+            kwargs['max_connections'] = transfer_config.concurrency
+        self._provider.azure_client.get_blob_to_file(
+            self._container.id, self.id, path, **kwargs)
+
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this object.
@@ -337,9 +414,14 @@ class AzureBucket(BaseBucket):
         """
         return self._bucket.name
 
-    def delete(self, delete_contents=True):
+    @cb_helpers.invalidates_cache
+    def delete(self, delete_contents=True, progress=None):
         """
         Delete this bucket.
+
+        Deleting a container deletes its blobs along with it, server side,
+        so blobs are neither listed nor deleted one by one, and the progress
+        callback is not called.
         """
         self._provider.azure_client.delete_container(self.name)
 
@@ -359,6 +441,19 @@ class AzureBucketContainer(BaseBucketContainer):
     def __init__(self, provider, bucket):
         super(AzureBucketContainer, self).__init__(provider, bucket)
 
+    def _delete_object(self, key):
+        # Blob storage has no batch delete, so blobs are deleted
+        # concurrently, one request each
+        try:
+            self._provider.azure_client.delete_blob(self.bucket.name, key)
+        except AzureMissingResourceHttpError:
+            pass
+
+    def _iter_keys(self):
+        # list_blobs() fetches pages lazily, as they are consumed
+        return (blob.name for blob in
+                self._provider.azure_client.list_blobs(self.bucket.name))
+
     def get(self, key):
         """
         Retrieve a given object from this bucket.
@@ -453,6 +548,7 @@ class AzureVolume(BaseVolume):
         return self._volume.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -543,11 +639,17 @@ class AzureVolume(BaseVolume):
         return self._provider.storage.snapshots.create(label, self,
                                                        description)
 
-    def delete(self):
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
         """
         Delete this volume.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
         """
-        self._provider.azure_client.delete_disk(self.id)
+        return self._provider.azure_client.delete_disk(self.id, wait=wait)
 
     @property
     def state(self):
@@ -569,6 +671,21 @@ class AzureVolume(BaseVolume):
             # set the state to unknown
             self._state = 'unknown'
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        provider = resources[0]._provider
+        # Azure does not guarantee the casing of resource ids
+        latest = {disk.id.lower(): disk
+                  for disk in provider.azure_client.list_disks()}
+        # pylint:disable=protected-access
+        for vol in resources:
+            if vol.id.lower() in latest:
+                vol._volume = latest[vol.id.lower()]
+                vol._update_state()
+            else:
+                # The volume no longer exists
+                vol._state = 'unknown'
+
 
 class AzureSnapshot(BaseSnapshot):
     SNAPSHOT_STATE_MAP = {
@@ -611,6 +728,7 @@ class AzureSnapshot(BaseSnapshot):
         return self._snapshot.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -665,11 +783,32 @@ class AzureSnapshot(BaseSnapshot):
             # set the state to unknown
             self._state = 'unknown'
 
-    def delete(self):
+    @classmethod
+    def _refresh_all(cls, resources):
+        provider = resources[0]._provider
+        # Azure does not guarantee the casing of resource ids
+        latest = {snap.id.lower(): snap
+                  for snap in provider.azure_client.list_snapshots()}
+        # pylint:disable=protected-access
+        for snap in resources:
+            if snap.id.lower() in latest:
+                snap._snapshot = latest[snap.id.lower()]
+                snap._state = snap._snapshot.provisioning_state
+            else:
+                # The snapshot no longer exists
+                snap._state = 'unknown'
+
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
         """
         Delete this snapshot.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
         """
-        self._provider.azure_client.delete_snapshot(self.id)
+        return self._provider.azure_client.delete_snapshot(self.id, wait=wait)
 
     def create_volume(self, placement=None,
                       size=None, volume_type=None, iops=None):
@@ -734,6 +873,7 @@ class AzureMachineImage(BaseMachineImage):
             return self._image.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         """
         Set the image label when it is a private image.
@@ -784,6 +924,7 @@ class AzureMachineImage(BaseMachineImage):
         else:
             return self._image.storage_profile.os_disk.disk_size_gb or 0
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this image
@@ -880,6 +1021,7 @@ class AzureNetwork(BaseNetwork):
         return self._network.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -926,11 +1068,17 @@ class AzureNetwork(BaseNetwork):
         """
         return self._network.address_space.address_prefixes[0]
 
-    def delete(self):
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
         """
         Delete an existing network.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
         """
-        self._provider.azure_client.delete_network(self.id)
+        return self._provider.azure_client.delete_network(self.id, wait=wait)
 
     @property
     def subnets(self):
@@ -1022,11 +1170,18 @@ class AzureFloatingIP(BaseFloatingIP):
     def in_use(self):
         return True if self._ip.ip_configuration else False
 
-    def delete(self):
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
         """
         Delete an existing floating ip.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
         """
-        self._provider.azure_client.delete_floating_ip(self.id)
+        return self._provider.azure_client.delete_floating_ip(self.id,
+                                                              wait=wait)
 
     def refresh(self):
         net = self._provider.networking.networks.get(self._network_id)
@@ -1130,6 +1285,7 @@ class AzureSubnet(BaseSubnet):
         return az_network.tags.get(self.tag_name, None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -1165,6 +1321,7 @@ class AzureSubnet(BaseSubnet):
     def network_id(self):
         return self._provider.azure_client.get_network_id_for_subnet(self.id)
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._provider.azure_client.delete_subnet(self.id)
 
@@ -1259,6 +1416,7 @@ class AzureInstance(BaseInstance):
         return self._vm.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -1299,39 +1457,60 @@ class AzureInstance(BaseInstance):
         """
         Get the instance type.
         """
-        return self._provider.compute.vm_types.find(
-            name=self.vm_type_id)[0]
+        return self._provider.compute.vm_types.get(self.vm_type_id)
 
-    def reboot(self):
+    def reboot(self, wait=True):
         """
         Reboot this instance (using the cloud middleware API).
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the restart, without waiting for it to
+                     complete.
         """
-        self._provider.azure_client.restart_vm(self.id)
+        return self._provider.azure_client.restart_vm(self.id, wait=wait)
 
-    def delete(self):
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
         """
         Permanently terminate this instance.
         After deleting the VM. we are deleting the network interface
         associated to the instance, public ip addresses associated to
         the instance and also removing OS disk and data disks where
         tag with name 'delete_on_terminate' has value True.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete. As the VM, its network interfaces and disks
+                     are deleted in turn, they are then deleted on a
+                     background thread.
         """
+        if not wait:
+            return run_in_background(self.delete, self.id, 'delete')
         # Remove IPs first to avoid a network interface conflict
         for public_ip_id in self._public_ip_ids:
             self.remove_floating_ip(public_ip_id)
-        self._provider.azure_client.deallocate_vm(self.id)
-        self._provider.azure_client.delete_vm(self.id)
-        for nic_id in self._nic_ids:
-            self._provider.azure_client.delete_nic(nic_id)
+        azure_client = self._provider.azure_client
+        azure_client.deallocate_vm(self.id)
+        azure_client.delete_vm(self.id)
+        # The network interfaces and disks are released once the VM is
+        # deleted, and are then deleted concurrently
+        operations = [azure_client.delete_nic(nic_id, wait=False)
+                      for nic_id in self._nic_ids]
         for data_disk in self._vm.storage_profile.data_disks:
             if data_disk.managed_disk:
                 if self._vm.tags.get('delete_on_terminate',
                                      'False') == 'True':
-                    self._provider.azure_client.\
-                        delete_disk(data_disk.managed_disk.id)
+                    operations.append(azure_client.delete_disk(
+                        data_disk.managed_disk.id, wait=False))
         if self._vm.storage_profile.os_disk.managed_disk:
-            self._provider.azure_client. \
-                delete_disk(self._vm.storage_profile.os_disk.managed_disk.id)
+            operations.append(azure_client.delete_disk(
+                self._vm.storage_profile.os_disk.managed_disk.id,
+                wait=False))
+        for result in wait_all(operations):
+            if not result.success:
+                raise result.error
 
     @property
     def image_id(self):
@@ -1387,6 +1566,7 @@ class AzureInstance(BaseInstance):
         """
         return self._vm.tags.get('Key_Pair')
 
+    @cb_helpers.invalidates_cache(service_name='images')
     def create_image(self, label, private_key_path=None):
         """
         Create a new image based on this instance. Documentation for create
@@ -1627,6 +1807,7 @@ class AzureKeyPair(BaseKeyPair):
     def name(self):
         return self._key_pair.Name
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._provider.azure_client.delete_public_key(self._key_pair)
 
@@ -1660,6 +1841,7 @@ class AzureRouter(BaseRouter):
         return self._route_table.tags.get('Label', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -1686,8 +1868,18 @@ class AzureRouter(BaseRouter):
     def network_id(self):
         return None
 
-    def delete(self):
-        self._provider.azure_client.delete_route_table(self.name)
+    @cb_helpers.invalidates_cache
+    def delete(self, wait=True):
+        """
+        Delete this router.
+
+        :type wait: ``bool``
+        :param wait: If ``False``, return an :class:`.AzureOperation`
+                     handle on the deletion, without waiting for it to
+                     complete.
+        """
+        return self._provider.azure_client.delete_route_table(self.name,
+                                                              wait=wait)
 
     def attach_subnet(self, subnet):
         self._provider.azure_client. \
@@ -22,6 +22,7 @@ from cloudbridge.cloud.interfaces.exceptions import \
 from cloudbridge.cloud.interfaces.resources import MachineImage, \
     Network, PlacementZone, Snapshot, Subnet, VMFirewall, VMType, Volume
 
+from .operations import run_all
 from .resources import AzureBucket, \
     AzureInstance, AzureKeyPair, \
     AzureLaunchConfig, AzureMachineImage, AzureNetwork, \
@@ -83,28 +84,34 @@ class AzureVMFirewallService(BaseVMFirewallService):
 
         # Add default rules to negate azure default rules.
         # See: https://github.com/CloudVE/cloudbridge/issues/106
-        # pylint:disable=protected-access
+        rules = []
         for rule in fw.default_security_rules:
-            rule_name = "cb-override-" + rule.name
             # Transpose rules to priority 4001 onwards, because
             # only 0-4096 are allowed for custom rules
-            rule.priority = rule.priority - 61440
-            rule.access = "Deny"
-            self.provider.azure_client.create_vm_firewall_rule(
-                fw.id, rule_name, rule)
+            rules.append(("cb-override-" + rule.name, {
+                "priority": rule.priority - 61440,
+                "protocol": rule.protocol,
+                "source_port_range": rule.source_port_range,
+                "source_address_prefix": rule.source_address_prefix,
+                "destination_port_range": rule.destination_port_range,
+                "destination_address_prefix": rule.destination_address_prefix,
+                "access": "Deny",
+                "direction": rule.direction}))
 
         # Add a new custom rule allowing all outbound traffic to the internet
-        parameters = {"priority": 3000,
-                      "protocol": "*",
-                      "source_port_range": "*",
-                      "source_address_prefix": "*",
-                      "destination_port_range": "*",
-                      "destination_address_prefix": "Internet",
-                      "access": "Allow",
-                      "direction": "Outbound"}
-        result = self.provider.azure_client.create_vm_firewall_rule(
-            fw.id, "cb-default-internet-outbound", parameters)
-        fw.security_rules.append(result)
+        rules.append(("cb-default-internet-outbound", {
+            "priority": 3000,
+            "protocol": "*",
+            "source_port_range": "*",
+            "source_address_prefix": "*",
+            "destination_port_range": "*",
+            "destination_address_prefix": "Internet",
+            "access": "Allow",
+            "direction": "Outbound"}))
+
+        # All rules are added with a single update of the firewall, rather
+        # than waiting for an operation per rule
+        self.provider.azure_client.add_vm_firewall_rules(fw, rules)
 
         cb_fw = AzureVMFirewall(self.provider, fw)
         return cb_fw
@@ -209,6 +216,13 @@ class AzureVolumeService(BaseVolumeService):
     def __init__(self, provider):
         super(AzureVolumeService, self).__init__(provider)
 
+    def delete_many(self, volume_ids):
+        """
+        Starts deleting all volumes at once, then waits for the deletions
+        to complete.
+        """
+        return run_all(self.provider.azure_client.delete_disk, volume_ids)
+
     def get(self, volume_id):
         """
         Returns a volume given its id.
@@ -244,13 +258,14 @@ class AzureVolumeService(BaseVolumeService):
         return ClientPagedResultList(self.provider, cb_vols,
                                      limit=limit, marker=marker)
 
-    def create(self, label, size, zone, description=None, snapshot=None):
+    def create(self, label, size, zone, description=None, snapshot=None,
+               tags=None):
         """
         Creates a new volume.
         """
         AzureVolume.assert_valid_resource_label(label)
         disk_name = AzureVolume._generate_name_from_label(label, "cb-vol")
-        tags = {'Label': label}
+        tags = dict(tags or {}, Label=label)
 
         zone_id = zone.id if isinstance(zone, PlacementZone) else zone
         snapshot = (self.provider.storage.snapshots.get(snapshot)
@@ -297,6 +312,14 @@ class AzureSnapshotService(BaseSnapshotService):
     def __init__(self, provider):
         super(AzureSnapshotService, self).__init__(provider)
 
+    def delete_many(self, snapshot_ids):
+        """
+        Starts deleting all snapshots at once, then waits for the deletions
+        to complete.
+        """
+        return run_all(self.provider.azure_client.delete_snapshot,
+                       snapshot_ids)
+
     def get(self, ss_id):
         """
         Returns a snapshot given its id.
@@ -332,14 +355,14 @@ class AzureSnapshotService(BaseSnapshotService):
                  self.provider.azure_client.list_snapshots()]
         return ClientPagedResultList(self.provider, snaps, limit, marker)
 
-    def create(self, label, volume, description=None):
+    def create(self, label, volume, description=None, tags=None):
         """
         Creates a new snapshot of a given volume.
         """
         AzureSnapshot.assert_valid_resource_label(label)
         snapshot_name = AzureSnapshot._generate_name_from_label(label,
                                                                 "cb-snap")
-        tags = {'Label': label}
+        tags = dict(tags or {}, Label=label)
         if description:
             tags.update(Description=description)
 
@@ -488,7 +511,7 @@ class AzureInstanceService(BaseInstanceService):
 
     def create(self, label, image, vm_type, subnet, zone,
                key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None, **kwargs):
+               launch_config=None, tags=None, **kwargs):
 
         AzureInstance.assert_valid_resource_label(label)
 
@@ -591,7 +614,7 @@ class AzureInstanceService(BaseInstanceService):
                 }]
             },
             'storage_profile': storage_profile,
-            'tags': {'Label': label}
+            'tags': dict(tags or {}, Label=label)
         }
 
         for disk_def in storage_profile.get('data_disks', []):
@@ -6,6 +6,11 @@ import tenacity
 
 from cloudbridge.cloud.interfaces.exceptions import ProviderInternalException
 
+# Maximum number of requests sent in a single HTTP batch request
+MAX_BATCH_REQUESTS = 1000
+# Cloud Storage accepts fewer requests per batch
+MAX_STORAGE_BATCH_REQUESTS = 100
+
 
 def gce_projects(provider):
     return provider.gce_compute.projects()
@@ -22,6 +27,43 @@ def iter_all(resource, **kwargs):
         token = response['nextPageToken']
 
 
+def iter_aggregated(resource, key, **kwargs):
+    """
+    Iterate over the items returned by an aggregatedList call, across all
+    zones or regions. ``key`` is the name of the list within each scope
+    (e.g. ``instances`` or ``disks``).
+    """
+    token = None
+    while True:
+        response = resource.aggregatedList(pageToken=token,
+                                           **kwargs).execute()
+        for scope in response.get('items', {}).values():
+            for item in scope.get(key, []):
+                yield item
+        if 'nextPageToken' not in response:
+            return
+        token = response['nextPageToken']
+
+
+def execute_batch(connection, requests, batch_size=MAX_BATCH_REQUESTS):
+    """
+    Sends ``requests``, built with ``connection``, in as few HTTP batch
+    requests (of at most ``batch_size`` requests each) as possible. Returns
+    a ``(response, exception)`` tuple for each request, in order.
+    """
+    results = [None] * len(requests)
+
+    def store(request_id, response, exception):
+        results[int(request_id)] = (response, exception)
+
+    for start in range(0, len(requests), batch_size):
+        batch = connection.new_batch_http_request(callback=store)
+        for index in range(start, min(start + batch_size, len(requests))):
+            batch.add(requests[index], request_id=str(index))
+        batch.execute()
+    return results
+
+
 def get_common_metadata(provider):
     """
     Get a project's commonInstanceMetadata entry
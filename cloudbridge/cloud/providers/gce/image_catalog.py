@@ -0,0 +1,210 @@
+"""
+A persistent catalogue of the public GCE images.
+
+Listing the public image projects takes many requests and thousands of
+results, so the images are stored in an SQLite database in the user's cache
+directory, where they are shared between processes. Each project is
+refreshed incrementally, by requesting only the images created since the
+newest one already stored, and fully (to pick up deprecated and deleted
+images) at a longer interval.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from cloudbridge.cloud.providers.gce import helpers
+
+log = logging.getLogger(__name__)
+
+# Time (in seconds) after which a project's new images are fetched
+DEFAULT_TTL = 3600
+# Time (in seconds) after which all of a project's images are fetched again
+DEFAULT_FULL_REFRESH_INTERVAL = 24 * 3600
+
+# Bump whenever the tables below change, to discard existing catalogues
+SCHEMA_VERSION = 1
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS meta (
+           key TEXT PRIMARY KEY,
+           value TEXT)""",
+    """CREATE TABLE IF NOT EXISTS projects (
+           project TEXT PRIMARY KEY,
+           refreshed REAL,
+           full_refreshed REAL,
+           newest TEXT)""",
+    """CREATE TABLE IF NOT EXISTS images (
+           self_link TEXT PRIMARY KEY,
+           project TEXT NOT NULL,
+           name TEXT NOT NULL,
+           family TEXT,
+           label TEXT,
+           created TEXT,
+           deprecated TEXT,
+           data TEXT NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS images_name ON images (name)",
+    "CREATE INDEX IF NOT EXISTS images_family ON images (family)",
+    "CREATE INDEX IF NOT EXISTS images_label ON images (label)",
+    "CREATE INDEX IF NOT EXISTS images_project ON images (project)",
+]
+
+
+def default_path():
+    """
+    Returns the default location of the catalogue, within the user's cache
+    directory.
+    """
+    cache_dir = (os.environ.get('XDG_CACHE_HOME') or
+                 os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_dir, 'cloudbridge', 'gce_images.sqlite')
+
+
+class GCEImageCatalog(object):
+    """
+    Stores the images of a set of GCE projects, indexed by name, family and
+    CloudBridge label. Images are returned as the dicts returned by the
+    GCE API.
+
+    :type path: ``str``
+    :param path: Path of the SQLite database. ``:memory:`` keeps the
+                 catalogue in memory only. If the database cannot be opened,
+                 an in-memory catalogue is used instead.
+
+    :type ttl: ``int``
+    :param ttl: Time (in seconds) after which new images are fetched.
+
+    :type full_refresh_interval: ``int``
+    :param full_refresh_interval: Time (in seconds) after which all images
+                                  are fetched again.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL,
+                 full_refresh_interval=DEFAULT_FULL_REFRESH_INTERVAL):
+        self.ttl = ttl
+        self.full_refresh_interval = full_refresh_interval
+        self._lock = threading.Lock()
+        try:
+            self._conn = self._connect(path)
+        except (OSError, IOError, sqlite3.Error) as e:
+            log.warning("Could not open the GCE image catalogue at %s (%s)."
+                        " Using an in-memory catalogue instead.", path, e)
+            self._conn = self._connect(':memory:')
+
+    @staticmethod
+    def _connect(path):
+        if path != ':memory:':
+            cache_dir = os.path.dirname(path)
+            if cache_dir and not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+        conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with conn:
+            conn.execute(_SCHEMA[0])
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if not row or row[0] != str(SCHEMA_VERSION):
+                log.debug("Creating GCE image catalogue version %s at %s",
+                          SCHEMA_VERSION, path)
+                conn.execute("DROP TABLE IF EXISTS projects")
+                conn.execute("DROP TABLE IF EXISTS images")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES "
+                             "('version', ?)", (str(SCHEMA_VERSION),))
+            for statement in _SCHEMA[1:]:
+                conn.execute(statement)
+        return conn
+
+    def refresh(self, images_resource, projects, force=False):
+        """
+        Brings the images of the given projects up to date, if they are
+        older than the TTL.
+
+        :type images_resource: ``object``
+        :param images_resource: The GCE compute ``images()`` resource.
+
+        :type projects: ``list`` of ``str``
+        :param projects: The projects whose images should be refreshed.
+
+        :type force: ``bool``
+        :param force: If True, fetch all images regardless of their age.
+        """
+        for project in projects:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT refreshed, full_refreshed, newest FROM projects"
+                    " WHERE project = ?", (project,)).fetchone()
+            now = time.time()
+            if row and not force and now - row[0] < self.ttl:
+                continue
+            full = (force or not row or
+                    now - row[1] >= self.full_refresh_interval)
+            if full:
+                log.debug("Fetching all images of project %s", project)
+                images = list(helpers.iter_all(images_resource,
+                                               project=project))
+            else:
+                log.debug("Fetching images of project %s created after %s",
+                          project, row[2])
+                images = list(helpers.iter_all(
+                    images_resource, project=project,
+                    filter='creationTimestamp > "{0}"'.format(row[2])))
+            self._store(project, images, now, full, row)
+
+    def _store(self, project, images, now, full, row):
+        created = [image.get('creationTimestamp', '') for image in images]
+        newest = max(created + [row[2] if row else ''])
+        with self._lock, self._conn:
+            if full:
+                self._conn.execute("DELETE FROM images WHERE project = ?",
+                                   (project,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO images "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(image['selfLink'], project, image['name'],
+                  image.get('family'),
+                  (image.get('labels') or {}).get('cblabel', ''),
+                  image.get('creationTimestamp'),
+                  (image.get('deprecated') or {}).get('state'),
+                  json.dumps(image))
+                 for image in images])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?)",
+                (project, now, now if full else row[1], newest))
+
+    def _select(self, where='', params=()):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM images {0} ORDER BY project, name".format(
+                    where), params).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def get(self, image_id):
+        """
+        Returns the image with the given URL or name, or ``None``.
+        """
+        images = self._select("WHERE self_link = ? OR name = ?",
+                              (image_id, image_id))
+        return images[0] if images else None
+
+    def find(self, **kwargs):
+        """
+        Returns the images whose ``name``, ``family`` and ``label`` are
+        equal to the given values.
+        """
+        unknown = set(kwargs) - {'name', 'family', 'label'}
+        if unknown:
+            raise TypeError("Unrecognised parameters for search: %s."
+                            " Supported attributes: name, family, label"
+                            % unknown)
+        criteria = sorted(kwargs.items())
+        where = "WHERE " + " AND ".join(
+            "{0} = ?".format(column) for column, _ in criteria)
+        return self._select(where if criteria else '',
+                            [value for _, value in criteria])
+
+    def list(self):
+        """
+        Returns all images in the catalogue.
+        """
+        return self._select()
@@ -6,8 +6,10 @@ import json
 import logging
 import os
 import re
+import threading
 import time
-from string import Template
+
+import cachetools
 
 import googleapiclient
 from googleapiclient import discovery
@@ -17,7 +19,9 @@ from oauth2client.service_account import ServiceAccountCredentials
 
 import cloudbridge as cb
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.client_pool import credentials_digest
 from cloudbridge.cloud.interfaces.exceptions import ProviderConnectionException
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
 
 from .services import GCEComputeService
 from .services import GCENetworkingService
@@ -59,23 +63,47 @@ class GCPResourceUrl(object):
         return discovery_object.get(**self.parameters).execute()
 
 
-class GCPResources(object):
+# Number of parsed resource URLs remembered by each router
+URL_CACHE_SIZE = 4096
 
-    def __init__(self, connection, **kwargs):
-        self._connection = connection
-        self._parameter_defaults = kwargs
+_NOT_CACHED = object()
 
-        # Resource descriptions are already pulled into the internal
-        # _resourceDesc field of the connection.
-        #
-        # FIX_IF_NEEDED: We could fetch compute resource descriptions from
-        # https://www.googleapis.com/discovery/v1/apis/compute/v1/rest and
-        # storage resource descriptions from
-        # https://www.googleapis.com/discovery/v1/apis/storage/v1/rest
-        # ourselves.
-        #
-        # Resource descriptions are in JSON format which are then parsed into a
-        # Python dictionary. The main fields we are interested are:
+
+class _RouteNode(object):
+    __slots__ = ('children', 'wildcard', 'routes')
+
+    def __init__(self):
+        # Child nodes by literal path segment
+        self.children = {}
+        # Child node for a template parameter segment
+        self.wildcard = None
+        # (resource, parameter names, value validators) of the templates
+        # ending at this node
+        self.routes = []
+
+
+class GCPResourceRouter(object):
+    """
+    Maps resource URLs to the resource they refer to and its parameters.
+
+    The ``get`` method path templates of the resources in a discovery
+    document (such as ``{project}/zones/{zone}/instances/{instance}``) are
+    compiled into a trie keyed on their literal path segments, with a single
+    wildcard branch per node for template parameters. Parsing a URL is thus
+    a walk over its path segments, rather than trying each resource's
+    pattern in turn. Parsed URLs are kept in an LRU cache, as the same
+    self-links (zones, networks, machine types...) are parsed repeatedly.
+
+    Routers are built once per discovery document and shared, through
+    :meth:`for_description`.
+    """
+
+    _routers = {}
+    _routers_lock = threading.Lock()
+
+    def __init__(self, desc):
+        # Resource descriptions are in JSON format which are then parsed into
+        # a Python dictionary. The main fields we are interested are:
         #
         # {
         #   "rootUrl": "https://www.googleapis.com/",
@@ -101,35 +129,146 @@ class GCPResources(object):
         #   }
         #   ...
         # }
-        desc = connection._resourceDesc
-        self._root_url = desc['rootUrl']
-        self._service_path = desc['servicePath']
-        self._resources = {}
+        self.root_url = desc['rootUrl']
+        self.service_path = desc['servicePath']
+        # The parameters of each resource, in the order of parameterOrder
+        self.parameters = {}
+        self._root = _RouteNode()
+        # Regex patterns of the resources which cannot be routed by segment
+        self._patterns = {}
+        self._cache = cachetools.LRUCache(URL_CACHE_SIZE)
+        self._cache_lock = threading.Lock()
 
-        # We will not mutate self._desc; it's OK to use items() in Python 2.x.
+        # We will not mutate desc; it's OK to use items() in Python 2.x.
         for resource, resource_desc in desc['resources'].items():
-            methods = resource_desc.get('methods', {})
-            if not methods.get('get'):
+            method = resource_desc.get('methods', {}).get('get')
+            if method:
+                self._add_route(resource, method)
+
+    @classmethod
+    def for_description(cls, desc):
+        """
+        Returns the router shared by all clients of the given discovery
+        document.
+        """
+        key = (desc['rootUrl'], desc['servicePath'], desc.get('revision'))
+        with cls._routers_lock:
+            router = cls._routers.get(key)
+            if router is None:
+                router = cls._routers[key] = cls(desc)
+            return router
+
+    def _add_route(self, resource, method):
+        parameters = method['parameterOrder']
+        self.parameters[resource] = parameters
+        # Patterns of the parameters which are constrained
+        patterns = dict(
+            (parameter, method['parameters'][parameter]['pattern'])
+            for parameter in parameters
+            if 'pattern' in method['parameters'][parameter])
+        segments = method['path'].split('/')
+        names = [segment[1:-1] for segment in segments
+                 if segment.startswith('{') and segment.endswith('}')]
+        if (any('/' in patterns.get(name, '') or name.startswith('+')
+                for name in names) or
+                any('{' in segment and segment[1:-1] not in names
+                    for segment in segments)):
+            self._add_pattern(resource, method, patterns)
+            return
+
+        node = self._root
+        validators = []
+        for segment in segments:
+            if segment.startswith('{'):
+                if node.wildcard is None:
+                    node.wildcard = _RouteNode()
+                node = node.wildcard
+                pattern = patterns.get(segment[1:-1])
+                validators.append(
+                    re.compile(r'(?:%s)\Z' % pattern) if pattern else None)
+            else:
+                node = node.children.setdefault(segment, _RouteNode())
+        node.routes.append((resource, names, validators))
+
+    def _add_pattern(self, resource, method, patterns):
+        # Parameters whose values may span several path segments can only be
+        # matched with a regex. We would like to change a path like
+        # {project}/regions/{region}/addresses/{address} to a pattern like
+        # (PROJECT REGEX)/regions/(REGION REGEX)/addresses/(ADDRESS REGEX).
+        self._patterns[resource] = re.compile(re.sub(
+            r'\{\+?(\w+)\}',
+            lambda m: '(?P<%s>%s)' % (m.group(1),
+                                      patterns.get(m.group(1), '[^/]+')),
+            method['path']))
+
+    def parse(self, url):
+        """
+        Returns a ``(resource, parameters)`` tuple for the given URL, where
+        parameters is a tuple of ``(name, value)`` pairs, or ``None`` if the
+        URL does not refer to a known resource.
+        """
+        url = url.strip()
+        with self._cache_lock:
+            match = self._cache.get(url, _NOT_CACHED)
+        if match is _NOT_CACHED:
+            match = self._parse(url)
+            with self._cache_lock:
+                self._cache[url] = match
+        return match
+
+    def _parse(self, url):
+        path = url
+        if path.startswith(self.root_url):
+            path = path[len(self.root_url):]
+        if path.startswith(self.service_path):
+            path = path[len(self.service_path):]
+        match = self._match(self._root, path.split('/'), 0, [])
+        if match:
+            return match
+        for resource, pattern in self._patterns.items():
+            m = pattern.match(path)
+            if m is None or len(m.group(0)) < len(path):
                 continue
-            method = methods['get']
-            parameters = method['parameterOrder']
-
-            # We would like to change a path like
-            # {project}/regions/{region}/addresses/{address} to a pattern like
-            # (PROJECT REGEX)/regions/(REGION REGEX)/addresses/(ADDRESS REGEX).
-            template = Template('${'.join(method['path'].split('{')))
-            mapping = {}
-            for parameter in parameters:
-                parameter_desc = method['parameters'][parameter]
-                if 'pattern' in parameter_desc:
-                    mapping[parameter] = '(%s)' % parameter_desc['pattern']
-                else:
-                    mapping[parameter] = '([^/]+)'
-            pattern = template.substitute(**mapping)
-
-            # Store the parameters and the regex pattern of this resource.
-            self._resources[resource] = {'parameters': parameters,
-                                         'pattern': re.compile(pattern)}
+            return resource, tuple(sorted(m.groupdict().items()))
+        return None
+
+    def _match(self, node, segments, index, values):
+        if index == len(segments):
+            for resource, names, validators in node.routes:
+                if all(validator is None or validator.match(value)
+                       for validator, value in zip(validators, values)):
+                    return resource, tuple(zip(names, values))
+            return None
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            # Literal segments take precedence over parameters
+            match = self._match(child, segments, index + 1, values)
+            if match:
+                return match
+        if node.wildcard is not None and segment:
+            return self._match(node.wildcard, segments, index + 1,
+                               values + [segment])
+        return None
+
+
+class GCPResources(object):
+
+    def __init__(self, connection, **kwargs):
+        self._connection = connection
+        self._parameter_defaults = kwargs
+
+        # Resource descriptions are already pulled into the internal
+        # _resourceDesc field of the connection.
+        #
+        # FIX_IF_NEEDED: We could fetch compute resource descriptions from
+        # https://www.googleapis.com/discovery/v1/apis/compute/v1/rest and
+        # storage resource descriptions from
+        # https://www.googleapis.com/discovery/v1/apis/storage/v1/rest
+        # ourselves.
+        desc = connection._resourceDesc
+        self._root_url = desc['rootUrl']
+        self._router = GCPResourceRouter.for_description(desc)
 
     def parse_url(self, url):
         """
@@ -149,20 +288,13 @@ class GCPResources(object):
              'region': 'us-central1',
              'subnetwork': 'testsubnet-2'}
         """
-        url = url.strip()
-        if url.startswith(self._root_url):
-            url = url[len(self._root_url):]
-        if url.startswith(self._service_path):
-            url = url[len(self._service_path):]
-
-        for resource, desc in self._resources.items():
-            m = re.match(desc['pattern'], url)
-            if m is None or len(m.group(0)) < len(url):
-                continue
-            out = GCPResourceUrl(resource, self._connection)
-            for index, parameter in enumerate(desc['parameters']):
-                out.parameters[parameter] = m.group(index + 1)
-            return out
+        match = self._router.parse(url)
+        if match is None:
+            return None
+        resource, parameters = match
+        out = GCPResourceUrl(resource, self._connection)
+        out.parameters.update(parameters)
+        return out
 
     def get_resource_url_with_default(self, resource, url_or_name, **kwargs):
         """
@@ -176,7 +308,7 @@ class GCPResources(object):
         if url_or_name.startswith(self._root_url):
             return self.parse_url(url_or_name)
         # Otherwise, construct resource URL with default values.
-        if resource not in self._resources:
+        if resource not in self._router.parameters:
             cb.log.warning('Unknown resource: %s', resource)
             return None
 
@@ -184,7 +316,7 @@ class GCPResources(object):
         parameter_defaults.update(kwargs)
 
         parsed_url = GCPResourceUrl(resource, self._connection)
-        for key in self._resources[resource]['parameters']:
+        for key in self._router.parameters[resource]:
             parsed_url.parameters[key] = parameter_defaults.get(
                 key, url_or_name)
         return parsed_url
@@ -193,6 +325,7 @@ class GCPResources(object):
 class GCECloudProvider(BaseCloudProvider):
 
     PROVIDER_ID = 'gce'
+    REGION_CONFIG_KEY = 'gce_region_name'
 
     def __init__(self, config):
         super(GCECloudProvider, self).__init__(config)
@@ -230,13 +363,7 @@ class GCECloudProvider(BaseCloudProvider):
             self.project_name = self.credentials_dict['project_id']
         else:
             self.project_name = os.environ.get('GCE_PROJECT_NAME')
-
-        # service connections, lazily initialized
-        self._gce_compute = None
-        self._gcs_storage = None
-        self._credentials_cache = None
-        self._compute_resources_cache = None
-        self._storage_resources_cache = None
+        self._credentials_digest = credentials_digest(self.credentials_dict)
 
         # Initialize provider services
         self._compute = GCEComputeService(self)
@@ -262,43 +389,46 @@ class GCECloudProvider(BaseCloudProvider):
 
     @property
     def gce_compute(self):
-        if not self._gce_compute:
-            self._gce_compute = self._connect_gce_compute()
-        return self._gce_compute
+        return self._get_client('compute', self._connect_gce_compute)
 
     @property
     def gcs_storage(self):
-        if not self._gcs_storage:
-            self._gcs_storage = self._connect_gcs_storage()
-        return self._gcs_storage
+        return self._get_client('storage', self._connect_gcs_storage)
+
+    def _get_client(self, service, connect):
+        """
+        Get a discovery client from the provider's client pool, so that it
+        is shared with providers using the same credentials. The httplib2
+        transport used by the clients is not thread-safe, so each thread
+        has its own client (and connections). httplib2 holds a single
+        connection per host and has no keep-alive option, so the
+        ``connection_pool_*`` settings do not apply.
+        """
+        key = ('gce', service, self._credentials_digest)
+        return self.client_pool.get(key, connect, per_thread=True)
 
     @property
     def _compute_resources(self):
-        if not self._compute_resources_cache:
-            self._compute_resources_cache = GCPResources(
-                    self.gce_compute,
-                    project=self.project_name,
-                    region=self.region_name,
-                    zone=self.default_zone)
-        return self._compute_resources_cache
+        # Resource URLs hold the client of the thread that created them
+        return self._get_connection('compute_resources', lambda: GCPResources(
+            self.gce_compute, project=self.project_name,
+            region=self.region_name, zone=self.default_zone), per_thread=True)
 
     @property
     def _storage_resources(self):
-        if not self._storage_resources_cache:
-            self._storage_resources_cache = GCPResources(self.gcs_storage)
-        return self._storage_resources_cache
+        return self._get_connection(
+            'storage_resources', lambda: GCPResources(self.gcs_storage),
+            per_thread=True)
 
     @property
     def _credentials(self):
-        if not self._credentials_cache:
-            if self.credentials_dict:
-                self._credentials_cache = (
-                        ServiceAccountCredentials.from_json_keyfile_dict(
-                                self.credentials_dict))
-            else:
-                self._credentials_cache = (
-                        GoogleCredentials.get_application_default())
-        return self._credentials_cache
+        return self._get_connection('credentials', self._connect_credentials)
+
+    def _connect_credentials(self):
+        if self.credentials_dict:
+            return ServiceAccountCredentials.from_json_keyfile_dict(
+                self.credentials_dict)
+        return GoogleCredentials.get_application_default()
 
     def sign_blob(self, string_to_sign):
         return self._credentials.sign_blob(string_to_sign)[1]
@@ -315,7 +445,8 @@ class GCECloudProvider(BaseCloudProvider):
         return discovery.build('compute', 'v1', credentials=self._credentials,
                                cache_discovery=False)
 
-    def wait_for_operation(self, operation, region=None, zone=None):
+    def wait_for_operation(self, operation, region=None, zone=None,
+                           timeout=None):
         args = {'project': self.project_name, 'operation': operation['name']}
         if not region and not zone:
             operations = self.gce_compute.globalOperations()
@@ -326,14 +457,42 @@ class GCECloudProvider(BaseCloudProvider):
             operations = self.gce_compute.regionOperations()
             args['region'] = region
 
+        policy = self.polling_policy
+        if timeout is None:
+            timeout = policy.timeout
+        start_time = time.time()
+        end_time = start_time + timeout
+        key = ('GCEOperation', operation.get('operationType'))
+        # Operations usually complete within a few seconds, so start polling
+        # more frequently than for resource state changes, until their
+        # duration has been observed.
+        if policy.expected_duration(key) is None:
+            delays = policy.delays(key=key, interval=min(policy.interval, 1))
+        else:
+            delays = policy.delays(key=key)
+
         while True:
             result = operations.get(**args).execute()
             if result['status'] == 'DONE':
                 if 'error' in result:
                     raise Exception(result['error'])
+                policy.record(key, time.time() - start_time)
                 return result
-
-            time.sleep(0.5)
+            if time.time() > end_time:
+                raise WaitStateException(
+                    "Waited too long for operation: {0} to complete. It's"
+                    " still in status: {1}".format(operation['name'],
+                                                   result['status']))
+            time.sleep(min(next(delays), max(end_time - time.time(), 0)))
+
+    def _region_config(self, region_name):
+        config = super(GCECloudProvider, self)._region_config(region_name)
+        # The default zone must be within the region
+        region = self.compute.regions.get(region_name)
+        zones = region.zones if region else None
+        if zones:
+            config['gce_default_zone'] = zones[0].name
+        return config
 
     def parse_url(self, url):
         out = self._compute_resources.parse_url(url)
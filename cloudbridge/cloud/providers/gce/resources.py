@@ -42,6 +42,7 @@ from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.interfaces.resources import BulkResult
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
 from cloudbridge.cloud.interfaces.resources import MachineImageState
@@ -81,6 +82,7 @@ class GCEKeyPair(BaseKeyPair):
     def name(self):
         return self._key_pair.name
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._provider.security.key_pairs.delete(self.id)
 
@@ -475,6 +477,7 @@ class GCEVMFirewall(BaseVMFirewall):
         return helpers.get_metadata_item_value(self._provider, tag_name)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         self.assert_valid_resource_label(value)
         tag_name = "_".join(["firewall", self.name, "label"])
@@ -507,6 +510,7 @@ class GCEVMFirewall(BaseVMFirewall):
     def rules(self):
         return self._rule_container
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         for rule in self._rule_container:
             rule.delete()
@@ -708,6 +712,7 @@ class GCEVMFirewallRule(BaseVMFirewallRule):
             return False
         return True
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         if (self.is_dummy_rule()):
             return
@@ -761,6 +766,7 @@ class GCEMachineImage(BaseMachineImage):
         return labels.get('cblabel', '') if labels else ''
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         req = (self._provider
@@ -791,6 +797,7 @@ class GCEMachineImage(BaseMachineImage):
         """
         return int(math.ceil(float(self._gce_image.get('diskSizeGb'))))
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this image
@@ -868,6 +875,7 @@ class GCEInstance(BaseInstance):
         return labels.get('cblabel', '') if labels else ''
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         req = (self._provider
@@ -964,6 +972,7 @@ class GCEInstance(BaseInstance):
                     instance=self.name)
              .execute())
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Permanently terminate this instance.
@@ -1069,6 +1078,7 @@ class GCEInstance(BaseInstance):
         self._inet_gateway = network.gateways.get_or_create_inet_gateway()
         return self._inet_gateway
 
+    @cb_helpers.invalidates_cache(service_name='images')
     def create_image(self, label):
         """
         Create a new image based on this instance.
@@ -1308,6 +1318,20 @@ class GCEInstance(BaseInstance):
             # instance no longer exists
             self._gce_instance['status'] = InstanceState.UNKNOWN
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        provider = resources[0]._provider
+        latest = {item['selfLink']: item for item in helpers.iter_aggregated(
+            provider.gce_compute.instances(), 'instances',
+            project=provider.project_name)}
+        # pylint:disable=protected-access
+        for inst in resources:
+            if inst.id in latest:
+                inst._gce_instance = latest[inst.id]
+            else:
+                # instance no longer exists
+                inst._gce_instance['status'] = InstanceState.UNKNOWN
+
     def add_vm_firewall(self, sg):
         tag = sg.name if isinstance(sg, GCEVMFirewall) else sg
         tags = self._gce_instance.get('tags', {}).get('items', [])
@@ -1362,6 +1386,7 @@ class GCENetwork(BaseNetwork):
         return helpers.get_metadata_item_value(self._provider, tag_name)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         self.assert_valid_resource_label(value)
         tag_name = "_".join(["network", self.name, "label"])
@@ -1395,6 +1420,7 @@ class GCENetwork(BaseNetwork):
     def subnets(self):
         return list(self._provider.networking.subnets.iter(network=self))
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._provider.networking.networks.delete(self)
 
@@ -1495,6 +1521,7 @@ class GCEFloatingIP(BaseFloatingIP):
     def in_use(self):
         return True if self._target_instance else False
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         project_name = self._provider.project_name
         # First, delete the forwarding rule, if there is any.
@@ -1573,6 +1600,7 @@ class GCERouter(BaseRouter):
         return helpers.get_metadata_item_value(self._provider, tag_name)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         self.assert_valid_resource_label(value)
         tag_name = "_".join(["router", self.name, "label"])
@@ -1612,6 +1640,7 @@ class GCERouter(BaseRouter):
         network = self._provider.networking.networks.get(self.network_id)
         return network.subnets
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         operation = (self._provider
                      .gce_compute
@@ -1729,6 +1758,7 @@ class GCESubnet(BaseSubnet):
         return helpers.get_metadata_item_value(self._provider, tag_name)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         self.assert_valid_resource_label(value)
         tag_name = "_".join(["subnet", self.name, "label"])
@@ -1759,6 +1789,7 @@ class GCESubnet(BaseSubnet):
     def zone(self):
         return None
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         return self._provider.networking.subnets.delete(self)
 
@@ -1808,6 +1839,7 @@ class GCEVolume(BaseVolume):
         return labels.get('cblabel', '') if labels else ''
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):
         req = (self._provider
                    .gce_compute
@@ -1944,6 +1976,7 @@ class GCEVolume(BaseVolume):
         return self._provider.storage.snapshots.create(
             label, self, description)
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this volume.
@@ -1976,6 +2009,20 @@ class GCEVolume(BaseVolume):
             # volume no longer exists
             self._volume['status'] = VolumeState.UNKNOWN
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        provider = resources[0]._provider
+        latest = {item['selfLink']: item for item in helpers.iter_aggregated(
+            provider.gce_compute.disks(), 'disks',
+            project=provider.project_name)}
+        # pylint:disable=protected-access
+        for vol in resources:
+            if vol.id in latest:
+                vol._volume = latest[vol.id]
+            else:
+                # volume no longer exists
+                vol._volume['status'] = VolumeState.UNKNOWN
+
 
 class GCESnapshot(BaseSnapshot):
 
@@ -2005,6 +2052,7 @@ class GCESnapshot(BaseSnapshot):
         return labels.get('cblabel', '') if labels else ''
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         req = (self._provider
@@ -2064,6 +2112,20 @@ class GCESnapshot(BaseSnapshot):
             # snapshot no longer exists
             self._snapshot['status'] = SnapshotState.UNKNOWN
 
+    @classmethod
+    def _refresh_all(cls, resources):
+        provider = resources[0]._provider
+        latest = {item['selfLink']: item for item in helpers.iter_all(
+            provider.gce_compute.snapshots(), project=provider.project_name)}
+        # pylint:disable=protected-access
+        for snap in resources:
+            if snap.id in latest:
+                snap._snapshot = latest[snap.id]
+            else:
+                # snapshot no longer exists
+                snap._snapshot['status'] = SnapshotState.UNKNOWN
+
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this snapshot.
@@ -2134,15 +2196,28 @@ class GCSObject(BaseBucketObject):
     def last_modified(self):
         return self._obj['updated']
 
-    def iter_content(self):
-        return io.BytesIO(self._provider
-                              .gcs_storage
-                              .objects()
-                              .get_media(bucket=self._obj['bucket'],
-                                         object=self.name)
-                              .execute())
-
-    def upload(self, data):
+    def iter_content(self, chunk_size=None):
+        return cb_helpers.ChunkedStream(
+            self._iter_chunks(chunk_size or self.DEFAULT_CHUNK_SIZE))
+
+    def _iter_chunks(self, chunk_size):
+        request = (self._provider
+                       .gcs_storage
+                       .objects()
+                       .get_media(bucket=self._obj['bucket'],
+                                  object=self.name))
+        buf = io.BytesIO()
+        # Each call to next_chunk() fetches one ranged chunk of the object
+        downloader = googleapiclient.http.MediaIoBaseDownload(
+            buf, request, chunksize=chunk_size)
+        done = False
+        while not done:
+            _, done = downloader.next_chunk()
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+
+    def upload(self, data, transfer_config=None):
         """
         Set the contents of this object to the given text.
         """
@@ -2155,18 +2230,26 @@ class GCSObject(BaseBucketObject):
         if response:
             self._obj = response
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, transfer_config=None):
         """
-        Upload a binary file.
+        Upload a binary file. If a transfer config is given, the file is sent
+        in a resumable upload of ``part_size`` chunks. GCS does not accept
+        the chunks of a single upload in parallel.
         """
         with open(path, 'rb') as f:
-            media_body = googleapiclient.http.MediaIoBaseUpload(
-                    f, 'application/octet-stream')
+            if transfer_config:
+                media_body = googleapiclient.http.MediaIoBaseUpload(
+                    f, 'application/octet-stream',
+                    chunksize=transfer_config.part_size, resumable=True)
+            else:
+                media_body = googleapiclient.http.MediaIoBaseUpload(
+                        f, 'application/octet-stream')
             response = self._bucket.create_object_with_media_body(self.name,
                                                                   media_body)
             if response:
                 self._obj = response
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         (self._provider
              .gcs_storage
@@ -2198,9 +2281,33 @@ class GCSObject(BaseBucketObject):
 
 class GCSBucketContainer(BaseBucketContainer):
 
+    DELETE_BATCH_SIZE = helpers.MAX_STORAGE_BATCH_REQUESTS
+
     def __init__(self, provider, bucket):
         super(GCSBucketContainer, self).__init__(provider, bucket)
 
+    def _delete_batch(self, keys):
+        # Each worker thread has its own connection, as they are not
+        # thread-safe
+        objects = self._provider.gcs_storage.objects()
+        responses = helpers.execute_batch(
+            self._provider.gcs_storage,
+            [objects.delete(bucket=self.bucket.name, object=key)
+             for key in keys],
+            batch_size=self.DELETE_BATCH_SIZE)
+        results = []
+        for key, (_, exception) in zip(keys, responses):
+            if (isinstance(exception, googleapiclient.errors.HttpError) and
+                    exception.resp.status == 404):
+                exception = None
+            results.append(BulkResult(key, error=exception))
+        return results
+
+    def _iter_keys(self):
+        return (obj['name'] for obj in helpers.iter_all(
+            self._provider.gcs_storage.objects(), bucket=self.bucket.name,
+            fields='items/name,nextPageToken'))
+
     def get(self, name):
         """
         Retrieve a given object from this bucket.
@@ -2265,10 +2372,14 @@ class GCSBucket(BaseBucket):
     def objects(self):
         return self._object_container
 
-    def delete(self, delete_contents=False):
+    @cb_helpers.invalidates_cache
+    def delete(self, delete_contents=False, progress=None):
         """
         Delete this bucket.
         """
+        if delete_contents:
+            # pylint:disable=protected-access
+            self.objects._purge(progress)
         (self._provider
              .gcs_storage
              .buckets()
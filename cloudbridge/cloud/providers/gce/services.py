@@ -27,9 +27,11 @@ from cloudbridge.cloud.base.services import BaseVMFirewallService
 from cloudbridge.cloud.base.services import BaseVMTypeService
 from cloudbridge.cloud.base.services import BaseVolumeService
 from cloudbridge.cloud.interfaces.exceptions import DuplicateResourceException
+from cloudbridge.cloud.interfaces.resources import BulkResult
 from cloudbridge.cloud.interfaces.resources import TrafficDirection
 from cloudbridge.cloud.interfaces.resources import VMFirewall
 from cloudbridge.cloud.providers.gce import helpers
+from cloudbridge.cloud.providers.gce import image_catalog
 
 from .resources import GCEFirewallsDelegate
 from .resources import GCEInstance
@@ -155,13 +157,30 @@ class GCEVMFirewallService(BaseVMFirewallService):
         network = self.provider.networking.networks.get(network_name)
         return GCEVMFirewall(self._delegate, tag, network)
 
+    def _get_networks(self, network_names):
+        """
+        Returns a dict of the networks with the given names, fetched with a
+        single request. Networks which do not exist are omitted.
+        """
+        names = sorted(set(network_names))
+        if len(names) < 2:
+            networks = [self.provider.networking.networks.get(name)
+                        for name in names]
+        else:
+            name_filter = ' OR '.join('(name = "{0}")'.format(name)
+                                      for name in names)
+            # There is at most one network with a given name
+            networks = self.provider.networking.networks.list(
+                limit=len(names), filter=name_filter)
+        return {network.name: network for network in networks if network}
+
     def list(self, limit=None, marker=None):
-        vm_firewalls = []
-        for tag, network_name in self._delegate.tag_networks:
-            network = self.provider.networking.networks.get(
-                    network_name)
-            vm_firewall = GCEVMFirewall(self._delegate, tag, network)
-            vm_firewalls.append(vm_firewall)
+        tag_networks = self._delegate.tag_networks
+        networks = self._get_networks(
+            network_name for _, network_name in tag_networks)
+        vm_firewalls = [GCEVMFirewall(self._delegate, tag,
+                                      networks.get(network_name))
+                        for tag, network_name in tag_networks]
         return ClientPagedResultList(self.provider, vm_firewalls,
                                      limit=limit, marker=marker)
 
@@ -186,16 +205,14 @@ class GCEVMFirewallService(BaseVMFirewallService):
         Finds non-empty VM firewalls by network name and VM firewall names
         (tags). If no matching VM firewall is found, an empty list is returned.
         """
-        vm_firewalls = []
-        for tag, net_name in self._delegate.tag_networks:
-            if network_name != net_name:
-                continue
-            if tag not in tags:
-                continue
-            network = self.provider.networking.networks.get(net_name)
-            vm_firewalls.append(
-                GCEVMFirewall(self._delegate, tag, network))
-        return vm_firewalls
+        matches = [tag for tag, net_name in self._delegate.tag_networks
+                   if net_name == network_name and tag in tags]
+        if not matches:
+            return []
+        # All matches share the same network
+        network = self.provider.networking.networks.get(network_name)
+        return [GCEVMFirewall(self._delegate, tag, network)
+                for tag in matches]
 
 
 class GCEVMTypeService(BaseVMTypeService):
@@ -217,21 +234,6 @@ class GCEVMTypeService(BaseVMTypeService):
         vm_type = self.provider.get_resource('machineTypes', vm_type_id)
         return GCEVMType(self.provider, vm_type) if vm_type else None
 
-    def find(self, **kwargs):
-        matched_inst_types = []
-        for inst_type in self.instance_data:
-            is_match = True
-            for key, value in kwargs.items():
-                if key not in inst_type:
-                    raise TypeError("The attribute key is not valid.")
-                if inst_type.get(key) != value:
-                    is_match = False
-                    break
-            if is_match:
-                matched_inst_types.append(
-                    GCEVMType(self.provider, inst_type))
-        return matched_inst_types
-
     def list(self, limit=None, marker=None):
         inst_types = [GCEVMType(self.provider, inst_type)
                       for inst_type in self.instance_data]
@@ -276,20 +278,37 @@ class GCEImageService(BaseImageService):
 
     def __init__(self, provider):
         super(GCEImageService, self).__init__(provider)
-        self._public_images = None
+        self._catalog = None
 
     _PUBLIC_IMAGE_PROJECTS = ['centos-cloud', 'coreos-cloud', 'debian-cloud',
                               'opensuse-cloud', 'ubuntu-os-cloud']
 
-    def _retrieve_public_images(self):
-        if self._public_images is not None:
-            return
-        self._public_images = []
-        for project in GCEImageService._PUBLIC_IMAGE_PROJECTS:
+    @property
+    def public_images(self):
+        """
+        The persistent catalogue of public images, refreshed if it is out of
+        date. Its location can be set with the ``gce_image_catalog_path``
+        config value or the ``GCE_IMAGE_CATALOG_PATH`` environment variable.
+
+        :rtype: :class:`.GCEImageCatalog`
+        """
+        if self._catalog is None:
+            self._catalog = image_catalog.GCEImageCatalog(
+                self.provider._get_config_value(
+                    'gce_image_catalog_path',
+                    cb_helpers.get_env('GCE_IMAGE_CATALOG_PATH',
+                                       image_catalog.default_path())))
+        self._catalog.refresh(self.provider.gce_compute.images(),
+                              GCEImageService._PUBLIC_IMAGE_PROJECTS)
+        return self._catalog
+
+    def _iter_project_images(self, **kwargs):
+        if (self.provider.project_name not in
+                GCEImageService._PUBLIC_IMAGE_PROJECTS):
             for image in helpers.iter_all(
-                    self.provider.gce_compute.images(), project=project):
-                self._public_images.append(
-                    GCEMachineImage(self.provider, image))
+                    self.provider.gce_compute.images(),
+                    project=self.provider.project_name, **kwargs):
+                yield GCEMachineImage(self.provider, image)
 
     def get(self, image_id):
         """
@@ -298,19 +317,24 @@ class GCEImageService(BaseImageService):
         image = self.provider.get_resource('images', image_id)
         if image:
             return GCEMachineImage(self.provider, image)
-        self._retrieve_public_images()
-        for public_image in self._public_images:
-            if public_image.id == image_id or public_image.name == image_id:
-                return public_image
+        public_image = self.public_images.get(image_id)
+        if public_image:
+            return GCEMachineImage(self.provider, public_image)
         return None
 
     def find(self, label, limit=None, marker=None):
         """
         Searches for an image by a given list of attributes
         """
-        filters = {'label': label}
-        # Retrieve all available images by setting limit to sys.maxsize
-        images = [image for image in self if image.label == filters['label']]
+        if label:
+            # Filter the project's images on the server
+            images = list(self._iter_project_images(
+                filter='labels.cblabel = "{0}"'.format(label)))
+        else:
+            images = [image for image in self._iter_project_images()
+                      if image.label == label]
+        images.extend(GCEMachineImage(self.provider, image)
+                      for image in self.public_images.find(label=label))
         return ClientPagedResultList(self.provider, images,
                                      limit=limit, marker=marker)
 
@@ -318,15 +342,9 @@ class GCEImageService(BaseImageService):
         """
         List all images.
         """
-        self._retrieve_public_images()
-        images = []
-        if (self.provider.project_name not in
-                GCEImageService._PUBLIC_IMAGE_PROJECTS):
-            for image in helpers.iter_all(
-                    self.provider.gce_compute.images(),
-                    project=self.provider.project_name):
-                images.append(GCEMachineImage(self.provider, image))
-        images.extend(self._public_images)
+        images = list(self._iter_project_images())
+        images.extend(GCEMachineImage(self.provider, image)
+                      for image in self.public_images.list())
         return ClientPagedResultList(self.provider, images,
                                      limit=limit, marker=marker)
 
@@ -338,10 +356,100 @@ class GCEInstanceService(BaseInstanceService):
 
     def create(self, label, image, vm_type, subnet, zone=None,
                key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None, **kwargs):
+               launch_config=None, tags=None, **kwargs):
         """
         Creates a new virtual machine instance.
         """
+        zone_name, config = self._instance_config(
+            label, image, vm_type, subnet, zone, key_pair, vm_firewalls,
+            user_data, launch_config, tags)
+        if not config:
+            return None
+        operation = (self.provider
+                         .gce_compute.instances()
+                         .insert(project=self.provider.project_name,
+                                 zone=zone_name,
+                                 body=config)
+                         .execute())
+        instance_id = operation.get('targetLink')
+        self.provider.wait_for_operation(operation, zone=zone_name)
+        cb_inst = self.get(instance_id)
+        return cb_inst
+
+    def create_many(self, count, label, image, vm_type, subnet, zone=None,
+                    key_pair=None, vm_firewalls=None, user_data=None,
+                    launch_config=None, tags=None, **kwargs):
+        """
+        Sends the insert requests for all instances in HTTP batch requests,
+        then waits for the resulting operations.
+        """
+        # Resolve the shared launch options once, rather than per instance
+        if zone and not isinstance(zone, GCEPlacementZone):
+            zone = GCEPlacementZone(self.provider,
+                                    self.provider.get_resource('zones', zone))
+        if not isinstance(vm_type, GCEVMType):
+            vm_type = self.provider.compute.vm_types.get(vm_type)
+        if image and not isinstance(image, GCEMachineImage):
+            image = self.provider.compute.images.get(image)
+        if key_pair and not isinstance(key_pair, GCEKeyPair):
+            key_pair = self.provider.security.key_pairs.get(key_pair)
+
+        instances = self.provider.gce_compute.instances()
+        zone_name = None
+        requests = []
+        for _ in range(count):
+            zone_name, config = self._instance_config(
+                label, image, vm_type, subnet, zone, key_pair, vm_firewalls,
+                user_data, launch_config, tags)
+            if not config:
+                return [BulkResult(error=ValueError(
+                    'No boot disk is given for the instances.'))
+                    for _ in range(count)]
+            requests.append(instances.insert(
+                project=self.provider.project_name, zone=zone_name,
+                body=config))
+
+        results = []
+        for operation, error in helpers.execute_batch(
+                self.provider.gce_compute, requests):
+            if error:
+                results.append(BulkResult(error=error))
+                continue
+            try:
+                self.provider.wait_for_operation(operation, zone=zone_name)
+                results.append(BulkResult(
+                    resource=self.get(operation.get('targetLink'))))
+            except Exception as e:
+                results.append(BulkResult(error=e))
+        return results
+
+    def delete_many(self, instance_ids):
+        """
+        Sends the delete requests for all instances in HTTP batch requests.
+        """
+        instances = self.provider.gce_compute.instances()
+        requests = []
+        for instance_id in instance_ids:
+            # pylint:disable=protected-access
+            url = self.provider._compute_resources.\
+                get_resource_url_with_default('instances', instance_id)
+            requests.append(instances.delete(**url.parameters))
+        results = []
+        for instance_id, (_, error) in zip(
+                instance_ids, helpers.execute_batch(
+                    self.provider.gce_compute, requests)):
+            if (isinstance(error, googleapiclient.errors.HttpError) and
+                    error.resp.status == 404):
+                error = None
+            results.append(BulkResult(instance_id, error=error))
+        return results
+
+    def _instance_config(self, label, image, vm_type, subnet, zone, key_pair,
+                         vm_firewalls, user_data, launch_config, tags=None):
+        """
+        Returns the zone name and request body for creating an instance.
+        The body is ``None`` if no boot disk is given.
+        """
         GCEInstance.assert_valid_resource_name(label)
         zone_name = self.provider.default_zone
         if zone:
@@ -427,7 +535,7 @@ class GCEInstanceService(BaseInstanceService):
 
         if not boot_disk:
             cb.log.warning('No boot disk is given for instance %s.', label)
-            return None
+            return zone_name, None
         # The boot disk must be the first disk attached to the instance.
         disks.insert(0, boot_disk)
 
@@ -472,18 +580,8 @@ class GCEInstanceService(BaseInstanceService):
                 else:
                     config['metadata'] = {'items': [kp_entry]}
 
-        config['labels'] = {'cblabel': label}
-
-        operation = (self.provider
-                         .gce_compute.instances()
-                         .insert(project=self.provider.project_name,
-                                 zone=zone_name,
-                                 body=config)
-                         .execute())
-        instance_id = operation.get('targetLink')
-        self.provider.wait_for_operation(operation, zone=zone_name)
-        cb_inst = self.get(instance_id)
-        return cb_inst
+        config['labels'] = dict(tags or {}, cblabel=label)
+        return zone_name, config
 
     def get(self, instance_id):
         """
@@ -594,11 +692,16 @@ class GCENetworkService(BaseNetworkService):
     def find(self, limit=None, marker=None, **kwargs):
         """
         GCE networks are global. There is at most one network with a given
-        name.
+        name, which is fetched directly rather than listing all networks.
         """
-        obj_list = self
-        filters = ['name', 'label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
+        query = cb_helpers.Query(kwargs, supported=['name', 'label'])
+        name = query.literal('name')
+        if name:
+            network = self.get(name)
+            obj_list = [network] if network else []
+        else:
+            obj_list = self
+        matches = query.filter(obj_list)
         return ClientPagedResultList(self._provider, list(matches))
 
     def list(self, limit=None, marker=None, filter=None):
@@ -1000,7 +1103,8 @@ class GCEVolumeService(BaseVolumeService):
                                      response.get('nextPageToken'),
                                      False, data=gce_vols)
 
-    def create(self, label, size, zone, snapshot=None, description=None):
+    def create(self, label, size, zone, snapshot=None, description=None,
+               tags=None):
         """
         Creates a new volume.
 
@@ -1030,7 +1134,7 @@ class GCEVolumeService(BaseVolumeService):
             'type': 'zones/{0}/diskTypes/{1}'.format(zone_name, 'pd-standard'),
             'sourceSnapshot': snapshot_id,
             'description': description,
-            'labels': {'cblabel': label}
+            'labels': dict(tags or {}, cblabel=label)
         }
         operation = (self.provider
                          .gce_compute
@@ -1100,7 +1204,7 @@ class GCESnapshotService(BaseSnapshotService):
                                      response.get('nextPageToken'),
                                      False, data=snapshots)
 
-    def create(self, label, volume, description=None):
+    def create(self, label, volume, description=None, tags=None):
         """
         Creates a new snapshot of a given volume.
         """
@@ -1110,7 +1214,7 @@ class GCESnapshotService(BaseSnapshotService):
         snapshot_body = {
             "name": name,
             "description": description,
-            "labels": {'cblabel': label}
+            "labels": dict(tags or {}, cblabel=label)
         }
         operation = (self.provider
                          .gce_compute
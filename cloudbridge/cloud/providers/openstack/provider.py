@@ -15,9 +15,12 @@ from novaclient import shell as nova_shell
 
 from openstack import connection
 
+import requests
+
 from swiftclient import client as swift_client
 
 from cloudbridge.cloud.base import BaseCloudProvider
+from cloudbridge.cloud.base.client_pool import credentials_digest
 from cloudbridge.cloud.base.helpers import get_env
 
 from .services import OpenStackComputeService
@@ -30,6 +33,7 @@ class OpenStackCloudProvider(BaseCloudProvider):
     """OpenStack provider implementation."""
 
     PROVIDER_ID = 'openstack'
+    REGION_CONFIG_KEY = 'os_region_name'
 
     def __init__(self, config):
         super(OpenStackCloudProvider, self).__init__(config)
@@ -53,18 +57,6 @@ class OpenStackCloudProvider(BaseCloudProvider):
             'os_user_domain_name',
             get_env('OS_USER_DOMAIN_NAME', None))
 
-        # Service connections, lazily initialized
-        self._nova = None
-        self._keystone = None
-        self._glance = None
-        self._cinder = None
-        self._swift = None
-        self._neutron = None
-        self._os_conn = None
-
-        # Additional cached variables
-        self._cached_keystone_session = None
-
         # Initialize provider services
         self._compute = OpenStackComputeService(self)
         self._networking = OpenStackNetworkingService(self)
@@ -73,15 +65,13 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     @property
     def nova(self):
-        if not self._nova:
-            self._nova = self._connect_nova()
-        return self._nova
+        # novaclient keeps per-request state, such as the last request ID
+        return self._get_connection('nova', self._connect_nova,
+                                    per_thread=True)
 
     @property
     def keystone(self):
-        if not self._keystone:
-            self._keystone = self._connect_keystone()
-        return self._keystone
+        return self._get_connection('keystone', self._connect_keystone)
 
     @property
     def _keystone_version(self):
@@ -101,12 +91,22 @@ class OpenStackCloudProvider(BaseCloudProvider):
         """
         Connect to Keystone and return a session object.
 
+        Sessions are thread-safe and are drawn from the client pool, so that
+        providers using the same credentials share their authentication
+        token and HTTP connections. All clients, other than Swift clients
+        using a pre-authenticated token, use this session.
+
         :rtype: :class:`keystoneauth1.session.Session`
         :return: A Keystone session object.
         """
-        if self._cached_keystone_session:
-            return self._cached_keystone_session
-
+        key = ('openstack', 'keystone', credentials_digest(
+            self.auth_url, self.username, self.password, self.project_name,
+            self.project_domain_name, self.user_domain_name))
+        return self._get_connection(
+            'keystone_session',
+            lambda: self.client_pool.get(key, self._connect_keystone_session))
+
+    def _connect_keystone_session(self):
         if self._keystone_version == 3:
             from keystoneauth1.identity import v3
             auth = v3.Password(auth_url=self.auth_url,
@@ -115,14 +115,24 @@ class OpenStackCloudProvider(BaseCloudProvider):
                                user_domain_name=self.user_domain_name,
                                project_domain_name=self.project_domain_name,
                                project_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
         else:
             from keystoneauth1.identity import v2
             auth = v2.Password(self.auth_url, username=self.username,
                                password=self.password,
                                tenant_name=self.project_name)
-            self._cached_keystone_session = session.Session(auth=auth)
-        return self._cached_keystone_session
+        return session.Session(auth=auth, session=self._http_session())
+
+    def _http_session(self):
+        """
+        Create a requests session keeping up to ``connection_pool_max_size``
+        connections open to each host.
+        """
+        http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=self.config.connection_pool_max_size)
+        http.mount('https://', adapter)
+        http.mount('http://', adapter)
+        return http
 
     def _connect_openstack(self):
         return connection.Connection(
@@ -138,33 +148,25 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
 #     @property
 #     def glance(self):
-#         if not self._glance:
-#             self._glance = self._connect_glance()
-#         return self._glance
+#         return self._get_connection('glance', self._connect_glance)
 
     @property
     def cinder(self):
-        if not self._cinder:
-            self._cinder = self._connect_cinder()
-        return self._cinder
+        return self._get_connection('cinder', self._connect_cinder)
 
     @property
     def swift(self):
-        if not self._swift:
-            self._swift = self._connect_swift()
-        return self._swift
+        # Swift connections are not thread-safe
+        return self._get_connection('swift', self._connect_swift,
+                                    per_thread=True)
 
     @property
     def neutron(self):
-        if not self._neutron:
-            self._neutron = self._connect_neutron()
-        return self._neutron
+        return self._get_connection('neutron', self._connect_neutron)
 
     @property
     def os_conn(self):
-        if not self._os_conn:
-            self._os_conn = self._connect_openstack()
-        return self._os_conn
+        return self._get_connection('os_conn', self._connect_openstack)
 
     @property
     def compute(self):
@@ -187,9 +189,6 @@ class OpenStackCloudProvider(BaseCloudProvider):
 
     def _connect_nova_region(self, region_name):
         """Get an OpenStack Nova (compute) client object."""
-        # Force reauthentication with Keystone
-        self._cached_keystone_session = None
-
         api_version = self._get_config_value(
             'os_compute_api_version',
             get_env('OS_COMPUTE_API_VERSION', 2))
@@ -294,6 +293,9 @@ class OpenStackCloudProvider(BaseCloudProvider):
         """
         Get an OpenStack Swift (object store) client connection.
 
+        Swift connections are not thread-safe, so they are pooled per thread
+        and shared with providers using the same credentials and options.
+
         :param options: A dictionary of options from which values will be
             passed to the connection.
         :return: A Swift client connection using the auth credentials held by
@@ -308,10 +310,15 @@ class OpenStackCloudProvider(BaseCloudProvider):
         if storage_url and auth_token:
             clean_options['preauthurl'] = storage_url
             clean_options['preauthtoken'] = auth_token
+            key = ('openstack', 'swift', credentials_digest(clean_options))
         else:
             clean_options['authurl'] = self.auth_url
             clean_options['session'] = self._keystone_session
-        return swift_client.Connection(**clean_options)
+            key = ('openstack', 'swift', credentials_digest(
+                clean_options, id(clean_options['session'])))
+        return self.client_pool.get(
+            key, lambda: swift_client.Connection(**clean_options),
+            per_thread=True)
 
     def _connect_neutron(self):
         """Get an OpenStack Neutron (networking) client object cloud."""
@@ -6,14 +6,17 @@ import ipaddress
 import logging
 import os
 try:
+    from urllib.parse import unquote
     from urllib.parse import urlparse
     from urllib.parse import urljoin
 except ImportError:  # python 2
+    from urllib import unquote
     from urlparse import urlparse
     from urlparse import urljoin
 
 from keystoneclient.v3.regions import Region
 
+from neutronclient.common.exceptions import NotFound as NeutronNotFound
 from neutronclient.common.exceptions import PortNotFoundClient
 
 import novaclient.exceptions as novaex
@@ -51,6 +54,8 @@ from cloudbridge.cloud.base.resources import BaseVMType
 from cloudbridge.cloud.base.resources import BaseVolume
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
+from cloudbridge.cloud.interfaces.exceptions import ProviderInternalException
+from cloudbridge.cloud.interfaces.resources import BulkResult
 from cloudbridge.cloud.interfaces.resources import GatewayState
 from cloudbridge.cloud.interfaces.resources import InstanceState
 from cloudbridge.cloud.interfaces.resources import MachineImageState
@@ -111,6 +116,7 @@ class OpenStackMachineImage(BaseMachineImage):
         return self._os_image.name
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -138,6 +144,7 @@ class OpenStackMachineImage(BaseMachineImage):
         """
         return self._os_image.min_disk
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this image
@@ -312,6 +319,7 @@ class OpenStackInstance(BaseInstance):
         return self._os_instance.name
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -368,6 +376,7 @@ class OpenStackInstance(BaseInstance):
         """
         self._os_instance.reboot()
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Permanently delete this instance.
@@ -420,11 +429,11 @@ class OpenStackInstance(BaseInstance):
                     break
         # Now get a handle to a port with the given MAC address and get the
         # subnet to which the private IP is connected as the desired id.
-        for prt in self._provider.neutron.list_ports().get('ports'):
-            if prt.get('mac_address') == port:
-                for ip in prt.get('fixed_ips'):
-                    if ip.get('ip_address') == addr:
-                        return ip.get('subnet_id')
+        for prt in self._provider.neutron.list_ports(
+                mac_address=port).get('ports'):
+            for ip in prt.get('fixed_ips'):
+                if ip.get('ip_address') == addr:
+                    return ip.get('subnet_id')
 
     @property
     def vm_firewalls(self):
@@ -447,6 +456,7 @@ class OpenStackInstance(BaseInstance):
         """
         return self._os_instance.key_name
 
+    @cb_helpers.invalidates_cache(service_name='images')
     def create_image(self, label):
         """
         Create a new image based on this instance.
@@ -593,6 +603,7 @@ class OpenStackVolume(BaseVolume):
         return self._volume.name
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -665,6 +676,7 @@ class OpenStackVolume(BaseVolume):
         return self._provider.storage.snapshots.create(
             label, self, description=description)
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this volume.
@@ -723,6 +735,7 @@ class OpenStackSnapshot(BaseSnapshot):
         return self._snapshot.name
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         """
@@ -772,6 +785,7 @@ class OpenStackSnapshot(BaseSnapshot):
             # set the status to unknown
             self._snapshot.status = 'unknown'
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this snapshot.
@@ -869,6 +883,7 @@ class OpenStackNetwork(BaseNetwork):
         return self._network.get('name', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):  # pylint:disable=arguments-differ
         """
         Set the network label.
@@ -894,20 +909,24 @@ class OpenStackNetwork(BaseNetwork):
         # OpenStack does not define a CIDR block for networks
         return ''
 
+    @cb_helpers.invalidates_cache
     def delete(self):
-        if not self.external and self.id in str(
-                self._provider.neutron.list_networks()):
-            # If there are ports associated with the network, it won't delete
-            ports = self._provider.neutron.list_ports(
-                network_id=self.id).get('ports', [])
-            for port in ports:
-                try:
-                    self._provider.neutron.delete_port(port.get('id'))
-                except PortNotFoundClient:
-                    # Ports could have already been deleted if instances
-                    # are terminated etc. so exceptions can be safely ignored
-                    pass
+        if self.external:
+            return
+        # If there are ports associated with the network, it won't delete
+        ports = self._provider.neutron.list_ports(
+            network_id=self.id).get('ports', [])
+        for port in ports:
+            try:
+                self._provider.neutron.delete_port(port.get('id'))
+            except PortNotFoundClient:
+                # Ports could have already been deleted if instances
+                # are terminated etc. so exceptions can be safely ignored
+                pass
+        try:
             self._provider.neutron.delete_network(self.id)
+        except NeutronNotFound:
+            log.debug("Network %s was already deleted.", self.id)
 
     @property
     def subnets(self):
@@ -950,6 +969,7 @@ class OpenStackSubnet(BaseSubnet):
         return self._subnet.get('name', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):  # pylint:disable=arguments-differ
         """
         Set the subnet label.
@@ -976,9 +996,12 @@ class OpenStackSubnet(BaseSubnet):
         """
         return None
 
+    @cb_helpers.invalidates_cache
     def delete(self):
-        if self.id in str(self._provider.neutron.list_subnets()):
+        try:
             self._provider.neutron.delete_subnet(self.id)
+        except NeutronNotFound:
+            log.debug("Subnet %s was already deleted.", self.id)
 
     @property
     def state(self):
@@ -1045,6 +1068,7 @@ class OpenStackFloatingIP(BaseFloatingIP):
     def in_use(self):
         return bool(self._ip.port_id)
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._ip.delete(self._provider.os_conn.session)
 
@@ -1076,6 +1100,7 @@ class OpenStackRouter(BaseRouter):
         return self._router.get('name', None)
 
     @label.setter
+    @cb_helpers.invalidates_cache
     def label(self, value):  # pylint:disable=arguments-differ
         """
         Set the router label.
@@ -1101,6 +1126,7 @@ class OpenStackRouter(BaseRouter):
                 'network_id', None)
         return None
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._provider.neutron.delete_router(self.id)
 
@@ -1257,6 +1283,7 @@ class OpenStackVMFirewall(BaseVMFirewall):
         return self._vm_firewall.name
 
     @label.setter
+    @cb_helpers.invalidates_cache
     # pylint:disable=arguments-differ
     def label(self, value):
         self.assert_valid_resource_label(value)
@@ -1268,6 +1295,7 @@ class OpenStackVMFirewall(BaseVMFirewall):
     def rules(self):
         return self._rule_svc
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         return self._vm_firewall.delete(self._provider.os_conn.session)
 
@@ -1381,6 +1409,7 @@ class OpenStackVMFirewallRule(BaseVMFirewallRule):
             return self._provider.security.vm_firewalls.get(fw_id)
         return None
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         self._provider.os_conn.network.delete_security_group_rule(self.id)
         self.firewall.refresh()
@@ -1410,13 +1439,14 @@ class OpenStackBucketObject(BaseBucketObject):
     def last_modified(self):
         return self._obj.get("last_modified")
 
-    def iter_content(self):
+    def iter_content(self, chunk_size=None):
         """Returns this object's content as an iterable."""
         _, content = self._provider.swift.get_object(
-            self.cbcontainer.name, self.name, resp_chunk_size=65536)
+            self.cbcontainer.name, self.name,
+            resp_chunk_size=chunk_size or self.DEFAULT_CHUNK_SIZE)
         return content
 
-    def upload(self, data):
+    def upload(self, data, transfer_config=None):
         """
         Set the contents of this object to the data read from the source
         string.
@@ -1426,19 +1456,24 @@ class OpenStackBucketObject(BaseBucketObject):
         self._provider.swift.put_object(self.cbcontainer.name, self.name,
                                         data)
 
-    def upload_from_file(self, path):
+    def upload_from_file(self, path, transfer_config=None):
         """
         Stores the contents of the file pointed by the ``path`` variable.
-        If the file is bigger than 5 Gig, it will be broken into segments.
+        If the file is bigger than 5 Gig, or than the ``part_size`` of the
+        given ``transfer_config``, it will be broken into segments which are
+        uploaded concurrently.
 
         :type path: ``str``
         :param path: Absolute path to the file to be uploaded to Swift.
+
+        :type transfer_config: :class:`.TransferConfig`
+        :param transfer_config: Segment size and number of upload threads.
         :rtype: ``bool``
         :return: ``True`` if successful, ``False`` if not.
 
         .. note::
-            * The size of the segments chosen (or any of the other upload
-              options) is not under user control.
+            * Only the segment size and number of threads are under user
+              control, through ``transfer_config``.
             * If called this method will remap the
               ``swiftclient.service.get_conn`` factory method to
               ``self._provider._connect_swift``
@@ -1446,6 +1481,12 @@ class OpenStackBucketObject(BaseBucketObject):
         .. seealso:: https://github.com/CloudVE/cloudbridge/issues/35#issuecomment-297629661 # noqa
         """
         upload_options = {}
+        service_options = {}
+        if transfer_config:
+            if os.path.getsize(path) > transfer_config.part_size:
+                upload_options['segment_size'] = min(
+                    transfer_config.part_size, FIVE_GIG)
+            service_options['segment_threads'] = transfer_config.concurrency
         if 'segment_size' not in upload_options:
             if os.path.getsize(path) >= FIVE_GIG:
                 upload_options['segment_size'] = FIVE_GIG
@@ -1455,7 +1496,7 @@ class OpenStackBucketObject(BaseBucketObject):
         swiftclient.service.get_conn = self._provider._connect_swift
 
         result = True
-        with SwiftService() as swift:
+        with SwiftService(options=service_options) as swift:
             upload_object = SwiftUploadObject(path, object_name=self.name)
             for up_res in swift.upload(self.cbcontainer.name,
                                        [upload_object, ],
@@ -1463,6 +1504,7 @@ class OpenStackBucketObject(BaseBucketObject):
                 result = result and up_res['success']
         return result
 
+    @cb_helpers.invalidates_cache
     def delete(self):
         """
         Delete this object.
@@ -1519,15 +1561,47 @@ class OpenStackBucket(BaseBucket):
     def objects(self):
         return self._object_container
 
-    def delete(self, delete_contents=False):
+    @cb_helpers.invalidates_cache
+    def delete(self, delete_contents=False, progress=None):
+        if delete_contents:
+            # pylint:disable=protected-access
+            self.objects._purge(progress)
         self._provider.swift.delete_container(self.name)
 
 
 class OpenStackBucketContainer(BaseBucketContainer):
 
+    # SwiftService sends each batch as a single bulk delete request where
+    # the cluster supports it, or as one request per object otherwise
+    DELETE_BATCH_SIZE = 1000
+
     def __init__(self, provider, bucket):
         super(OpenStackBucketContainer, self).__init__(provider, bucket)
 
+    def _delete_batch(self, keys):
+        # remap the swift service's connection factory method
+        # pylint:disable=protected-access
+        swiftclient.service.get_conn = self._provider._connect_swift
+
+        errors = {}
+        # Batches are already sent concurrently, so each one uses a single
+        # thread
+        with SwiftService(options={'object_dd_threads': 1}) as swift:
+            for res in swift.delete(self.bucket.name, keys):
+                if res['action'] == 'bulk_delete':
+                    if not res['success']:
+                        errors.update((key, res['error'])
+                                      for key in res['objects'])
+                        continue
+                    for path, status in res['result'].get('Errors', []):
+                        key = unquote(path).split('/', 2)[-1]
+                        errors[key] = ProviderInternalException(
+                            "{0}: {1}".format(key, status))
+                elif not res['success'] and getattr(
+                        res.get('error'), 'http_status', None) != 404:
+                    errors[res['object']] = res['error']
+        return [BulkResult(key, error=errors.get(key)) for key in keys]
+
     def get(self, name):
         """
         Retrieve a given object from this bucket.
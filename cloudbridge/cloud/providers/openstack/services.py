@@ -5,7 +5,10 @@ import logging
 
 from cinderclient.exceptions import NotFound as CinderNotFound
 
+from keystoneclient.exceptions import NotFound as KeystoneNotFound
+
 from neutronclient.common.exceptions import NeutronClientException
+from neutronclient.common.exceptions import NotFound as NeutronNotFound
 
 from novaclient.exceptions import NotFound as NovaNotFound
 
@@ -313,13 +316,14 @@ class OpenStackVolumeService(BaseVolumeService):
 
         return oshelpers.to_server_paged_list(self.provider, cb_vols, limit)
 
-    def create(self, label, size, zone, snapshot=None, description=None):
+    def create(self, label, size, zone, snapshot=None, description=None,
+               tags=None):
         """
         Creates a new volume.
         """
         log.debug("Creating a new volume with the params: "
-                  "[label: %s size: %s zone: %s snapshot: %s description: %s]",
-                  label, size, zone, snapshot, description)
+                  "[label: %s size: %s zone: %s snapshot: %s description: %s "
+                  "tags: %s]", label, size, zone, snapshot, description, tags)
         OpenStackVolume.assert_valid_resource_label(label)
 
         zone_id = zone.id if isinstance(zone, PlacementZone) else zone
@@ -328,7 +332,8 @@ class OpenStackVolumeService(BaseVolumeService):
 
         os_vol = self.provider.cinder.volumes.create(
             size, name=label, description=description,
-            availability_zone=zone_id, snapshot_id=snapshot_id)
+            availability_zone=zone_id, snapshot_id=snapshot_id,
+            metadata=tags or None)
         return OpenStackVolume(self.provider, os_vol)
 
 
@@ -382,7 +387,7 @@ class OpenStackSnapshotService(BaseSnapshotService):
                              'marker': marker})]
         return oshelpers.to_server_paged_list(self.provider, cb_snaps, limit)
 
-    def create(self, label, volume, description=None):
+    def create(self, label, volume, description=None, tags=None):
         """
         Creates a new snapshot of a given volume.
         """
@@ -394,7 +399,7 @@ class OpenStackSnapshotService(BaseSnapshotService):
 
         os_snap = self.provider.cinder.volume_snapshots.create(
             volume_id, name=label,
-            description=description)
+            description=description, metadata=tags or None)
         return OpenStackSnapshot(self.provider, os_snap)
 
 
@@ -506,9 +511,21 @@ class OpenStackImageService(BaseImageService):
             return None
 
     def find(self, **kwargs):
-        filters = ['label']
-        obj_list = self
-        return cb_helpers.generic_find(filters, kwargs, obj_list)
+        query = cb_helpers.Query(kwargs, supported=['label'])
+        label = query.literal('label')
+        if not label:
+            # Patterns cannot be matched by Glance, so all images are
+            # fetched and filtered here
+            return query.filter(self)
+
+        log.debug("Searching for an OpenStack Image with the label %s", label)
+        project_id = self.provider.os_conn.session.get_project_id()
+        cb_images = [
+            OpenStackMachineImage(self.provider, img)
+            for img in self.provider.os_conn.image.images(
+                owner=project_id, name=label,
+                limit=oshelpers.os_result_limit(self.provider))]
+        return oshelpers.to_server_paged_list(self.provider, cb_images)
 
     def list(self, filter_by_owner=True, limit=None, marker=None):
         """
@@ -535,7 +552,7 @@ class OpenStackInstanceService(BaseInstanceService):
 
     def create(self, label, image, vm_type, subnet, zone,
                key_pair=None, vm_firewalls=None, user_data=None,
-               launch_config=None, **kwargs):
+               launch_config=None, tags=None, **kwargs):
         """Create a new virtual machine instance."""
         OpenStackInstance.assert_valid_resource_label(label)
 
@@ -613,7 +630,8 @@ class OpenStackInstanceService(BaseInstanceService):
             security_groups=sg_name_list,
             userdata=str(user_data) or None,
             block_device_mapping_v2=bdm,
-            nics=nics)
+            nics=nics,
+            meta=tags or None)
         return OpenStackInstance(self.provider, os_instance)
 
     def _to_block_device_mapping(self, launch_config):
@@ -731,6 +749,17 @@ class OpenStackRegionService(BaseRegionService):
 
     def get(self, region_id):
         log.debug("Getting OpenStack Region with the id: %s", region_id)
+        # pylint:disable=protected-access
+        if self.provider._keystone_version == 3:
+            try:
+                return OpenStackRegion(
+                    self.provider, self.provider.keystone.regions.get(
+                        region_id))
+            except KeystoneNotFound:
+                log.debug("Region %s was not found.", region_id)
+                return None
+        # Keystone v2 regions are read from the service catalog, which does
+        # not require any requests
         region = (r for r in self if r.id == region_id)
         return next(region, None)
 
@@ -790,8 +819,13 @@ class OpenStackNetworkService(BaseNetworkService):
 
     def get(self, network_id):
         log.debug("Getting OpenStack Network with the id: %s", network_id)
-        network = (n for n in self if n.id == network_id)
-        return next(network, None)
+        try:
+            return OpenStackNetwork(
+                self.provider,
+                self.provider.neutron.show_network(network_id).get('network'))
+        except NeutronNotFound:
+            log.debug("Network %s was not found.", network_id)
+            return None
 
     def list(self, limit=None, marker=None):
         networks = [OpenStackNetwork(self.provider, network)
@@ -834,18 +868,24 @@ class OpenStackSubnetService(BaseSubnetService):
 
     def get(self, subnet_id):
         log.debug("Getting OpenStack Subnet with the id: %s", subnet_id)
-        subnet = (s for s in self if s.id == subnet_id)
-        return next(subnet, None)
+        try:
+            return OpenStackSubnet(
+                self.provider,
+                self.provider.neutron.show_subnet(subnet_id).get('subnet'))
+        except NeutronNotFound:
+            log.debug("Subnet %s was not found.", subnet_id)
+            return None
 
     def list(self, network=None, limit=None, marker=None):
         if network:
             network_id = (network.id if isinstance(network, OpenStackNetwork)
                           else network)
-            subnets = [subnet for subnet in self if network_id ==
-                       subnet.network_id]
+            os_subnets = self.provider.neutron.list_subnets(
+                network_id=network_id)
         else:
-            subnets = [OpenStackSubnet(self.provider, subnet) for subnet in
-                       self.provider.neutron.list_subnets().get('subnets', [])]
+            os_subnets = self.provider.neutron.list_subnets()
+        subnets = [OpenStackSubnet(self.provider, subnet)
+                   for subnet in os_subnets.get('subnets', [])]
         return ClientPagedResultList(self.provider, subnets,
                                      limit=limit, marker=marker)
 
@@ -905,8 +945,13 @@ class OpenStackRouterService(BaseRouterService):
 
     def get(self, router_id):
         log.debug("Getting OpenStack Router with the id: %s", router_id)
-        router = (r for r in self if r.id == router_id)
-        return next(router, None)
+        try:
+            return OpenStackRouter(
+                self.provider,
+                self.provider.neutron.show_router(router_id).get('router'))
+        except NeutronNotFound:
+            log.debug("Router %s was not found.", router_id)
+            return None
 
     def list(self, limit=None, marker=None):
         routers = self.provider.neutron.list_routers().get('routers')
@@ -915,10 +960,15 @@ class OpenStackRouterService(BaseRouterService):
                                      marker=marker)
 
     def find(self, **kwargs):
-        obj_list = self
-        filters = ['label']
-        matches = cb_helpers.generic_find(filters, kwargs, obj_list)
-        return ClientPagedResultList(self._provider, list(matches))
+        query = cb_helpers.Query(kwargs, supported=['label'])
+        label = query.literal('label')
+        if label:
+            routers = [OpenStackRouter(self.provider, r) for r in
+                       self.provider.neutron.list_routers(name=label)
+                       .get('routers')]
+        else:
+            routers = query.filter(self)
+        return ClientPagedResultList(self._provider, list(routers))
 
     def create(self, label, network):
         """
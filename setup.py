@@ -22,7 +22,8 @@ REQS_BASE = [
     'six>=1.11',
     'tenacity>=4.12.0,<=5.0',
     'cachetools>=2.1.0',
-    'deprecated>=1.2.3'
+    'deprecated>=1.2.3',
+    'futures>=3.0.5; python_version < "3"'
 ]
 REQS_AWS = ['boto3>=1.9.86']
 # Install azure>=3.0.0 package to find which of the azure libraries listed
@@ -0,0 +1,92 @@
+import sys
+import threading
+import unittest
+
+from cloudbridge.cloud.interfaces import VolumeState
+
+from test import helpers
+from test.helpers import ProviderTestBase
+
+if sys.version_info >= (3, 7):
+    import asyncio
+
+    from cloudbridge.cloud.base.async_provider import AsyncCloudProvider
+    from cloudbridge.cloud.base.async_provider import AsyncProxy
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "requires Python 3.7")
+class AsyncProviderTestCase(ProviderTestBase):
+
+    _multiprocess_can_split_ = True
+
+    def setUp(self):
+        super(AsyncProviderTestCase, self).setUp()
+        self.async_provider = AsyncCloudProvider(self.provider,
+                                                 max_workers=2)
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+        self.async_provider.close()
+        super(AsyncProviderTestCase, self).tearDown()
+
+    def run_async(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_async_list_and_iter(self):
+        regions = self.run_async(
+            self.async_provider.compute.regions.list())
+        self.assertListEqual(
+            [r.delegate.id for r in regions],
+            [r.id for r in self.provider.compute.regions.list()])
+        self.assertTrue(all(isinstance(r, AsyncProxy) for r in regions))
+
+        # Async iteration goes through all pages
+        it = self.async_provider.compute.regions.__aiter__()
+        for region in self.provider.compute.regions:
+            self.assertEqual(self.run_async(it.__anext__()), region)
+        with self.assertRaises(StopAsyncIteration):  # noqa: F821
+            self.run_async(it.__anext__())
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_async_attributes(self):
+        region = self.provider.compute.regions.get(self.provider.region_name)
+        async_region = self.run_async(
+            self.async_provider.compute.regions.get(region.id))
+        threads = []
+
+        def read_name(region):
+            threads.append(threading.current_thread())
+            return region.name
+
+        # Properties are read on the executor, rather than by the loop
+        self.assertEqual(self.run_async(async_region.name), region.name)
+        self.assertEqual(
+            self.run_async(self.async_provider.run(read_name, async_region)),
+            region.name)
+        self.assertIsNot(threads[0], threading.current_thread())
+        zones = self.run_async(async_region.zones)
+        self.assertTrue(all(isinstance(z, AsyncProxy) for z in zones))
+        self.assertEqual(self.run_async(self.async_provider.region_name),
+                         self.provider.region_name)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_async_wait_till_ready(self):
+        label = "cb-asyncvol-{0}".format(helpers.get_uuid())
+        test_vol = None
+        with helpers.cleanup_action(lambda: test_vol.delete()):
+            async_vol = self.run_async(
+                self.async_provider.storage.volumes.create(
+                    label, 1, helpers.get_provider_test_data(
+                        self.provider, "placement")))
+            test_vol = async_vol.delegate
+            self.run_async(async_vol.wait_till_ready())
+            self.assertEqual(self.run_async(async_vol.state),
+                             VolumeState.AVAILABLE)
+            # Proxies are unwrapped when passed back to the provider
+            self.assertTrue(self.run_async(
+                self.async_provider.wait_for_all(
+                    [async_vol], [VolumeState.AVAILABLE])))
@@ -0,0 +1,218 @@
+"""Test Azure specific helpers, against fakes of the Azure SDK."""
+import threading
+import unittest
+
+from azure.mgmt.network.models import NetworkSecurityGroup
+from azure.mgmt.network.models import SecurityRule
+
+from msrestazure.azure_exceptions import CloudError
+
+from cloudbridge.cloud.interfaces.exceptions import InvalidValueException
+from cloudbridge.cloud.interfaces.exceptions import WaitStateException
+from cloudbridge.cloud.providers.azure.azure_client import AzureClient
+from cloudbridge.cloud.providers.azure.helpers import parse_url \
+    as azure_parse_url
+from cloudbridge.cloud.providers.azure.operations import AzureOperation
+from cloudbridge.cloud.providers.azure.operations import run_all
+from cloudbridge.cloud.providers.azure.operations import run_in_background
+
+
+class FakeAzurePoller(object):
+    """
+    Mimics an Azure SDK poller, whose operation completes once ``event``
+    is set.
+    """
+
+    def __init__(self, result=None, error=None, event=None):
+        self.event = event or threading.Event()
+        self._result = result
+        self._error = error
+
+    def done(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        self.event.wait(timeout)
+        if self.done() and self._error:
+            raise self._error
+
+    def result(self, timeout=None):
+        self.wait(timeout)
+        return self._result
+
+
+class FakeNetworkSecurityGroups(object):
+    """
+    Mimics the network security groups operations of the Azure SDK,
+    recording the updates made. Rules are returned in reverse order, with
+    their ids assigned.
+    """
+
+    def __init__(self, etag):
+        self.etag = etag
+        self.requests = []
+
+    def create_or_update(self, resource_group, name, parameters,
+                         custom_headers=None):
+        names = [rule.name for rule in parameters.security_rules]
+        self.requests.append((resource_group, name, names,
+                              dict(custom_headers or {})))
+        done = threading.Event()
+        done.set()
+        if (custom_headers or {}).get('If-Match') != self.etag:
+            error = CloudError.__new__(CloudError)
+            error.status_code = 412
+            return FakeAzurePoller(error=error, event=done)
+        rules = [SecurityRule(id='{0}/{1}'.format(name, rule.name),
+                              name=rule.name, protocol=rule.protocol,
+                              access=rule.access, direction=rule.direction,
+                              priority=rule.priority)
+                 for rule in reversed(parameters.security_rules)]
+        self.etag += '+'
+        return FakeAzurePoller(
+            NetworkSecurityGroup(security_rules=rules, etag=self.etag),
+            event=done)
+
+
+class FakeNetworkManagementClient(object):
+
+    def __init__(self, etag):
+        self.network_security_groups = FakeNetworkSecurityGroups(etag)
+
+
+def fake_azure_client(**clients):
+    """
+    Returns an AzureClient using the given fake SDK clients, without
+    authenticating.
+    """
+    client = AzureClient.__new__(AzureClient)
+    client._config = {'azure_resource_group': 'cb-rg'}
+    client._lock = threading.RLock()
+    for name, value in clients.items():
+        setattr(client, '_' + name, value)
+    return client
+
+
+class AzureProviderTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_azure_parse_url(self):
+        templates = ['/subscriptions/{subscriptionId}/resourceGroups/'
+                     '{resourceGroupName}/providers/Microsoft.Compute/'
+                     'images/{imageName}',
+                     '/subscriptions/{subscriptionId}/resourceGroups/'
+                     '{resourceGroupName}/providers/Microsoft.Compute/'
+                     'snapshots/{snapshotName}',
+                     '{imageName}',
+                     '{publisher}:{offer}:{sku}:{version}']
+        image_id = ('/subscriptions/sub/resourcegroups/rg/providers/'
+                    'Microsoft.Compute/images/my-image')
+        parsed = azure_parse_url(templates, image_id)
+        self.assertEqual(dict(parsed), {'subscriptionId': 'sub',
+                                        'resourceGroupName': 'rg',
+                                        'imageName': 'my-image'})
+        self.assertEqual(parsed.imageName, 'my-image')
+        self.assertEqual(parsed.template, templates[0])
+        # Templates are selected by their literal segments
+        snapshot = azure_parse_url(templates,
+                                   image_id.replace('images', 'snapshots'))
+        self.assertEqual(snapshot.get('snapshotName'), 'my-image')
+        self.assertNotIn('imageName', snapshot)
+        self.assertEqual(azure_parse_url(templates, 'my-image'),
+                         {'imageName': 'my-image'})
+        urn = azure_parse_url(templates, 'Canonical:UbuntuServer:16.04:1')
+        self.assertEqual((urn['offer'], urn.version),
+                         ('UbuntuServer', '1'))
+        # Parsed ids are immutable and cached
+        with self.assertRaises(AttributeError):
+            parsed.imageName = 'other'
+        with self.assertRaises(TypeError):
+            parsed['imageName'] = 'other'
+        self.assertIs(azure_parse_url(list(templates), image_id), parsed)
+        with self.assertRaises(InvalidValueException):
+            azure_parse_url(templates, 'a/b')
+
+    def test_azure_operations(self):
+        event = threading.Event()
+        operation = AzureOperation(FakeAzurePoller('vm', event=event),
+                                   'vm-id', 'delete')
+        self.assertFalse(operation.done())
+        self.assertFalse(operation.wait(0.01))
+        with self.assertRaises(WaitStateException):
+            operation.result(0.01)
+        event.set()
+        self.assertTrue(operation.wait())
+        self.assertEqual(operation.result(), 'vm')
+
+        # Operations are started together and their outcomes reported in
+        # order, including those which failed to start or complete
+        done = threading.Event()
+        done.set()
+        pollers = {'a': FakeAzurePoller('a', event=done),
+                   'b': FakeAzurePoller(error=ValueError('b'), event=done),
+                   'c': FakeAzurePoller(event=threading.Event())}
+
+        def start(resource_id, wait=True):
+            self.assertFalse(wait)
+            if resource_id not in pollers:
+                raise KeyError(resource_id)
+            return AzureOperation(pollers[resource_id], resource_id)
+
+        results = run_all(start, ['a', 'b', 'x', 'c'], timeout=0.01)
+        self.assertListEqual([r.id for r in results], ['a', 'b', 'x', 'c'])
+        self.assertEqual(results[0].resource, 'a')
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsInstance(results[2].error, KeyError)
+        self.assertIsInstance(results[3].error, WaitStateException)
+
+    def test_add_vm_firewall_rules(self):
+        network_client = FakeNetworkManagementClient('etag-1')
+        client = fake_azure_client(network_management_client=network_client)
+        existing = SecurityRule(name='cb-rule-1', protocol='tcp',
+                                access='Allow', direction='Inbound',
+                                priority=1001)
+        nsg = NetworkSecurityGroup(security_rules=[existing], etag='etag-1')
+        nsg.name = 'cb-fw'
+
+        rules = [('cb-rule-{0}'.format(i),
+                  {'protocol': 'tcp', 'access': 'Allow',
+                   'direction': 'Inbound', 'priority': 1000 + i})
+                 for i in (2, 3)]
+        created = client.add_vm_firewall_rules(nsg, rules)
+        # All rules are sent with a single update, conditional on the etag
+        self.assertListEqual(
+            network_client.network_security_groups.requests,
+            [('cb-rg', 'cb-fw', ['cb-rule-1', 'cb-rule-2', 'cb-rule-3'],
+              {'If-Match': 'etag-1'})])
+        # and returned in the order given
+        self.assertListEqual([rule.id for rule in created],
+                             ['cb-fw/cb-rule-2', 'cb-fw/cb-rule-3'])
+        self.assertEqual(nsg.etag, 'etag-1+')
+        self.assertEqual(len(nsg.security_rules), 3)
+
+        # An update of a group modified since it was fetched fails, and
+        # leaves the group unchanged
+        nsg.etag = 'stale'
+        with self.assertRaises(CloudError):
+            client.add_vm_firewall_rules(nsg, [('cb-rule-4', rules[0][1])])
+        self.assertEqual(len(nsg.security_rules), 3)
+        self.assertEqual(
+            network_client.network_security_groups.requests[-1][3],
+            {'If-Match': 'stale'})
+
+    def test_run_in_background(self):
+        event = threading.Event()
+        operation = run_in_background(lambda: event.wait() and 'vm',
+                                      'vm-id', 'delete')
+        self.assertFalse(operation.done())
+        with self.assertRaises(WaitStateException):
+            operation.result(0.01)
+        event.set()
+        self.assertEqual(operation.result(), 'vm')
+
+        def fail():
+            raise ValueError('vm')
+
+        with self.assertRaises(ValueError):
+            run_in_background(fail).result()
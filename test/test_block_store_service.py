@@ -1,4 +1,6 @@
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import six
 
@@ -41,6 +43,48 @@ class CloudBlockStoreServiceTestCase(ProviderTestBase):
         sit.check_crud(self, self.provider.storage.volumes, Volume,
                        "cb-createvol", create_vol, cleanup_vol)
 
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_delete_many_volumes(self):
+        label = "cb-manyvol-{0}".format(helpers.get_uuid())
+        vols = []
+        with helpers.cleanup_action(
+                lambda: self.provider.storage.volumes.delete_many(
+                    [vol.id for vol in vols])):
+            for i in range(3):
+                vols.append(self.provider.storage.volumes.create(
+                    "{0}-{1}".format(label, i), 1,
+                    helpers.get_provider_test_data(self.provider,
+                                                   "placement")))
+            vol_ids = [vol.id for vol in vols]
+            results = self.provider.storage.volumes.delete_many(vol_ids)
+            self.assertListEqual([result.id for result in results], vol_ids)
+            self.assertTrue(all(result.success for result in results),
+                            results)
+            for vol in vols:
+                vol.wait_for([VolumeState.DELETED, VolumeState.UNKNOWN],
+                             terminal_states=[VolumeState.ERROR])
+            # Volumes which no longer exist are reported as deleted
+            results = self.provider.storage.volumes.delete_many(vol_ids)
+            self.assertTrue(all(result.success for result in results),
+                            results)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_create_volume_with_tags(self):
+        label = "cb-tagvol-{0}".format(helpers.get_uuid())
+        vol = self.provider.storage.volumes.create(
+            label, 1,
+            helpers.get_provider_test_data(self.provider, "placement"),
+            description="tagged", tags={'project': 'cloudbridge'})
+        with helpers.cleanup_action(lambda: vol.delete()):
+            # The volume is labelled by the create request itself
+            self.assertEqual(vol.label, label)
+            if self.provider.PROVIDER_ID == ProviderList.AWS:
+                # pylint:disable=protected-access
+                tags = {tag['Key']: tag['Value'] for tag in vol._volume.tags}
+                self.assertDictEqual(tags, {'Name': label,
+                                            'Description': 'tagged',
+                                            'project': 'cloudbridge'})
+
     @helpers.skipIfNoService(['storage.volumes'])
     def test_attach_detach_volume(self):
         label = "cb-attachvol-{0}".format(helpers.get_uuid())
@@ -219,3 +263,62 @@ class CloudBlockStoreServiceTestCase(ProviderTestBase):
                     helpers.get_provider_test_data(self.provider, "placement"))
                 with helpers.cleanup_action(lambda: snap_vol2.delete()):
                     snap_vol2.wait_till_ready()
+
+    @helpers.skipIfNoService(['compute.regions', 'storage.volumes'])
+    def test_provider_service_cache(self):
+        self.assertIsNone(self.provider.service_cache)
+        config = dict(self.provider.config, cache_enabled=True,
+                      cache_ttls={'volumes': 60})
+        provider = self.provider.__class__(config)
+        self.assertIsNotNone(provider.service_cache)
+
+        region = provider.compute.regions.get(provider.region_name)
+        self.assertIs(provider.compute.regions.get(provider.region_name),
+                      region)
+
+        label = "cb-cachevol-{0}".format(helpers.get_uuid())
+        self.assertListEqual(provider.storage.volumes.find(label=label), [])
+        vol = provider.storage.volumes.create(
+            label, 1, helpers.get_provider_test_data(provider, "placement"))
+        with helpers.cleanup_action(lambda: vol.delete()):
+            vol.wait_till_ready()
+            # Creating a volume invalidates cached volume lookups
+            self.assertListEqual(
+                provider.storage.volumes.find(label=label), [vol])
+            # and so does relabelling one
+            vol.label = label + "-new"
+            self.assertListEqual(
+                provider.storage.volumes.find(label=label), [])
+        self.assertIsNone(provider.storage.volumes.get(vol.id))
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_provider_thread_safe(self):
+        provider = self.provider.__class__(
+            dict(self.provider.config, thread_safe=True))
+        label = "cb-threadvol-{0}".format(helpers.get_uuid())
+        vols = []
+        with helpers.cleanup_action(lambda: [vol.delete() for vol in vols]):
+            # A single provider is shared by the worker threads
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                vols.extend(executor.map(
+                    lambda i: provider.storage.volumes.create(
+                        "{0}-{1}".format(label, i), 1,
+                        helpers.get_provider_test_data(provider,
+                                                       "placement")),
+                    range(4)))
+                for vol in vols:
+                    vol.wait_till_ready()
+                found = list(executor.map(
+                    lambda vol: provider.storage.volumes.get(vol.id), vols))
+            self.assertListEqual(found, vols)
+
+        if self.provider.PROVIDER_ID == ProviderList.AWS:
+            # Resources are held per thread, but share the pooled client
+            conns = []
+            thread = threading.Thread(
+                target=lambda: conns.append(provider.ec2_conn))
+            thread.start()
+            thread.join()
+            self.assertIs(provider.ec2_conn, provider.ec2_conn)
+            self.assertIsNot(conns[0], provider.ec2_conn)
+            self.assertIs(conns[0].meta.client, provider.ec2_conn.meta.client)
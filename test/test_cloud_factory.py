@@ -1,7 +1,12 @@
+import os
+import shutil
+import sys
+import tempfile
 import unittest
 
 from cloudbridge.cloud import factory
 from cloudbridge.cloud import interfaces
+from cloudbridge.cloud import providers
 from cloudbridge.cloud.factory import CloudProviderFactory
 from cloudbridge.cloud.interfaces import TestMockHelperMixin
 from cloudbridge.cloud.interfaces.provider import CloudProvider
@@ -23,6 +28,17 @@ class CloudFactoryTestCase(unittest.TestCase):
             interfaces.CloudProvider,
             "create_provider did not return a valid VM type")
 
+    def test_create_async_provider(self):
+        # Requesting an async provider should wrap the provider
+        from cloudbridge.cloud.base.async_provider import AsyncCloudProvider
+        async_provider = CloudProviderFactory().create_provider(
+            factory.ProviderList.AWS, {}, async_=True)
+        self.assertIsInstance(async_provider, AsyncCloudProvider)
+        self.assertIsInstance(async_provider.provider, AWSCloudProvider)
+        # Calls are made from the executor's threads
+        self.assertTrue(async_provider.provider.config.thread_safe)
+        async_provider.close()
+
     def test_create_provider_invalid(self):
         # Creating a provider with an invalid name should raise a
         # NotImplementedError
@@ -54,6 +70,42 @@ class CloudFactoryTestCase(unittest.TestCase):
         self.assertEqual(CloudProviderFactory().get_provider_class(
             factory.ProviderList.AWS), AWSCloudProvider)
 
+    def test_get_provider_class_imports_only_requested(self):
+        # Requesting a provider class should only import that provider
+        provider_factory = CloudProviderFactory()
+        self.assertListEqual(provider_factory.list_provider_ids(),
+                             ['aws', 'azure', 'gce', 'openstack'])
+        self.assertEqual(provider_factory.get_provider_class(
+            factory.ProviderList.AWS, get_mock=True), MockAWSCloudProvider)
+        self.assertListEqual(list(provider_factory.import_times),
+                             [factory.ProviderList.AWS])
+        self.assertListEqual(list(provider_factory.provider_list),
+                             [factory.ProviderList.AWS])
+        provider_factory.list_providers()
+        self.assertListEqual(sorted(provider_factory.import_times),
+                             provider_factory.list_provider_ids())
+
+    def test_get_provider_class_discovers_unlisted(self):
+        # A provider module outside the manifest should be discovered when
+        # requested
+        temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(temp_dir, 'cbdummy.py'), 'w') as f:
+            f.write("from cloudbridge.cloud.base import BaseCloudProvider\n"
+                    "\n"
+                    "class DummyCloudProvider(BaseCloudProvider):\n"
+                    "    PROVIDER_ID = 'cbdummy'\n")
+
+        def cleanup():
+            providers.__path__.remove(temp_dir)
+            sys.modules.pop('cloudbridge.cloud.providers.cbdummy', None)
+            shutil.rmtree(temp_dir)
+
+        providers.__path__.append(temp_dir)
+        with helpers.cleanup_action(cleanup):
+            provider_class = CloudProviderFactory().get_provider_class(
+                'cbdummy')
+            self.assertEqual(provider_class.__name__, 'DummyCloudProvider')
+
     def test_get_provider_class_invalid(self):
         # Searching for a provider class with an invalid name should
         # return None
@@ -1,10 +1,18 @@
 import itertools
+import threading
 
 import six
 
+from cloudbridge.cloud.base.client_pool import ClientPool
+from cloudbridge.cloud.base.client_pool import credentials_digest
+from cloudbridge.cloud.base.helpers import ChunkedStream
+from cloudbridge.cloud.base.helpers import PollingPolicy
+from cloudbridge.cloud.base.helpers import Query
+from cloudbridge.cloud.base.helpers import generic_find
 from cloudbridge.cloud.base.helpers import get_env
 from cloudbridge.cloud.base.resources import ClientPagedResultList
 from cloudbridge.cloud.base.resources import ServerPagedResultList
+from cloudbridge.cloud.factory import ProviderList
 
 from test.helpers import ProviderTestBase
 
@@ -100,3 +108,155 @@ class CloudHelpersTestCase(ProviderTestBase):
         int_value = self.provider._get_config_value(
             'default_result_limit', None)
         self.assertIsInstance(int_value, int)
+
+    def test_query(self):
+        # Literals and patterns match the end of the value, as re.search did
+        self.assertEqual(Query({'name': 'ne'}).filter(self.objects),
+                         [self.objects[0]])
+        self.assertEqual(Query({'name': 'T*'}).filter(self.objects),
+                         self.objects[1:3])
+        self.assertEqual(Query({'name': '[OF]*'}).filter(self.objects),
+                         [self.objects[0], self.objects[3]])
+        self.assertEqual(Query({'id': 2, 'name': 'T*'}).filter(self.objects),
+                         [self.objects[1]])
+        # Empty criteria are ignored
+        self.assertIs(Query({'name': None}).filter(self.objects),
+                      self.objects)
+        self.assertTrue(Query({'id': 4})(self.objects[3]))
+        # Only literal strings can be passed on to server-side filters
+        query = Query({'id': 2, 'name': 'One', 'label': 'T*'})
+        self.assertEqual(query.literal('name'), 'One')
+        self.assertIsNone(query.literal('label'))
+        self.assertIsNone(query.literal('id'))
+        self.assertIsNone(query.literal('zone'))
+
+        # Each attribute is fetched once per object
+        lookups = []
+
+        class Tracked(object):
+            def __getattr__(self, name):
+                lookups.append(name)
+                return "One"
+
+        Query({'name': 'O*', 'label': 'One'}).filter([Tracked()])
+        self.assertListEqual(sorted(lookups), ['label', 'name'])
+
+    def test_generic_find(self):
+        kwargs = {'name': 'T*'}
+        self.assertEqual(generic_find(['name'], kwargs, self.objects),
+                         self.objects[1:3])
+        self.assertEqual(kwargs, {})
+        with self.assertRaises(TypeError):
+            generic_find(['name'], {'name': 'One', 'foo': 'bar'},
+                         self.objects)
+
+    def test_chunked_stream(self):
+        fetched = []
+
+        def chunks():
+            for chunk in [b"abc", b"", b"defg", b"h"]:
+                fetched.append(chunk)
+                yield chunk
+
+        stream = ChunkedStream(chunks())
+        self.assertEqual(stream.read(2), b"ab")
+        # Chunks are only fetched as they are needed
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(stream.read(3), b"cde")
+        self.assertListEqual(list(stream), [b"fg", b"h"])
+        self.assertEqual(stream.read(), b"")
+        self.assertEqual(ChunkedStream(chunks()).read(), b"abcdefgh")
+
+    def test_polling_policy(self):
+        policy = PollingPolicy(interval=1, multiplier=2, max_interval=5)
+        delays = policy.delays()
+        self.assertListEqual([next(delays) for _ in range(5)],
+                             [1, 2, 4, 5, 5])
+
+        # An explicit interval overrides the initial interval and raises
+        # the cap if needed
+        delays = policy.delays(interval=10)
+        self.assertListEqual([next(delays) for _ in range(2)], [10, 10])
+
+        # Full jitter stays within the computed delays
+        jittered = PollingPolicy(interval=1, multiplier=2, max_interval=5,
+                                 jitter=True).delays()
+        for expected in [1, 2, 4, 5]:
+            self.assertTrue(0 <= next(jittered) <= expected)
+
+        # Observed durations determine the first delay for the same key
+        self.assertIsNone(policy.expected_duration('vol'))
+        policy.record('vol', 3)
+        policy.record('vol', 13)
+        self.assertEqual(policy.expected_duration('vol'), 6)
+        delays = policy.delays(key='vol')
+        self.assertListEqual([next(delays) for _ in range(3)], [5, 1, 2])
+        delays = policy.delays(key='other')
+        self.assertEqual(next(delays), 1)
+        # but an explicit interval is honoured
+        delays = policy.delays(key='vol', interval=0)
+        self.assertListEqual([next(delays) for _ in range(2)], [0, 0])
+
+    def test_polling_policy_from_config(self):
+        self.assertIs(self.provider.polling_policy,
+                      self.provider.polling_policy)
+        self.assertEqual(self.provider.polling_policy.interval,
+                         self.provider.config.default_wait_interval)
+        self.assertEqual(self.provider.polling_policy.timeout,
+                         self.provider.config.default_wait_timeout)
+
+    def test_client_pool(self):
+        pool = ClientPool(max_clients=2)
+        key = ('svc', 'region', credentials_digest({'key': 'secret'}))
+        self.assertNotIn('secret', str(key))
+        client = pool.get(key, object)
+        self.assertIs(pool.get(key, object), client)
+        self.assertIs(pool.get(('svc', 'region', credentials_digest(
+            {'key': 'secret'})), object), client)
+        self.assertIsNot(pool.get(('svc', 'other'), object), client)
+        self.assertEqual(len(pool), 2)
+        # The least recently used client is discarded
+        pool.get(('svc', 'third'), object)
+        self.assertEqual(len(pool), 2)
+        self.assertIsNot(pool.get(('svc', 'other'), object), client)
+
+        clients = []
+        thread_client = pool.get(key, object, per_thread=True)
+        self.assertIs(pool.get(key, object, per_thread=True), thread_client)
+        thread = threading.Thread(target=lambda: clients.append(
+            pool.get(key, object, per_thread=True)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(clients[0], thread_client)
+
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        self.assertIs(ClientPool.shared(), ClientPool.shared())
+
+    def test_provider_client_pool(self):
+        provider = self.provider.__class__(dict(self.provider.config))
+        self.assertIs(provider.client_pool, self.provider.client_pool)
+        unshared = self.provider.__class__(
+            dict(self.provider.config, connection_pool_shared=False))
+        self.assertIsNot(unshared.client_pool, self.provider.client_pool)
+
+        if self.provider.PROVIDER_ID == ProviderList.AWS:
+            # Providers with identical credentials share clients, but not
+            # resources, which are not thread-safe
+            self.assertIsNot(provider.ec2_conn, self.provider.ec2_conn)
+            self.assertIs(provider.ec2_conn.meta.client,
+                          self.provider.ec2_conn.meta.client)
+            self.assertIsNot(unshared.ec2_conn.meta.client,
+                             self.provider.ec2_conn.meta.client)
+            # Clients for other regions are reused too
+            # pylint:disable=protected-access
+            self.assertIs(
+                provider._connect_ec2_region('us-west-2').meta.client,
+                self.provider._connect_ec2_region('us-west-2').meta.client)
+            self.assertIsNot(
+                provider._connect_ec2_region('us-west-2').meta.client,
+                provider.ec2_conn.meta.client)
+        elif self.provider.PROVIDER_ID == ProviderList.AZURE:
+            self.assertIs(provider.azure_client, self.provider.azure_client)
+            self.assertIsNot(unshared.azure_client,
+                             self.provider.azure_client)
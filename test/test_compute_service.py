@@ -60,6 +60,41 @@ class CloudComputeServiceTestCase(ProviderTestBase):
                        "cb-instcrud", create_inst, cleanup_inst,
                        custom_check_delete=check_deleted)
 
+    @helpers.skipIfNoService(['compute.instances', 'networking.networks'])
+    def test_create_delete_many_instances(self):
+        label = "cb-instmany-{0}".format(helpers.get_uuid())
+        subnet = helpers.get_or_create_default_subnet(self.provider)
+        results = []
+
+        def cleanup_insts():
+            for result in results:
+                if result.resource:
+                    helpers.delete_instance(result.resource)
+
+        with helpers.cleanup_action(cleanup_insts):
+            results = self.provider.compute.instances.create_many(
+                3, label, helpers.get_provider_test_data(self.provider,
+                                                         'image'),
+                helpers.get_provider_test_data(self.provider, 'vm_type'),
+                subnet=subnet,
+                zone=helpers.get_provider_test_data(self.provider,
+                                                    'placement'))
+            self.assertEqual(len(results), 3)
+            self.assertTrue(all(result.success for result in results),
+                            results)
+            insts = [result.resource for result in results]
+            self.assertEqual(len(set(inst.id for inst in insts)), 3)
+            self.assertTrue(all(inst.label == label for inst in insts))
+
+            inst_ids = [inst.id for inst in insts]
+            results = self.provider.compute.instances.delete_many(inst_ids)
+            self.assertListEqual([result.id for result in results],
+                                 inst_ids)
+            self.assertTrue(all(result.success for result in results),
+                            results)
+            for inst in insts:
+                inst.wait_for([InstanceState.DELETED, InstanceState.UNKNOWN])
+
     def _is_valid_ip(self, address):
         try:
             ipaddress.ip_address(address)
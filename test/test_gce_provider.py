@@ -0,0 +1,125 @@
+"""Test GCE specific helpers, against fakes of the GCE API."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from cloudbridge.cloud.providers.gce.image_catalog import GCEImageCatalog
+from cloudbridge.cloud.providers.gce.provider import GCPResourceRouter
+
+from test import helpers
+
+
+class FakeGCEImages(object):
+    """
+    Mimics the GCE images resource, recording the list requests made.
+    """
+
+    def __init__(self, images):
+        self.images = images
+        self.requests = []
+
+    def list(self, project, pageToken=None, filter=None):
+        self.requests.append((project, filter))
+        items = [i for i in self.images if i['project'] == project]
+        if filter:
+            newest = filter.split('"')[1]
+            items = [i for i in items if i['creationTimestamp'] > newest]
+
+        class Request(object):
+            def execute(self):
+                return {'items': items}
+        return Request()
+
+
+class GCEProviderTestCase(unittest.TestCase):
+
+    _multiprocess_can_split_ = True
+
+    def test_gce_image_catalog(self):
+        def image(project, name, created, family=None, label=None):
+            return {'project': project, 'name': name, 'family': family,
+                    'selfLink': 'https://x/{0}/{1}'.format(project, name),
+                    'creationTimestamp': created,
+                    'labels': {'cblabel': label} if label else None}
+
+        images = FakeGCEImages([
+            image('debian-cloud', 'debian-9-v1', '2019-01-01', 'debian-9'),
+            image('centos-cloud', 'centos-7-v1', '2019-01-02', 'centos-7',
+                  label='cb-centos')])
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, 'cache', 'images.sqlite')
+        with helpers.cleanup_action(lambda: shutil.rmtree(temp_dir)):
+            catalog = GCEImageCatalog(path, ttl=0)
+            catalog.refresh(images, ['debian-cloud', 'centos-cloud'])
+            self.assertEqual(len(catalog.list()), 2)
+            self.assertEqual(catalog.get('debian-9-v1')['family'],
+                             'debian-9')
+            self.assertEqual(catalog.get('https://x/centos-cloud/'
+                                         'centos-7-v1')['name'],
+                             'centos-7-v1')
+            self.assertEqual([i['name'] for i in catalog.find(
+                label='cb-centos')], ['centos-7-v1'])
+            self.assertEqual(catalog.find(family='debian-8'), [])
+
+            # Further refreshes only request newer images
+            images.images.append(
+                image('debian-cloud', 'debian-9-v2', '2019-02-01',
+                      'debian-9'))
+            images.requests = []
+            catalog.refresh(images, ['debian-cloud'])
+            self.assertEqual(images.requests,
+                             [('debian-cloud',
+                               'creationTimestamp > "2019-01-01"')])
+            self.assertEqual(len(catalog.find(family='debian-9')), 2)
+
+            # The catalogue persists across instances, until its TTL expires
+            images.requests = []
+            catalog = GCEImageCatalog(path)
+            catalog.refresh(images, ['debian-cloud', 'centos-cloud'])
+            self.assertEqual(images.requests, [])
+            self.assertEqual(len(catalog.list()), 3)
+
+    def test_gce_resource_router(self):
+        def get(path, **patterns):
+            names = [s[1:-1] for s in path.split('/') if s.startswith('{')]
+            return {'methods': {'get': {
+                'path': path, 'parameterOrder': names,
+                'parameters': dict(
+                    (name, {'pattern': patterns[name]}
+                     if name in patterns else {}) for name in names)}}}
+
+        router = GCPResourceRouter({
+            'rootUrl': 'https://www.googleapis.com/',
+            'servicePath': 'compute/v1/projects/',
+            'resources': {
+                'projects': get('{project}'),
+                'zones': get('{project}/zones/{zone}', zone='[a-z0-9-]+'),
+                'instances': get('{project}/zones/{zone}/instances/'
+                                 '{instance}'),
+                'images': get('{project}/global/images/{image}'),
+                'networks': get('{project}/global/networks/{network}'),
+                'policies': get('locations/{policy}', policy='(p/)?[0-9]+'),
+                'operations': {'methods': {}}}})
+        base = 'https://www.googleapis.com/compute/v1/projects/'
+        self.assertEqual(
+            router.parse(base + 'my-proj/zones/us-east1-b/instances/vm-1'),
+            ('instances', (('project', 'my-proj'), ('zone', 'us-east1-b'),
+                           ('instance', 'vm-1'))))
+        self.assertEqual(router.parse(base + 'my-proj'),
+                         ('projects', (('project', 'my-proj'),)))
+        self.assertEqual(router.parse(base + 'my-proj/global/images/img'),
+                         ('images', (('project', 'my-proj'),
+                                     ('image', 'img'))))
+        # Parameters spanning several segments are matched with a regex
+        self.assertEqual(router.parse(base + 'locations/p/12'),
+                         ('policies', (('policy', 'p/12'),)))
+        # Values must match the parameter patterns
+        self.assertIsNone(router.parse(base + 'my-proj/zones/US_EAST'))
+        self.assertIsNone(router.parse(base + 'my-proj/global/disks/d'))
+        self.assertIsNone(router.parse(base + 'my-proj/zones/z/instances'))
+        self.assertIsNone(router.parse('https://example.com/unrelated'))
+        # Parsed URLs are cached, including those which did not match
+        self.assertEqual(len(router._cache), 8)
+        router.parse(' ' + base + 'my-proj ')
+        self.assertEqual(len(router._cache), 8)
@@ -85,3 +85,29 @@ class CloudImageServiceTestCase(ProviderTestBase):
             sit.check_crud(self, self.provider.compute.images, MachineImage,
                            "cb-listimg", create_img, cleanup_img,
                            extra_test_func=extra_tests)
+
+    @helpers.skipIfNoService(['compute.images', 'networking.networks',
+                              'compute.instances'])
+    def test_create_image_invalidates_cache(self):
+        config = dict(self.provider.config, cache_enabled=True)
+        provider = self.provider.__class__(config)
+        instance_label = "cb-cacheimage-{0}".format(helpers.get_uuid())
+        img_label = "cb-cacheimg-{0}".format(helpers.get_uuid())
+        test_instance = None
+        img = None
+
+        def cleanup():
+            if img:
+                img.delete()
+            helpers.cleanup_test_resources(test_instance)
+
+        with helpers.cleanup_action(cleanup):
+            subnet = helpers.get_or_create_default_subnet(provider)
+            test_instance = helpers.get_test_instance(
+                provider, instance_label, subnet=subnet)
+            # Only an empty result is cached for images
+            self.assertListEqual(
+                provider.compute.images.find(label=img_label), [])
+            img = test_instance.create_image(label=img_label)
+            self.assertListEqual(
+                provider.compute.images.find(label=img_label), [img])
@@ -38,3 +38,41 @@ class CloudObjectLifeCycleTestCase(ProviderTestBase):
             # Hitting the timeout should raise an exception
             with self.assertRaises(WaitStateException):
                 test_vol.wait_for([VolumeState.ERROR], timeout=0, interval=0)
+
+    @helpers.skipIfNoService(['storage.volumes'])
+    def test_wait_for_all(self):
+        # Test waiting on several objects at once by using volumes.
+        label = "cb-waitforall-{0}".format(helpers.get_uuid())
+        test_vols = []
+
+        def cleanup_vols():
+            for vol in test_vols:
+                vol.delete()
+
+        with helpers.cleanup_action(cleanup_vols):
+            for i in range(2):
+                test_vols.append(self.provider.storage.volumes.create(
+                    "{0}-{1}".format(label, i), 1,
+                    helpers.get_provider_test_data(self.provider,
+                                                   "placement")))
+
+            with self.assertRaises(AssertionError):
+                self.provider.wait_for_all(test_vols, [VolumeState.ERROR],
+                                           timeout=10, interval=20)
+
+            self.assertTrue(self.provider.wait_for_all(
+                test_vols, [VolumeState.AVAILABLE],
+                terminal_states=[VolumeState.ERROR]))
+            for vol in test_vols:
+                self.assertEqual(vol.state, VolumeState.AVAILABLE)
+
+            # Hitting a terminal state should raise an exception
+            with self.assertRaises(WaitStateException):
+                self.provider.wait_for_all(
+                    test_vols, [VolumeState.ERROR],
+                    terminal_states=[VolumeState.AVAILABLE])
+
+            # Hitting the timeout should raise an exception
+            with self.assertRaises(WaitStateException):
+                self.provider.wait_for_all(test_vols, [VolumeState.ERROR],
+                                           timeout=0, interval=0)
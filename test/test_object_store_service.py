@@ -7,10 +7,12 @@ from unittest import skip
 
 import requests
 
+from cloudbridge.cloud.factory import ProviderList
 from cloudbridge.cloud.interfaces.exceptions import DuplicateResourceException
 from cloudbridge.cloud.interfaces.provider import TestMockHelperMixin
 from cloudbridge.cloud.interfaces.resources import Bucket
 from cloudbridge.cloud.interfaces.resources import BucketObject
+from cloudbridge.cloud.interfaces.resources import TransferConfig
 
 from test import helpers
 from test.helpers import ProviderTestBase
@@ -126,6 +128,81 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
 
             sit.check_delete(self, test_bucket.objects, obj)
 
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_list_bucket_objects_paging(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+        obj_names = ["dir/obj-{0}".format(i) for i in range(5)] + ["top"]
+        objs = []
+
+        def cleanup_objs():
+            for obj in objs:
+                obj.delete()
+            test_bucket.delete()
+
+        with helpers.cleanup_action(cleanup_objs):
+            for obj_name in obj_names:
+                obj = test_bucket.objects.create(obj_name)
+                obj.upload("dummy content")
+                objs.append(obj)
+
+            page = test_bucket.objects.list(limit=2)
+            self.assertEqual(len(page), 2)
+            self.assertTrue(page.is_truncated)
+            listed = list(page)
+            while page.is_truncated:
+                page = test_bucket.objects.list(limit=2, marker=page.marker)
+                listed += page
+            self.assertListEqual(sorted(o.name for o in listed), obj_names)
+            self.assertListEqual(
+                sorted(o.name for o in test_bucket.objects.iter(limit=2)),
+                obj_names)
+            self.assertListEqual(
+                sorted(o.name for o in test_bucket.objects.iter(
+                    limit=2, prefetch=2)),
+                obj_names)
+
+            if self.provider.PROVIDER_ID == ProviderList.AWS:
+                browsed = test_bucket.objects.list(delimiter='/')
+                self.assertListEqual(sorted(o.name for o in browsed),
+                                     ["dir/", "top"])
+
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_delete_many_bucket_objects(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+        deleted = []
+
+        def cleanup_bucket():
+            if self.provider.storage.buckets.get(name):
+                test_bucket.delete(delete_contents=True)
+
+        with helpers.cleanup_action(cleanup_bucket):
+            obj_names = ["obj-{0}".format(i) for i in range(6)]
+            for obj_name in obj_names:
+                test_bucket.objects.create(obj_name).upload("dummy content")
+
+            results = test_bucket.objects.delete_many(
+                obj_names[:3] + ["missing-obj"], progress=deleted.append)
+            self.assertListEqual([r.id for r in results],
+                                 obj_names[:3] + ["missing-obj"])
+            self.assertTrue(all(r.success for r in results),
+                            "Deleting objects failed: {0}".format(results))
+            self.assertEqual(deleted[-1], 4)
+            self.assertListEqual(
+                sorted(o.name for o in test_bucket.objects), obj_names[3:])
+
+            # Deleting a bucket with its contents purges the remaining
+            # objects first, except on Azure where they are deleted along
+            # with the container
+            del deleted[:]
+            test_bucket.delete(delete_contents=True, progress=deleted.append)
+            if self.provider.PROVIDER_ID == ProviderList.AZURE:
+                self.assertListEqual(deleted, [])
+            else:
+                self.assertEqual(deleted[-1], 3)
+            self.assertIsNone(self.provider.storage.buckets.get(name))
+
     @helpers.skipIfNoService(['storage.buckets'])
     def test_upload_download_bucket_content(self):
         name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
@@ -148,6 +225,9 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                 for data in obj.iter_content():
                     target_stream2.write(data)
                 self.assertEqual(target_stream2.getvalue(), content)
+                chunks = list(obj.iter_content(chunk_size=8))
+                self.assertTrue(all(len(chunk) <= 8 for chunk in chunks))
+                self.assertEqual(b"".join(chunks), content)
 
     @helpers.skipIfNoService(['storage.buckets'])
     def test_generate_url(self):
@@ -189,6 +269,37 @@ class CloudObjectStoreServiceTestCase(ProviderTestBase):
                 with open(test_file, 'rb') as f:
                     self.assertEqual(target_stream.getvalue(), f.read())
 
+    @helpers.skipIfNoService(['storage.buckets'])
+    def test_upload_download_bucket_content_in_parts(self):
+        name = "cbtestbucketobjs-{0}".format(helpers.get_uuid())
+        test_bucket = self.provider.storage.buckets.create(name)
+
+        with helpers.cleanup_action(lambda: test_bucket.delete()):
+            obj = test_bucket.objects.create("hello_multipart.bin")
+
+            with helpers.cleanup_action(lambda: obj.delete()):
+                # S3 requires parts of at least 5 MiB, except the last one
+                part_size = 5 * 1024 * 1024
+                config = TransferConfig(part_size=part_size, concurrency=3)
+                self.assertEqual(config.max_parts_in_flight, 3)
+                temp_dir = tempfile.mkdtemp()
+                src = os.path.join(temp_dir, 'src.bin')
+                dst = os.path.join(temp_dir, 'dst.bin')
+                with open(src, 'wb') as f:
+                    f.write(os.urandom(2 * part_size + 1024))
+
+                def cleanup_files():
+                    for path in (src, dst):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    os.rmdir(temp_dir)
+
+                with helpers.cleanup_action(cleanup_files):
+                    obj.upload_from_file(src, transfer_config=config)
+                    obj.download_to_file(dst, transfer_config=config)
+                    self.assertTrue(filecmp.cmp(src, dst, shallow=False),
+                                    "Uploaded file != downloaded")
+
     @skip("Skip unless you want to test objects bigger than 5GB")
     @helpers.skipIfNoService(['storage.buckets'])
     def test_upload_download_bucket_content_with_large_file(self):
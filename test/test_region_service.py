@@ -1,5 +1,7 @@
 import six
 
+from cloudbridge.cloud.base.helpers import prefetch
+from cloudbridge.cloud.base.services import ServiceCache
 from cloudbridge.cloud.interfaces import Region
 
 from test import helpers
@@ -54,3 +56,100 @@ class CloudRegionServiceTestCase(ProviderTestBase):
                     zone_find_count += 1
         # zone info cannot be repeated between regions
         self.assertEqual(zone_find_count, 1)
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_across_regions(self):
+        regions = [region.name for region in
+                   list(self.provider.compute.regions)[:3]]
+        view = self.provider.across_regions(regions, max_workers=2)
+
+        current = view.compute.regions.current()
+        self.assertFalse(current.errors)
+        self.assertListEqual([region.name for region in current], regions)
+        self.assertListEqual([region for region, _ in current.tagged()],
+                             regions)
+
+        zones = view.map(lambda provider: provider.compute.regions.get(
+            provider.region_name).zones)
+        self.assertListEqual(list(zones.results), regions)
+        for region, zone in zones.tagged():
+            self.assertIn(zone.name, [z.name for z in self.provider.compute
+                                      .regions.get(region).zones])
+
+        # Errors in one region do not prevent the others from being queried
+        def fail_in_first_region(provider):
+            if provider.region_name == regions[0]:
+                raise ValueError("Region failure")
+            return provider.region_name
+
+        results = view.map(fail_in_first_region)
+        self.assertListEqual(list(results), regions[1:])
+        self.assertListEqual(list(results.errors), regions[:1])
+        self.assertIsInstance(results.errors[regions[0]], ValueError)
+        self.assertIs(self.provider.for_region(regions[1]),
+                      self.provider.for_region(regions[1]))
+
+    def test_service_cache(self):
+        cache = ServiceCache({'regions': 60}, max_size=2)
+        calls = []
+
+        def loader(value):
+            return lambda: calls.append(value) or value
+
+        self.assertEqual(cache.get_or_load('regions', ('a',), loader(1)), 1)
+        self.assertEqual(cache.get_or_load('regions', ('a',), loader(2)), 1)
+        self.assertListEqual(calls, [1])
+
+        # Services without a TTL and unhashable keys are not cached
+        cache.get_or_load('volumes', ('a',), loader(3))
+        cache.get_or_load('regions', ([],), loader(4))
+        self.assertEqual(len(cache), 1)
+
+        # Least recently used entries are evicted first
+        cache.get_or_load('regions', ('b',), loader(5))
+        cache.get_or_load('regions', ('a',), loader(6))
+        cache.get_or_load('regions', ('c',), loader(7))
+        self.assertEqual(cache.get_or_load('regions', ('a',), loader(8)), 1)
+        self.assertEqual(cache.get_or_load('regions', ('b',), loader(9)), 9)
+
+        cache.invalidate('regions')
+        self.assertEqual(len(cache), 0)
+
+        # Cached lists are returned as copies
+        regions = cache.get_or_load('regions', ('l',), loader(['r1']))
+        regions.append('r2')
+        self.assertListEqual(
+            cache.get_or_load('regions', ('l',), loader(None)), ['r1'])
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_prefetch(self):
+        objects = list(self.provider.compute.regions)
+        self.assertListEqual(list(prefetch(iter(objects), 2)), objects)
+
+        # Errors raised while fetching are passed on to the consumer
+        def failing():
+            yield objects[0]
+            raise ValueError("failed")
+
+        it = prefetch(failing(), 1)
+        self.assertEqual(next(it), objects[0])
+        with self.assertRaises(ValueError):
+            next(it)
+
+        # No more than depth items are fetched ahead of the consumer
+        fetched = []
+
+        def tracked():
+            for obj in objects:
+                fetched.append(obj)
+                yield obj
+
+        it = prefetch(tracked(), 1)
+        self.assertEqual(next(it), objects[0])
+        self.assertLessEqual(len(fetched), 3)
+        it.close()
+
+    @helpers.skipIfNoService(['compute.regions'])
+    def test_iter_prefetch(self):
+        regions = self.provider.compute.regions
+        self.assertListEqual(list(regions.iter(prefetch=2)), list(regions))
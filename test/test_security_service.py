@@ -96,6 +96,27 @@ class CloudSecurityServiceTestCase(ProviderTestBase):
 
             self.assertEqual(label, fw.description)
 
+    @helpers.skipIfNoService(['security.vm_firewalls'])
+    def test_vm_firewall_find_wildcard(self):
+        uuid = helpers.get_uuid()
+        label = 'cb-findfw-{0}'.format(uuid)
+
+        fw = None
+        with helpers.cleanup_action(lambda: helpers.cleanup_test_resources(
+                vm_firewall=fw)):
+            subnet = helpers.get_or_create_default_subnet(self.provider)
+            fw = self.provider.security.vm_firewalls.create(
+                label=label, description=label, network=subnet.network_id)
+
+            find_fw = self.provider.security.vm_firewalls.find
+            # Wildcards, which may be matched by the server
+            self.assertEqual(find_fw(label='cb-findfw-*' + uuid[-4:]), [fw])
+            self.assertEqual(find_fw(label=label[:-1] + '?'), [fw])
+            # Character sets, which may be matched by the client
+            self.assertEqual(
+                find_fw(label=label[:-1] + '[' + label[-1] + ']'), [fw])
+            self.assertEqual(find_fw(label='cb-findfw-[!a-z0-9]*'), [])
+
     @helpers.skipIfNoService(['security.vm_firewalls'])
     def test_crud_vm_firewall_rules(self):
         label = 'cb-crudfw-rules-{0}'.format(helpers.get_uuid())
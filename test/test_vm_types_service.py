@@ -74,3 +74,43 @@ class CloudVMTypeServiceTestCase(ProviderTestBase):
 
         sit.check_standard_behaviour(
                 self, self.provider.compute.vm_types, vm_type)
+
+    @helpers.skipIfNoService(['compute.vm_types'])
+    def test_vm_types_find_by_range(self):
+        vm_types = list(self.provider.compute.vm_types)
+        service = self.provider.compute.vm_types
+
+        def expected(predicate):
+            return [t for t in vm_types if t.vcpus is not None and
+                    t.ram is not None and predicate(t)]
+
+        self.assertListEqual(
+            service.find(vcpus__gte=2, ram__lt=16),
+            expected(lambda t: t.vcpus >= 2 and t.ram < 16))
+        self.assertListEqual(
+            service.find(vcpus=1),
+            [t for t in vm_types if t.vcpus == 1])
+        self.assertListEqual(service.find(vcpus__gt=100000), [])
+        for vm_type in vm_types:
+            self.assertEqual(service.get(vm_type.id), vm_type)
+
+        cheapest = service.find_cheapest(min_vcpus=2, min_ram=4)
+        candidates = expected(lambda t: t.vcpus >= 2 and t.ram >= 4)
+        if candidates:
+            self.assertIn(cheapest, candidates)
+        else:
+            self.assertIsNone(cheapest)
+        self.assertIsNone(service.find_cheapest(min_vcpus=100000))
+
+        with self.assertRaises(TypeError):
+            service.find(vcpus__between=(1, 2))
+
+    @helpers.skipIfNoService(['compute.vm_types'])
+    def test_vm_types_catalog_ttl(self):
+        service = self.provider.compute.vm_types
+        self.assertIs(service.catalog, service.catalog)
+        # The catalog is rebuilt once older than the configured TTL
+        provider = self.provider.__class__(
+            dict(self.provider.config, cache_ttls={'vm_types': 0}))
+        service = provider.compute.vm_types
+        self.assertIsNot(service.catalog, service.catalog)